@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 import numpy as np
 
 
@@ -20,6 +20,66 @@ def calculate_angle(point_a: Tuple[float, float], point_b: Tuple[float, float],
 	return float(angle)
 
 
+def calculate_angles(points: np.ndarray) -> np.ndarray:
+	"""
+	Vectorized calculate_angle over N (A, B, C) triplets.
+
+	points is (N, 3, 2) or (N, 3, 3). 2-D input uses the same arctangent
+	formula as calculate_angle; 3-D input measures the angle between BA and BC
+	in space. Returns N angles in [0, 180] degrees; a triplet with any NaN
+	coordinate gives NaN.
+	"""
+	pts = np.asarray(points, dtype=np.float64)
+	if pts.ndim != 3 or pts.shape[1] != 3 or pts.shape[2] not in (2, 3):
+		raise ValueError(f"Expected points of shape (N, 3, 2) or (N, 3, 3), got {pts.shape}")
+
+	ba = pts[:, 0] - pts[:, 1]
+	bc = pts[:, 2] - pts[:, 1]
+	if pts.shape[2] == 2:
+		radians = np.arctan2(bc[:, 1], bc[:, 0]) - np.arctan2(ba[:, 1], ba[:, 0])
+		angle = np.abs(radians*180.0/np.pi)
+		return np.where(angle > 180.0, 360.0 - angle, angle)
+
+	cross = np.linalg.norm(np.cross(ba, bc), axis=1)
+	dot = np.einsum("ij,ij->i", ba, bc)
+	return np.arctan2(cross, dot)*180.0/np.pi
+
+
+def landmark_angles(landmarks: np.ndarray, triplets, min_visibility: Optional[float] = None, dims: int = 2) -> np.ndarray:
+	"""
+	Angles for index triplets over a landmark array.
+
+	landmarks is (33, 4) or (N, 33, 4) with (x, y, z, visibility) columns;
+	triplets is (K, 3) landmark indices. Returns (K,) or (N, K) angles. With
+	min_visibility set, triplets where any point's visibility is not above it
+	are NaN.
+	"""
+	data = np.asarray(landmarks)
+	idx = np.asarray(triplets, dtype=np.intp).reshape(-1, 3)
+	single = data.ndim == 2
+	if single:
+		data = data[np.newaxis]
+
+	pts = data[:, idx, :]  # (N, K, 3, 4)
+	n, k = pts.shape[:2]
+	angles = calculate_angles(pts[..., :dims].reshape(n*k, 3, dims)).reshape(n, k)
+	if min_visibility is not None:
+		# NaN visibility compares False, so missing points are masked too
+		angles[~(pts[..., 3] > min_visibility).all(axis=2)] = np.nan
+	return angles[0] if single else angles
+
+
+def first_valid(*candidates: np.ndarray) -> np.ndarray:
+	"""Element-wise first non-NaN value across candidate arrays (NaN if none)."""
+	out = np.array(candidates[0], dtype=np.float64)
+	for cand in candidates[1:]:
+		missing = np.isnan(out)
+		if not missing.any():
+			break
+		out[missing] = np.asarray(cand, dtype=np.float64)[missing]
+	return out
+
+
 def is_angle_in_range(angle: float, low_high: Tuple[float, float]) -> bool:
 	if np.isnan(angle):
 		return False
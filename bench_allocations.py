@@ -0,0 +1,117 @@
+"""
+Allocation benchmark for the per-frame conversions before pose inference
+
+Measures, with tracemalloc, the bytes allocated per frame by the image
+preparation in PoseDetector.process and in the standalone trackers:
+
+- "fresh":  cv2.resize/cv2.cvtColor returning a new array every frame (the
+            old PoseDetector.process path)
+- "buffers": the same conversions into frame_buffers.FrameBuffers
+- "round trip": BGR -> RGB -> BGR, as the standalone trackers used to do
+- "reused dst": one BGR -> RGB into the previous frame's array, as they do now
+
+With --detector the full PoseDetector.process (MediaPipe required) is
+measured as well; MediaPipe's own native allocations are not visible to
+tracemalloc, only the Python/NumPy side.
+
+Usage:
+    python bench_allocations.py                      # 1920x1080, 100 frames
+    python bench_allocations.py --width 1280 --height 720 --scale 0.5
+    python bench_allocations.py --detector
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from frame_buffers import FrameBuffers
+
+
+def fresh_convert(frame, scale):
+    image = frame
+    if scale != 1.0:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def make_buffered_convert():
+    buffers = FrameBuffers()
+
+    def convert(frame, scale):
+        image = frame
+        if scale != 1.0:
+            image = buffers.resize(image, scale, cv2.INTER_AREA)
+        return buffers.bgr_to_rgb(image)
+    return convert
+
+
+def round_trip(frame, scale):
+    image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+
+def make_reused_dst():
+    state = {"rgb": None}
+
+    def convert(frame, scale):
+        state["rgb"] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, state["rgb"])
+        return state["rgb"]
+    return convert
+
+
+def make_detector(scale):
+    from pose_detector import PoseDetector
+    detector = PoseDetector()
+    detector.input_scale = scale
+    return lambda frame, _scale: detector.process(frame)
+
+
+def measure(step, frames, scale, warmup: int = 3) -> tuple:
+    """(bytes allocated per frame, seconds per frame) over ``frames``."""
+    for frame in frames[:warmup]:
+        step(frame, scale)
+    total = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    for frame in frames:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        step(frame, scale)
+        total += tracemalloc.get_traced_memory()[1] - base
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return total / len(frames), elapsed / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-frame allocations before pose inference")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--scale", type=float, default=1.0, help="input_scale applied before conversion")
+    parser.add_argument("--detector", action="store_true", help="also measure PoseDetector.process (needs MediaPipe)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # A few distinct frames, cycled, so nothing is cached by content
+    pool = [rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8) for _ in range(4)]
+    frames = [pool[i % len(pool)] for i in range(args.frames)]
+    print(f"{args.width}x{args.height}, {args.frames} frames, scale {args.scale}")
+
+    cases = [("fresh", fresh_convert),
+             ("buffers", make_buffered_convert()),
+             ("round trip", round_trip),
+             ("reused dst", make_reused_dst())]
+    if args.detector:
+        cases.append(("PoseDetector.process", make_detector(args.scale)))
+
+    for name, step in cases:
+        per_frame, seconds = measure(step, frames, args.scale)
+        print(f"{name:22s} {per_frame / 1e6:8.2f} MB/frame  {seconds * 1000:7.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
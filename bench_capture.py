@@ -0,0 +1,118 @@
+"""
+Capture cost benchmark across resolutions and pixel formats
+
+Without a camera (the default), each setting is stood in for by a short
+video file written in that format: MJPG (what a webcam sends when MJPG is
+negotiated) or uncompressed YUV 4:2:0 (the raw path, standing in for YUYV).
+Reading the file back with cv2.VideoCapture measures the per-frame decode /
+colour conversion into BGR, and the bytes per frame approximate the USB
+transfer. The scene is synthetic (gradient, moving shapes, sensor noise) so
+MJPG compresses roughly as it would on camera images.
+
+With --camera N the same settings are requested from a real camera through
+capture.open_capture, the granted mode is printed, and frames are timed as
+they arrive (this includes waiting for the sensor, i.e. the real frame rate).
+
+Usage:
+    python bench_capture.py                                # 640x480, 1280x720, 1920x1080
+    python bench_capture.py --sizes 640x480 1280x720 --frames 120
+    python bench_capture.py --camera 0 --frames 90
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from capture import CaptureSettings, open_capture, parse_size
+
+
+FORMATS = {"MJPG": "MJPG", "raw": "I420"}
+
+
+def scene(i: int, width: int, height: int, rng) -> np.ndarray:
+    """A camera-like frame: smooth background, a moving figure, a little noise."""
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = np.stack([x * 0.4 + 40, x * 0.2 + 80, 200 - x * 0.3], axis=1).astype(np.uint8)
+    cx = int(width * (0.3 + 0.4 * (i % 60) / 60))
+    cv2.circle(frame, (cx, height // 4), height // 12, (60, 90, 180), -1)
+    cv2.rectangle(frame, (cx - width // 20, height // 3), (cx + width // 20, height * 3 // 4), (40, 40, 140), -1)
+    noise = rng.integers(-4, 5, frame.shape, dtype=np.int16)
+    return np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def write_clip(path: str, fourcc: str, size, frames: int) -> None:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), 30.0, size)
+    if not writer.isOpened():
+        raise RuntimeError(f"Cannot write {fourcc} video with this OpenCV build")
+    rng = np.random.default_rng(0)
+    for i in range(frames):
+        writer.write(scene(i, size[0], size[1], rng))
+    writer.release()
+
+
+def time_reads(cap, frames: int) -> tuple:
+    """(frames read, seconds per frame) for up to ``frames`` reads."""
+    n = 0
+    start = time.perf_counter()
+    while n < frames:
+        ret, _ = cap.read()
+        if not ret:
+            break
+        n += 1
+    return n, (time.perf_counter() - start) / max(n, 1)
+
+
+def bench_files(sizes, frames: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for name, fourcc in FORMATS.items():
+                path = os.path.join(tmp, f"{name}_{size[0]}x{size[1]}.avi")
+                write_clip(path, fourcc, size, frames)
+                cap, report = open_capture(path)
+                n, seconds = time_reads(cap, frames)
+                cap.release()
+                per_frame = os.path.getsize(path) / max(n, 1)
+                print(f"{size[0]:5d}x{size[1]:<5d} {name:5s} {per_frame / 1e6:7.2f} MB/frame  "
+                      f"{seconds * 1000:6.2f} ms/frame  ({report.granted.fourcc or fourcc}, {n} frames)")
+
+
+def bench_camera(index: int, sizes, frames: int, fps: float) -> None:
+    for size in sizes:
+        for name in FORMATS:
+            settings = CaptureSettings(width=size[0], height=size[1], fps=fps or None,
+                                       fourcc="MJPG" if name == "MJPG" else "YUYV", buffer_size=1)
+            cap, report = open_capture(index, settings)
+            if not cap.isOpened():
+                print(f"Could not open camera {index}")
+                return
+            print(report.summary())
+            time_reads(cap, 5)  # let exposure and the stream settle
+            n, seconds = time_reads(cap, frames)
+            cap.release()
+            print(f"  {n} frames, {seconds * 1000:.2f} ms/frame ({1.0 / seconds if seconds else 0:.1f} fps)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark capture cost across resolutions and pixel formats")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[(640, 480), (1280, 720), (1920, 1080)],
+                        metavar="WxH")
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--camera", type=int, default=None, metavar="INDEX",
+                        help="benchmark a real camera instead of file-backed stand-ins")
+    parser.add_argument("--fps", type=float, default=30.0, help="frame rate to request from the camera")
+    args = parser.parse_args()
+
+    if args.camera is None:
+        print(f"File-backed stand-ins, {args.frames} frames per setting (read + decode to BGR)")
+        bench_files(args.sizes, args.frames)
+    else:
+        bench_camera(args.camera, args.sizes, args.frames, args.fps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Rendering benchmark for the HUD and skeleton drawn on every displayed frame
+
+Compares, on a synthetic squat session (angles changing every frame, a rep
+every 60 frames):
+
+- HUD: hud_renderer.draw_hud_direct (rectangles + putText per line, the old
+  draw_overlay) vs HudRenderer (cached panels and text tiles)
+- Skeleton: one cv2.line/cv2.circle call per bone/joint (the old
+  draw_skeleton) vs pose_detector.draw_skeleton (two polyline calls)
+
+and reports ms per frame and the share of a 30 fps frame budget.
+
+Usage:
+    python bench_render.py                       # 1280x720, 600 frames
+    python bench_render.py --width 1920 --height 1080 --frames 1000
+"""
+
+import argparse
+import math
+import time
+
+import cv2
+import numpy as np
+
+from hud_renderer import HudRenderer, draw_hud_direct
+from landmarks import NUM_LANDMARKS, POSE_CONNECTIONS
+from pose_detector import draw_skeleton
+
+
+def hud_args(i: int) -> tuple:
+    knee = 95.0 + 75.0 * math.cos(2 * math.pi * i / 60)
+    angles = {"Knee": knee, "Hip": knee + 10.0, "Back": 170.0 + (i % 7) * 0.1}
+    phase = "down" if knee < 120 else "up"
+    return angles, "Squat", phase, knee > 80, "Good form" if knee > 80 else "Go lower", i // 60, None
+
+
+def skeleton(i: int, width: int, height: int) -> np.ndarray:
+    rng = np.random.default_rng(i)
+    data = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+    data[:, 0] = rng.uniform(0.3, 0.7, NUM_LANDMARKS) * width
+    data[:, 1] = rng.uniform(0.1, 0.9, NUM_LANDMARKS) * height
+    data[:, 2] = 0.0
+    data[:, 3] = rng.uniform(0.4, 1.0, NUM_LANDMARKS)
+    return data
+
+
+def draw_skeleton_loop(frame_bgr, data, min_visibility: float = 0.5) -> None:
+    """Per-bone cv2.line and per-joint cv2.circle (the previous draw_skeleton)."""
+    with np.errstate(invalid="ignore"):
+        visible = data[:, 3] >= min_visibility
+    pts = np.nan_to_num(np.round(data[:, :2])).astype(np.int32)
+    for a, b in POSE_CONNECTIONS:
+        if visible[a] and visible[b]:
+            cv2.line(frame_bgr, (int(pts[a, 0]), int(pts[a, 1])), (int(pts[b, 0]), int(pts[b, 1])), (0, 255, 0), 2)
+    for x, y in pts[visible]:
+        cv2.circle(frame_bgr, (int(x), int(y)), 3, (0, 0, 255), -1)
+
+
+def measure(draw, frames, inputs) -> float:
+    """Seconds per frame; each frame starts from a fresh copy of the camera image."""
+    total = 0.0
+    for i, (frame, args) in enumerate(zip(frames, inputs)):
+        start = time.perf_counter()
+        draw(frame, *args)
+        total += time.perf_counter() - start
+    return total / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HUD and skeleton rendering")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--budget-fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    camera = rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+    huds = [hud_args(i) for i in range(args.frames)]
+    skeletons = [(skeleton(i, args.width, args.height),) for i in range(args.frames)]
+    budget_ms = 1000.0 / args.budget_fps
+    print(f"{args.width}x{args.height}, {args.frames} frames, {budget_ms:.1f} ms budget")
+
+    renderer = HudRenderer()
+    cases = (("HUD direct", draw_hud_direct, huds),
+             ("HUD cached", renderer.draw, huds),
+             ("skeleton loop", draw_skeleton_loop, skeletons),
+             ("skeleton polylines", draw_skeleton, skeletons))
+    for name, draw, inputs in cases:
+        frames = [camera.copy() for _ in range(min(args.frames, 32))]
+        frames = [frames[i % len(frames)] for i in range(args.frames)]
+        seconds = measure(draw, frames, inputs)
+        print(f"{name:20s} {seconds * 1000:7.3f} ms/frame  {100 * seconds * 1000 / budget_ms:5.2f}% of budget")
+    print(f"HudRenderer: {renderer.tiles_rendered} tiles rendered, {renderer.panels_composed} panel compositions")
+
+
+if __name__ == "__main__":
+    main()
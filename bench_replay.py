@@ -0,0 +1,104 @@
+"""
+Replay benchmark for the non-inference part of the pipeline
+
+Feeds a landmark recording (made with ``python main.py --record PATH``)
+through the same per-frame analysis main.py runs (FeedbackEngine angles,
+RepCounter, plank timer) and through BicepCurlExercise, without capture or
+pose inference, and reports frames per second and the rep counts.
+
+Usage:
+    python bench_replay.py session.lmrec [--exercise BicepCurl] [--repeat 5]
+    python bench_replay.py --synthetic 3000     # generated bicep curl stream
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import main as app
+from bicep_curl_exercise import BicepCurlExercise
+from feedback import FeedbackEngine
+from landmark_recording import LandmarkRecorder, iter_recording
+from landmarks import LANDMARK_INDEX, NUM_LANDMARKS
+from reference_loader import ReferenceProvider
+from rep_counter import RepCounter
+
+
+def write_synthetic_curls(path: str, frames: int, fps: float = 30.0, period_s: float = 2.0) -> None:
+    """Record a left-arm curl oscillating between ~170 and ~20 degrees."""
+    data = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+    data[:, 2:] = (0.0, 0.9)
+    shoulder, elbow = np.array([300.0, 200.0]), np.array([300.0, 320.0])
+    with LandmarkRecorder(path) as rec:
+        for i in range(frames):
+            t = i / fps
+            angle = math.radians(95.0 + 75.0 * math.cos(2 * math.pi * t / period_s))
+            wrist = elbow + 120.0 * np.array([math.sin(angle), -math.cos(angle)])
+            data[LANDMARK_INDEX["LEFT_SHOULDER"], :2] = shoulder
+            data[LANDMARK_INDEX["LEFT_ELBOW"], :2] = elbow
+            data[LANDMARK_INDEX["LEFT_WRIST"], :2] = wrist
+            rec.write(t, data)
+
+
+def bench_main_analysis(frames, exercise: str, refs) -> tuple:
+    engine = FeedbackEngine()
+    reps = RepCounter(exercise)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # rep counter prints per rep
+        for t, lms in frames:
+            app.analyze_frame(exercise, lms, engine, refs, reps, now=t)
+    return time.perf_counter() - start, reps.count
+
+
+def bench_bicep_processor(frames) -> tuple:
+    processor = BicepCurlExercise()
+    start = time.perf_counter()
+    for _, lms in frames:
+        if lms is not None:
+            processor.process_frame(lms)
+    return time.perf_counter() - start, processor.rep_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis on recorded landmarks")
+    parser.add_argument("recording", nargs="?", help="file written by main.py --record")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="generate an N-frame bicep curl recording instead")
+    parser.add_argument("--exercise", default="BicepCurl", choices=["Squat", "Plank", "BicepCurl"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    path = args.recording
+    if args.synthetic:
+        tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp_dir.name, "synthetic.lmrec")
+        write_synthetic_curls(path, args.synthetic)
+    if not path:
+        parser.error("give a recording path or --synthetic N")
+
+    ref_provider = ReferenceProvider(json_path="references.json")
+    app.load_plank_trained_ranges(ref_provider)
+    frames = list(iter_recording(path))
+    print(f"Loaded {len(frames)} frames from {path}")
+
+    for name, run in (("main.analyze_frame", lambda: bench_main_analysis(frames, args.exercise, ref_provider.data)),
+                      ("BicepCurlExercise", lambda: bench_bicep_processor(frames))):
+        best = float("inf")
+        for _ in range(args.repeat):
+            elapsed, count = run()
+            best = min(best, elapsed)
+        print(f"{name:20s} {len(frames) / best:10.0f} frames/s  ({best * 1000:.1f} ms, reps={count})")
+
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Startup benchmark: time-to-first-processed-frame per entry point
+
+Launches main.py and each trainer reference builder in a fresh interpreter
+through startup_probe.py, which wraps the detectors' process(). The first
+frame processed prints a timestamp and exits, so each measurement covers
+interpreter start, imports, model load and opening the source.
+
+Usage:
+    python bench_startup.py [--runs 3] [--video Trainer_Videos/Sqaut.mp4] [--only main squat]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from startup_probe import MARKER
+
+
+DEFAULT_VIDEOS = ["Trainer_Videos/Sqaut.mp4", "Trainer_Videos/pushUps.mp4", "Trainer_Videos/Biceps_curl.mp4"]
+
+
+def entry_points(video: str) -> dict:
+    py = sys.executable
+    probe = [py, "startup_probe.py"]
+    return {
+        "python (baseline)": [py, "-c", "pass"],
+        "main": probe + ["main.py", "--headless", "--video", video, "--events", os.devnull],
+        "bicep builder": probe + ["trainer_reference_builder.py", "--no-cache"],
+        "squat builder": probe + ["trainer_reference_builder_squat.py", "--no-cache"],
+        "pushup builder": probe + ["trainer_reference_builder_pushup.py", "--no-cache"],
+        "plank builder": probe + ["trainer_reference_builder_plank.py", "--no-cache"],
+    }
+
+
+def time_to_first_frame(cmd, timeout: float) -> float:
+    """Seconds from launch to the probe marker (or to exit for the baseline); NaN if no frame."""
+    start = time.time()
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return float("nan")
+    if cmd[1:] == ["-c", "pass"]:
+        return time.time() - start
+    for line in proc.stdout.splitlines():
+        if line.startswith(MARKER):
+            return float(line.split()[-1]) - start
+    return float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-first-processed-frame")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--video", help="video for main.py (default: first trainer video found)")
+    parser.add_argument("--only", nargs="*", help="substring filter on entry point names")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    video = args.video or next((v for v in DEFAULT_VIDEOS if os.path.exists(v)), DEFAULT_VIDEOS[0])
+    targets = entry_points(video)
+    if args.only:
+        targets = {k: v for k, v in targets.items() if any(o in k for o in args.only)}
+
+    print(f"{'entry point':20s} {'median':>8s} {'min':>8s}   (seconds to first processed frame, {args.runs} runs)")
+    for name, cmd in targets.items():
+        samples = [time_to_first_frame(cmd, args.timeout) for _ in range(args.runs)]
+        ok = [s for s in samples if s == s]
+        if not ok:
+            print(f"{name:20s} {'-':>8s} {'-':>8s}   no frame processed (missing video or dependency?)")
+            continue
+        print(f"{name:20s} {statistics.median(ok):8.2f} {min(ok):8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,10 +23,10 @@ Usage:
 """
 
 import math
-from typing import Dict, Optional, Tuple
+from typing import Dict, Mapping, Optional, Tuple
 from dataclasses import dataclass
 
-from pose_detector import LandmarkPoint
+from landmarks import LandmarkPoint
 from angle_utils import calculate_angle
 
 
@@ -81,13 +81,13 @@ class BicepCurlExercise:
         self.reference_min = min_angle
         self.reference_max = max_angle
         
-    def calculate_elbow_angle(self, landmarks: Dict[str, LandmarkPoint]) -> float:
+    def calculate_elbow_angle(self, landmarks: Mapping[str, LandmarkPoint]) -> float:
         """
         Calculate elbow angle from pose landmarks.
         Tries left side first, then right side.
         
         Args:
-            landmarks: Dictionary of detected landmarks
+            landmarks: Detected landmarks (LandmarkFrame or name->point dict)
             
         Returns:
             Elbow angle in degrees, or NaN if calculation fails
@@ -190,12 +190,12 @@ class BicepCurlExercise:
         phase_msg = f"Phase: {self.current_phase.title()}" if self.current_phase else "Start curling"
         return True, f"Good form! {phase_msg}"
     
-    def process_frame(self, landmarks: Dict[str, LandmarkPoint]) -> BicepCurlState:
+    def process_frame(self, landmarks: Mapping[str, LandmarkPoint]) -> BicepCurlState:
         """
         Process a single frame for bicep curl analysis.
         
         Args:
-            landmarks: Dictionary of detected pose landmarks
+            landmarks: Detected pose landmarks (LandmarkFrame or name->point dict)
             
         Returns:
             BicepCurlState with current exercise state
@@ -225,12 +225,12 @@ class BicepCurlExercise:
         self.current_angle = float('nan')
         self.previous_angle = float('nan')
     
-    def get_angle_display_info(self, landmarks: Dict[str, LandmarkPoint]) -> Optional[Dict]:
+    def get_angle_display_info(self, landmarks: Mapping[str, LandmarkPoint]) -> Optional[Dict]:
         """
         Get information for displaying angle on screen.
         
         Args:
-            landmarks: Dictionary of detected landmarks
+            landmarks: Detected landmarks (LandmarkFrame or name->point dict)
             
         Returns:
             Dictionary with display information or None if not available
@@ -284,7 +284,7 @@ class BicepCurlIntegration:
         return min_angle, max_angle
     
     @staticmethod
-    def compute_angles_for_feedback(landmarks: Dict[str, LandmarkPoint]) -> Dict[str, float]:
+    def compute_angles_for_feedback(landmarks: Mapping[str, LandmarkPoint]) -> Dict[str, float]:
         """Compute angles in format expected by feedback system"""
         bicep = BicepCurlExercise()
         elbow_angle = bicep.calculate_elbow_angle(landmarks)
@@ -0,0 +1,145 @@
+"""
+Camera capture settings, negotiated when the device is opened.
+
+``cv2.VideoCapture(0)`` leaves resolution, frame rate and pixel format to the
+driver, which on many USB webcams means uncompressed YUYV at the sensor's
+largest mode: the USB link then limits the frame rate, and every frame is a
+large transfer plus a YUYV->BGR conversion. Requesting MJPG (compressed on
+the camera, decoded by OpenCV) at the resolution the pose model actually
+needs is usually much cheaper.
+
+open_capture() applies a CaptureSettings to a camera, reads back what the
+driver granted (drivers silently substitute the nearest mode they support)
+and returns both in a CaptureReport. Video files ignore the settings and
+report their own properties.
+"""
+
+from dataclasses import dataclass, fields
+from typing import List, Optional, Tuple, Union
+
+import cv2
+
+
+@dataclass(frozen=True)
+class CaptureSettings:
+	"""Requested capture mode; None leaves a property at the driver's default."""
+	width: Optional[int] = None
+	height: Optional[int] = None
+	fps: Optional[float] = None
+	fourcc: Optional[str] = None  # e.g. "MJPG", "YUYV"
+	buffer_size: Optional[int] = None  # frames queued in the driver; 1 = always the newest
+
+	@property
+	def label(self) -> str:
+		size = f"{self.width or '?'}x{self.height or '?'}"
+		fps = f"@{self.fps:g}" if self.fps else ""
+		parts = [size + fps, self.fourcc or "", f"buffer {self.buffer_size}" if self.buffer_size else ""]
+		return " ".join(p for p in parts if p)
+
+
+# Low-latency webcam defaults for main.py: compressed frames and no driver
+# queue; resolution and frame rate stay at the driver's default unless asked
+WEBCAM_DEFAULTS = CaptureSettings(fourcc="MJPG", buffer_size=1)
+
+
+def fourcc_to_str(code: float) -> str:
+	"""CAP_PROP_FOURCC value -> four-character code ("" when the backend does not report one)."""
+	code = int(code)
+	if code <= 0:
+		return ""
+	return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+	"""Parse "1280x720" into (1280, 720)."""
+	try:
+		w, h = text.lower().split("x")
+		return int(w), int(h)
+	except ValueError:
+		raise ValueError(f"Expected WIDTHxHEIGHT, got {text!r}") from None
+
+
+@dataclass(frozen=True)
+class CaptureReport:
+	requested: CaptureSettings
+	granted: CaptureSettings
+	backend: str = ""
+
+	def mismatches(self) -> List[str]:
+		"""Requested properties the driver did not grant."""
+		out = []
+		for f in fields(CaptureSettings):
+			want, got = getattr(self.requested, f.name), getattr(self.granted, f.name)
+			if want is None or got is None:
+				continue
+			if f.name == "fps" and abs(want - got) < 0.5:
+				continue
+			if f.name == "fourcc" and want.upper() == got.upper():
+				continue
+			if want != got:
+				out.append(f"{f.name} {want} -> {got}")
+		return out
+
+	def summary(self) -> str:
+		text = f"[Capture] {self.granted.label}"
+		if self.backend:
+			text += f" via {self.backend}"
+		if any(getattr(self.requested, f.name) is not None for f in fields(CaptureSettings)):
+			text += f" (requested {self.requested.label})"
+		mismatches = self.mismatches()
+		if mismatches:
+			text += "; not granted: " + ", ".join(mismatches)
+		return text
+
+
+def read_settings(cap) -> CaptureSettings:
+	"""What the capture is actually delivering, as far as the backend reports it."""
+	fps = cap.get(cv2.CAP_PROP_FPS)
+	buffer_size = int(cap.get(cv2.CAP_PROP_BUFFERSIZE))
+	return CaptureSettings(
+		width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or None,
+		height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or None,
+		fps=fps if fps > 0 else None,
+		fourcc=fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)) or None,
+		buffer_size=buffer_size if buffer_size > 0 else None,
+	)
+
+
+def apply_settings(cap, settings: CaptureSettings) -> None:
+	"""Request ``settings`` from an open camera.
+
+	The pixel format goes first: V4L2 and others only offer some sizes and
+	rates in some formats, and switching format can reset the size.
+	"""
+	if settings.fourcc:
+		cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*settings.fourcc.upper().ljust(4)[:4]))
+	if settings.width:
+		cap.set(cv2.CAP_PROP_FRAME_WIDTH, settings.width)
+	if settings.height:
+		cap.set(cv2.CAP_PROP_FRAME_HEIGHT, settings.height)
+	if settings.fps:
+		cap.set(cv2.CAP_PROP_FPS, settings.fps)
+	if settings.buffer_size:
+		cap.set(cv2.CAP_PROP_BUFFERSIZE, settings.buffer_size)
+
+
+def open_capture(source: Union[int, str] = 0, settings: Optional[CaptureSettings] = None,
+				 api_preference: int = cv2.CAP_ANY) -> Tuple["cv2.VideoCapture", CaptureReport]:
+	"""Open a camera index (with ``settings`` applied) or a video file.
+
+	Returns the capture and a CaptureReport of requested vs granted; check
+	``cap.isOpened()`` as with cv2.VideoCapture.
+	"""
+	requested = settings or CaptureSettings()
+	cap = cv2.VideoCapture(source, api_preference)
+	if not cap.isOpened():
+		return cap, CaptureReport(requested, CaptureSettings())
+	if isinstance(source, int):
+		apply_settings(cap, requested)
+	else:
+		requested = CaptureSettings()  # a file delivers what it contains
+	try:
+		backend = cap.getBackendName()
+	except cv2.error:
+		backend = ""
+	return cap, CaptureReport(requested, read_settings(cap), backend)
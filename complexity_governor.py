@@ -0,0 +1,136 @@
+"""
+Adaptive model-complexity governor for a target frame rate.
+
+Moves a pose detector along a ladder of settings ordered from cheapest to
+most accurate: MediaPipe model complexity 0/1/2 and, optionally, reduced
+inference resolutions below complexity 0. Inference latency is kept in a
+sliding window; once the window is full the governor steps down when the
+median exceeds the inference budget and steps up when it is well under it.
+
+Flapping is avoided three ways: the window is refilled after every switch,
+switches are at least ``cooldown_s`` apart, and a level the governor had to
+leave is not retried for ``retry_after_s`` (doubling each time it fails).
+
+observe() must be called on the thread that runs the detector, since a
+switch rebuilds the detector's graph.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from stage_timer import RingBuffer, StageTimer
+
+
+@dataclass(frozen=True)
+class Level:
+	"""One rung of the ladder."""
+	model_complexity: int
+	input_scale: float = 1.0
+
+	@property
+	def label(self) -> str:
+		return f"complexity {self.model_complexity} @ {self.input_scale:.0%}"
+
+
+DEFAULT_LADDER = (Level(0), Level(1), Level(2))
+# Downscaled inputs below the lite model, for CPUs that miss the target even there
+SCALED_LADDER = (Level(0, 0.5), Level(0, 0.75)) + DEFAULT_LADDER
+
+
+class ComplexityGovernor:
+	def __init__(self, detector, target_fps: float = 30.0, ladder: Sequence[Level] = DEFAULT_LADDER,
+				 inference_share: float = 0.6, window: int = 30, cooldown_s: float = 2.0,
+				 up_threshold: float = 0.5, retry_after_s: float = 30.0,
+				 timer: Optional[StageTimer] = None, clock=time.monotonic) -> None:
+		"""
+		Args:
+			detector: Object with set_model_complexity() and an input_scale attribute
+			target_fps: Frame rate to hold
+			ladder: Levels from cheapest to most accurate
+			inference_share: Fraction of the frame budget inference may use (the
+				rest is capture, analysis and drawing)
+			window: Inference samples per decision
+			cooldown_s: Minimum time between switches
+			up_threshold: Step up only while the median is below this fraction of the budget
+			retry_after_s: Initial wait before retrying a level that was too slow
+			timer: Optional StageTimer; the current level and switch log go into its info
+			clock: Time source (monotonic seconds)
+		"""
+		self.detector = detector
+		self.ladder = list(ladder)
+		self.budget_s = inference_share / target_fps
+		self.target_fps = target_fps
+		self.window = window
+		self.cooldown_s = cooldown_s
+		self.up_threshold = up_threshold
+		self.timer = timer
+		self._clock = clock
+		self._samples = RingBuffer(window)
+		self._start = self._last_switch = clock()
+		self._retry_at: Dict[int, float] = {}
+		self._retry_after = [retry_after_s] * len(self.ladder)
+		self.switches: List[Dict] = []
+
+		# Start at the detector's current complexity, full resolution
+		current = detector.settings["model_complexity"]
+		self.index = next((i for i, lv in enumerate(self.ladder)
+						   if lv.model_complexity == current and lv.input_scale == 1.0), 0)
+		self._apply(self.ladder[self.index])
+		self._publish()
+
+	@property
+	def level(self) -> Level:
+		return self.ladder[self.index]
+
+	def observe(self, seconds: float) -> None:
+		"""Record one inference duration and switch level if the window calls for it."""
+		self._samples.append(seconds)
+		if self._samples.count < self.window:
+			return
+		now = self._clock()
+		if now - self._last_switch < self.cooldown_s:
+			return
+		median = float(np.median(self._samples.values()))
+		if median > self.budget_s and self.index > 0:
+			self._retry_at[self.index] = now + self._retry_after[self.index]
+			self._retry_after[self.index] *= 2
+			self._switch(self.index - 1, now, median, "over budget")
+		elif (median < self.budget_s * self.up_threshold and self.index < len(self.ladder) - 1
+			  and now >= self._retry_at.get(self.index + 1, 0.0)):
+			self._switch(self.index + 1, now, median, "headroom")
+
+	def _apply(self, level: Level) -> None:
+		self.detector.set_model_complexity(level.model_complexity)
+		self.detector.input_scale = level.input_scale
+
+	def _switch(self, index: int, now: float, median: float, reason: str) -> None:
+		old, new = self.level, self.ladder[index]
+		try:
+			self._apply(new)
+		except FileNotFoundError as e:
+			# Tasks backend without that model bundle: never try this level again
+			print(f"[Governor] {new.label} unavailable: {e}")
+			self._retry_at[index] = float("inf")
+			return
+		self.index = index
+		self._samples = RingBuffer(self.window)
+		self._last_switch = now
+		self.switches.append({
+			"t": round(now - self._start, 3),
+			"from": old.label,
+			"to": new.label,
+			"reason": reason,
+			"median_ms": round(median * 1000.0, 2),
+			"budget_ms": round(self.budget_s * 1000.0, 2),
+		})
+		print(f"[Governor] {reason}: {old.label} -> {new.label} "
+			  f"(median inference {median * 1000.0:.1f} ms, budget {self.budget_s * 1000.0:.1f} ms)")
+		self._publish()
+
+	def _publish(self) -> None:
+		if self.timer is not None:
+			self.timer.set_info("model_level", self.level.label)
+			self.timer.set_info("model_switches", list(self.switches))
@@ -2,14 +2,14 @@
 Debug script to test Push-up angle computation
 """
 import cv2
-from pose_detector import PoseDetector
+from pose_daemon import open_pose_detector
 from angle_utils import calculate_angle
 
 def main():
     print("🔍 Push-up Angle Debug Test")
     print("=" * 40)
     
-    detector = PoseDetector(model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+    detector = open_pose_detector(model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
     cap = cv2.VideoCapture(0)
     
     if not cap.isOpened():
@@ -3,7 +3,8 @@ Debug script to test Push-up HUD angle display
 """
 import cv2
 from typing import Dict
-from pose_detector import PoseDetector
+from capture import WEBCAM_DEFAULTS, open_capture
+from pose_daemon import open_pose_detector
 from angle_utils import calculate_angle
 from feedback import FeedbackEngine
 
@@ -11,13 +12,14 @@ def main():
     print("🔍 Push-up HUD Debug Test")
     print("=" * 40)
     
-    detector = PoseDetector(model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+    detector = open_pose_detector(model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
     engine = FeedbackEngine()
-    cap = cv2.VideoCapture(0)
+    cap, capture_report = open_capture(0, WEBCAM_DEFAULTS)
     
     if not cap.isOpened():
         print("Could not open webcam.")
         return
+    print(capture_report.summary())
     
     frame_count = 0
     try:
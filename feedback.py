@@ -1,5 +1,8 @@
-from typing import Dict, Tuple, Optional
-from angle_utils import calculate_angle, is_angle_in_range
+from collections.abc import Mapping as MappingABC
+from typing import Any, Dict, Iterable, Iterator, Mapping, Tuple, Optional
+import numpy as np
+from angle_utils import calculate_angle, calculate_angles, first_valid, is_angle_in_range
+from landmarks import LandmarkFrame, as_landmark_array, side_triplets
 
 # Joint definitions mapping to triplets of landmark names from Mediapipe
 # Angles are measured at the middle point (B) in A-B-C
@@ -16,19 +19,98 @@ JOINT_DEFINITIONS: Dict[str, Tuple[str, str, str]] = {
 LEFT_PREFIX = "LEFT_"
 RIGHT_PREFIX = "RIGHT_"
 
+# Precompiled landmark indices: JOINT_TRIPLETS[j, s] is the (A, B, C) index
+# triplet of JOINT_NAMES[j] on SIDES[s]. Joints sharing a triplet (Hip/Back,
+# Elbow/Arm) are evaluated once via _UNIQUE_TRIPLETS/_JOINT_ROWS.
+JOINT_NAMES: Tuple[str, ...] = tuple(JOINT_DEFINITIONS)
+SIDES: Tuple[str, str] = ("LEFT", "RIGHT")
+JOINT_TRIPLETS = np.stack([side_triplets(*JOINT_DEFINITIONS[j], sides=SIDES) for j in JOINT_NAMES])
+_UNIQUE_TRIPLETS, _JOINT_ROWS = np.unique(JOINT_TRIPLETS.reshape(-1, 3), axis=0, return_inverse=True)
+_JOINT_ROWS = _JOINT_ROWS.reshape(len(JOINT_NAMES), len(SIDES))
+_JOINT_POSITION = {name: j for j, name in enumerate(JOINT_NAMES)}
+
+
+def reference_joints(exercise_refs: Mapping[str, Any]) -> Tuple[str, ...]:
+	"""Joint names an exercise's reference data mentions, in JOINT_NAMES order.
+
+	Handles both layouts in references.json: phase -> {joint: [lo, hi]} and
+	joint -> {"Min": .., "Max": ..}.
+	"""
+	found = set()
+	for key, value in exercise_refs.items():
+		if key in JOINT_DEFINITIONS:
+			found.add(key)
+		elif isinstance(value, Mapping):
+			found.update(k for k in value if k in JOINT_DEFINITIONS)
+	return tuple(j for j in JOINT_NAMES if j in found)
+
+
+class JointAngles(MappingABC):
+	"""Lazily evaluated joint -> angle mapping for one frame.
+
+	An angle is computed the first time it is read and cached per side
+	triplet, so each (joint, side) is evaluated at most once per frame and
+	joints sharing a triplet share the result. Iteration covers ``joints``
+	(e.g. what the HUD shows); lookups work for every joint in
+	JOINT_DEFINITIONS.
+	"""
+
+	__slots__ = ("_data", "_columns", "_joints", "_rows")
+
+	def __init__(self, lms: Mapping[str, object], side_priority: Tuple[str, str] = ("LEFT", "RIGHT"),
+				 joints: Optional[Iterable[str]] = None) -> None:
+		self._data = as_landmark_array(lms)
+		self._columns = tuple(SIDES.index(side.upper()) for side in side_priority)
+		self._joints = JOINT_NAMES if joints is None else tuple(j for j in joints if j in JOINT_DEFINITIONS)
+		self._rows: Dict[int, float] = {}
+
+	def _row_angle(self, row: int) -> float:
+		angle = self._rows.get(row)
+		if angle is None:
+			a, b, c = self._data[_UNIQUE_TRIPLETS[row], :2]
+			angle = calculate_angle(a, b, c)
+			self._rows[row] = angle
+		return angle
+
+	def joint(self, name: str, side_priority: Optional[Tuple[str, str]] = None) -> float:
+		"""Angle of ``name`` from the first side with all points, optionally with another side priority."""
+		j = _JOINT_POSITION[name]
+		columns = self._columns if side_priority is None else (SIDES.index(s.upper()) for s in side_priority)
+		for col in columns:
+			angle = self._row_angle(int(_JOINT_ROWS[j, col]))
+			if angle == angle:  # not NaN
+				return angle
+		return float('nan')
+
+	def __getitem__(self, name: str) -> float:
+		if name not in _JOINT_POSITION:
+			raise KeyError(name)
+		return self.joint(name)
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self._joints)
+
+	def __len__(self) -> int:
+		return len(self._joints)
+
+	def __repr__(self) -> str:
+		return f"JointAngles({len(self._rows)} of {len(_UNIQUE_TRIPLETS)} triplets evaluated)"
+
 
 class FeedbackEngine:
 	def __init__(self) -> None:
 		pass
 
 	@staticmethod
-	def _get_point(lms: Dict[str, object], name: str) -> Optional[Tuple[float, float]]:
+	def _get_point(lms: Mapping[str, object], name: str) -> Optional[Tuple[float, float]]:
+		if isinstance(lms, LandmarkFrame):
+			return lms.point_xy(name)
 		p = lms.get(name)
 		if p is None:
 			return None
 		return (p.x, p.y)
 
-	def compute_joint_angle(self, lms: Dict[str, object], joint_name: str, side: str = "LEFT") -> float:
+	def compute_joint_angle(self, lms: Mapping[str, object], joint_name: str, side: str = "LEFT") -> float:
 		triplet = JOINT_DEFINITIONS.get(joint_name)
 		if triplet is None:
 			return float('nan')
@@ -43,16 +125,23 @@ class FeedbackEngine:
 			return float('nan')
 		return calculate_angle(pa, pb, pc)
 
-	def compute_all_angles(self, lms: Dict[str, object], side_priority: Tuple[str, str] = ("LEFT", "RIGHT")) -> Dict[str, float]:
-		angles: Dict[str, float] = {}
-		for joint in JOINT_DEFINITIONS.keys():
-			angle_val = float('nan')
-			for side in side_priority:
-				angle_val = self.compute_joint_angle(lms, joint, side)
-				if angle_val == angle_val:  # not NaN
-					break
-			angles[joint] = angle_val
-		return angles
+	@staticmethod
+	def joint_side_angles(lms: Mapping[str, object]) -> np.ndarray:
+		"""(len(JOINT_NAMES), 2) angles for every joint on both SIDES, NaN where points are missing."""
+		unique = calculate_angles(as_landmark_array(lms)[_UNIQUE_TRIPLETS, :2])
+		return unique[_JOINT_ROWS]
+
+	@staticmethod
+	def angle_view(lms: Mapping[str, object], side_priority: Tuple[str, str] = ("LEFT", "RIGHT"),
+				   joints: Optional[Iterable[str]] = None) -> JointAngles:
+		"""Lazy alternative to compute_all_angles for callers that read only a few joints."""
+		return JointAngles(lms, side_priority, joints)
+
+	def compute_all_angles(self, lms: Mapping[str, object], side_priority: Tuple[str, str] = ("LEFT", "RIGHT")) -> Dict[str, float]:
+		per_side = self.joint_side_angles(lms)
+		columns = [SIDES.index(side.upper()) for side in side_priority]
+		best = first_valid(*per_side[:, columns].T)
+		return dict(zip(JOINT_NAMES, best.tolist()))
 
 	def check_feedback(self, exercise: str, phase: str, ref_ranges: Dict[str, Tuple[float, float]], angles: Dict[str, float]) -> Tuple[bool, str]:
 		missing: list[str] = []
@@ -0,0 +1,58 @@
+"""
+Reusable output arrays for the per-frame OpenCV conversions before inference.
+
+``cv2.cvtColor`` and ``cv2.resize`` return a freshly allocated image unless
+they are given a ``dst`` of the right shape and dtype. At 1080p that is a
+6 MB RGB copy (plus the resized copy with input_scale or ROI crops) on every
+frame. FrameBuffers keeps one array per (purpose, shape) and hands it back
+as ``dst``, so a steady stream converts into the same memory every frame.
+
+The arrays are overwritten on the next call: callers must be done with the
+previous frame's image by then. MediaPipe copies the input into its own
+packet/Image, so passing a buffer to ``process``/``detect_*`` is safe.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+class FrameBuffers:
+	def __init__(self, max_entries: int = 4) -> None:
+		"""
+		Args:
+			max_entries: Shapes to keep buffers for; the least recently used
+				one is dropped beyond that (ROI crops change size now and then)
+		"""
+		import cv2
+		self._cv2 = cv2
+		self.max_entries = max_entries
+		self._arrays: Dict[Tuple, np.ndarray] = {}
+		self.allocations = 0
+
+	def get(self, tag: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+		"""The writeable buffer for ``tag`` and ``shape``, allocated on first use."""
+		key = (tag, tuple(shape), np.dtype(dtype).str)
+		buf = self._arrays.pop(key, None)
+		if buf is None:
+			if len(self._arrays) >= self.max_entries:
+				del self._arrays[next(iter(self._arrays))]
+			buf = np.empty(shape, dtype=dtype)
+			self.allocations += 1
+		buf.flags.writeable = True
+		self._arrays[key] = buf  # re-inserted last = most recently used
+		return buf
+
+	def resize(self, image: np.ndarray, scale: float, interpolation=None) -> np.ndarray:
+		"""``cv2.resize(image, None, fx=scale, fy=scale)`` into a reused buffer."""
+		h, w = image.shape[:2]
+		size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+		dst = self.get("resize", (size[1], size[0]) + image.shape[2:], image.dtype)
+		if interpolation is None:
+			interpolation = self._cv2.INTER_AREA
+		return self._cv2.resize(image, size, dst, interpolation=interpolation)
+
+	def bgr_to_rgb(self, image: np.ndarray) -> np.ndarray:
+		"""``cv2.cvtColor(image, COLOR_BGR2RGB)`` into a reused buffer."""
+		dst = self.get("rgb", image.shape, image.dtype)
+		return self._cv2.cvtColor(image, self._cv2.COLOR_BGR2RGB, dst)
@@ -0,0 +1,60 @@
+"""
+Display pacing and non-blocking key input for the interactive loops.
+
+``cv2.waitKey(30)`` used to do both jobs in main.py: it pumped the HighGUI
+event loop (needed for keys and window repaints) and slept up to 30 ms, which
+capped the whole loop at ~33 fps and added that much latency to every frame.
+FramePacer splits them:
+
+- ``due()`` says whether a frame should be rendered now, at most
+  ``target_fps`` times per second on a fixed schedule, so analysis can run
+  faster than the screen refreshes without drawing frames nobody sees;
+- ``poll_key()`` pumps events and returns the pressed key without sleeping
+  (``cv2.pollKey``; ``waitKey(1)`` on OpenCV builds that lack it);
+- ``time_to_next()`` tells a loop with nothing else to do how long it may
+  block (e.g. on the pipeline's result queue) before the next render.
+"""
+
+import time
+from typing import Callable, Optional
+
+
+class FramePacer:
+	def __init__(self, target_fps: float = 60.0, clock: Callable[[], float] = time.perf_counter) -> None:
+		"""
+		Args:
+			target_fps: Render rate limit, typically the display's refresh
+				rate; 0 renders every frame
+			clock: Monotonic time source in seconds (tests pass a fake)
+		"""
+		self.interval = 1.0 / target_fps if target_fps > 0 else 0.0
+		self.clock = clock
+		self._next: Optional[float] = None
+		self.rendered = 0
+		self.skipped = 0
+		self._poll = None
+
+	def due(self) -> bool:
+		"""True when a frame should be rendered now; advances the schedule."""
+		now = self.clock()
+		if self._next is None or now >= self._next:
+			# Stay on the fixed grid, but never try to catch up on missed ticks
+			following = None if self._next is None else self._next + self.interval
+			self._next = following if following is not None and following > now else now + self.interval
+			self.rendered += 1
+			return True
+		self.skipped += 1
+		return False
+
+	def time_to_next(self) -> float:
+		"""Seconds until the next render is due (0 when it already is)."""
+		if self._next is None:
+			return 0.0
+		return max(0.0, self._next - self.clock())
+
+	def poll_key(self) -> int:
+		"""Pump window events and return the pressed key (0xFF for none), without sleeping."""
+		if self._poll is None:
+			import cv2
+			self._poll = getattr(cv2, "pollKey", None) or (lambda: cv2.waitKey(1))
+		return self._poll() & 0xFF
@@ -0,0 +1,169 @@
+"""
+Threaded capture / inference pipeline with latest-frame-wins hand-off.
+
+Capture and pose inference each run on their own thread and pass work on
+through single-slot queues. When a consumer falls behind, the producer
+replaces the queued item instead of blocking, so stale frames are dropped
+rather than adding latency. Rendering stays on the caller's thread because
+cv2.imshow/waitKey must run there.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
+
+import numpy as np
+
+
+class LatestQueue:
+	"""Bounded queue where a put on a full queue evicts the oldest item."""
+
+	def __init__(self, maxsize: int = 1) -> None:
+		self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+		self._lock = threading.Lock()
+		self.dropped = 0
+
+	def put(self, item: Any) -> None:
+		with self._lock:
+			while True:
+				try:
+					self._queue.put_nowait(item)
+					return
+				except queue.Full:
+					try:
+						self._queue.get_nowait()
+						self.dropped += 1
+					except queue.Empty:
+						pass
+
+	def get(self, timeout: Optional[float] = None) -> Any:
+		return self._queue.get(timeout=timeout)
+
+
+class PipelineStats:
+	"""Throughput and capture-to-display latency of a pipeline run."""
+
+	def __init__(self, window: int = 300) -> None:
+		self.captured = 0
+		self.processed = 0
+		self.displayed = 0
+		self._latencies: Deque[float] = deque(maxlen=window)
+		self._start = time.perf_counter()
+
+	def record_display(self, capture_ts: float) -> None:
+		self.displayed += 1
+		self._latencies.append(time.perf_counter() - capture_ts)
+
+	def summary(self) -> dict:
+		elapsed = max(1e-9, time.perf_counter() - self._start)
+		lat_ms = np.asarray(self._latencies, dtype=float) * 1000.0
+		out = {
+			"elapsed_s": elapsed,
+			"captured": self.captured,
+			"processed": self.processed,
+			"displayed": self.displayed,
+			"capture_fps": self.captured / elapsed,
+			"display_fps": self.displayed / elapsed,
+		}
+		if lat_ms.size:
+			out["latency_ms_mean"] = float(lat_ms.mean())
+			out["latency_ms_p50"] = float(np.percentile(lat_ms, 50))
+			out["latency_ms_p95"] = float(np.percentile(lat_ms, 95))
+		return out
+
+	def report(self, dropped_capture: int = 0, dropped_inference: int = 0) -> None:
+		s = self.summary()
+		print(f"[Pipeline] {s['displayed']} frames in {s['elapsed_s']:.1f}s: "
+			  f"capture {s['capture_fps']:.1f} fps, display {s['display_fps']:.1f} fps, "
+			  f"dropped {dropped_capture} before inference / {dropped_inference} before render")
+		if "latency_ms_mean" in s:
+			print(f"[Pipeline] capture->display latency: mean {s['latency_ms_mean']:.1f} ms, "
+				  f"p50 {s['latency_ms_p50']:.1f} ms, p95 {s['latency_ms_p95']:.1f} ms")
+
+
+class _Failure:
+	"""End-of-stream marker for a stage that raised; get() re-raises ``error``."""
+
+	def __init__(self, error: BaseException) -> None:
+		self.error = error
+
+
+class FramePipeline:
+	"""Runs ``read_frame`` and ``infer`` on background threads.
+
+	``read_frame()`` returns a frame or None at end of stream. ``infer(frame)``
+	returns any payload (e.g. pose results and landmarks). Results come back
+	from :meth:`get` as ``(capture_ts, frame, payload)`` tuples, newest first
+	wins; ``None`` means the stream ended. An exception raised by either
+	callable ends the stream too, and is re-raised by :meth:`get`.
+	"""
+
+	def __init__(self, read_frame: Callable[[], Optional[np.ndarray]], infer: Callable[[np.ndarray], Any]) -> None:
+		self._read_frame = read_frame
+		self._infer = infer
+		self._frames = LatestQueue(maxsize=1)
+		self._results = LatestQueue(maxsize=1)
+		self._stop = threading.Event()
+		self._threads = [
+			threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+			threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+		]
+		self.stats = PipelineStats()
+
+	def start(self) -> "FramePipeline":
+		for t in self._threads:
+			t.start()
+		return self
+
+	def stop(self, timeout: Optional[float] = 2.0) -> bool:
+		"""Stop both threads; False if one is still running after ``timeout``.
+
+		A thread that is still running may be inside read_frame() or infer(),
+		so the capture and detector must not be released until it finishes.
+		"""
+		self._stop.set()
+		for t in self._threads:
+			t.join(timeout=timeout)
+		return not any(t.is_alive() for t in self._threads)
+
+	def _capture_loop(self) -> None:
+		# Only this thread puts frames, so its end marker is never evicted
+		try:
+			while not self._stop.is_set():
+				frame = self._read_frame()
+				if frame is None:
+					self._frames.put(None)
+					return
+				self.stats.captured += 1
+				self._frames.put((time.perf_counter(), frame))
+		except Exception as e:
+			self._frames.put(_Failure(e))
+
+	def _inference_loop(self) -> None:
+		try:
+			while not self._stop.is_set():
+				try:
+					item = self._frames.get(timeout=0.1)
+				except queue.Empty:
+					continue
+				if item is None or isinstance(item, _Failure):
+					self._results.put(item)
+					return
+				capture_ts, frame = item
+				payload = self._infer(frame)
+				self.stats.processed += 1
+				self._results.put((capture_ts, frame, payload))
+		except Exception as e:
+			self._results.put(_Failure(e))
+
+	def get(self, timeout: Optional[float] = None) -> Optional[Tuple[float, np.ndarray, Any]]:
+		"""Next result; raises queue.Empty on timeout, or what read_frame/infer raised."""
+		item = self._results.get(timeout=timeout)
+		if isinstance(item, _Failure):
+			raise item.error
+		return item
+
+	def report(self) -> None:
+		self.stats.report(self._frames.dropped, self._results.dropped)
@@ -0,0 +1,256 @@
+"""
+Cached HUD rendering for the interactive loops in main.py.
+
+The HUD is two black panels (exercise/phase/reps/feedback on the left, joint
+angles on the right) with about ten lines of text. Drawing it immediate-mode
+(draw_hud_direct: two filled rectangles and a cv2.putText per line on the
+full frame) costs far more than compositing it:
+
+- each panel background is pre-rendered once per layout and kept as a
+  small image;
+- the key legend and every distinct text line are rendered once into a
+  glyph tile (a tight crop plus its ink mask) kept in an LRU cache, so the
+  labels and any rep count or angle value that comes back cost nothing;
+- only lines that changed are redrawn into their panel (the whole panel
+  only when changed lines overlap others), and each frame then gets one
+  block copy per panel.
+
+hud_layout() is the single description of what goes where; both renderers
+draw from it. Tiles are rendered on black, which is what the panels are, so
+the cached output matches draw_hud_direct pixel for pixel; only where two
+lines overlap (the plank hip angles and the key legend) is the anti-aliased
+edge blended from the tile's coverage, within a level or two.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+KEY_LEGEND = "Keys: 1=Squat 2=Plank 3=BicepCurl"
+LEFT_WIDTH = 350
+RIGHT_WIDTH = 220
+RIGHT_HEIGHT = 170
+
+# (text, origin (x, y) in frame pixels, font scale, BGR color, thickness)
+TextLine = Tuple[str, Tuple[int, int], float, Tuple[int, int, int], int]
+
+
+def hud_layout(frame_width: int, angles: Mapping[str, float], exercise: str, phase: str, ok: bool, msg: str,
+			   reps: int, plank_info=None) -> Tuple[int, List[TextLine], int, List[TextLine]]:
+	"""(left panel height, left lines, right panel x, right lines); the key legend is the last left line."""
+	# Taller left panel for the plank info
+	hud_height = 200 if exercise == "Plank" and plank_info else 160
+	left: List[TextLine] = [
+		(f"Exercise: {exercise}", (10, 25), 0.7, (0, 255, 255), 2),
+		(f"Phase: {phase}", (10, 55), 0.7, (255, 255, 0), 2),
+	]
+	if exercise == "Plank" and plank_info:
+		elapsed, total, active, left_angle, right_angle = plank_info
+		status = "ACTIVE" if active else "WAITING"
+		status_color = (0, 255, 0) if active else (0, 215, 255)
+		left.append((f"Timer: {elapsed:.1f}s", (10, 85), 0.8, (255, 255, 0), 2))
+		left.append((f"Status: {status}", (10, 115), 0.7, status_color, 2))
+		left.append((f"Total: {total:.1f}s", (10, 145), 0.7, (0, 255, 255), 2))
+		if left_angle is not None:
+			left.append((f"L Hip: {left_angle:.0f}°", (10, 175), 0.6, (200, 200, 200), 2))
+		if right_angle is not None:
+			left.append((f"R Hip: {right_angle:.0f}°", (150, 175), 0.6, (200, 200, 200), 2))
+	else:
+		left.append((f"Reps: {reps}", (10, 85), 0.8, (0, 255, 0), 2))
+		left.append((msg, (10, 115), 0.6, (0, 200, 0) if ok else (0, 0, 255), 2))
+	left.append((KEY_LEGEND, (10, hud_height - 20), 0.5, (150, 150, 150), 1))
+
+	# Angle readouts (right side)
+	x0 = frame_width - RIGHT_WIDTH
+	right: List[TextLine] = []
+	for i, k in enumerate(angles):
+		ang = angles.get(k, float('nan'))
+		right.append((f"{k}: {'%.0f' % ang if ang == ang else '-'}", (x0, 25 + i * 28), 0.6, (200, 200, 200), 2))
+	return hud_height, left, x0 - 10, right
+
+
+def _put(frame, line: TextLine, offset: Tuple[int, int] = (0, 0)) -> None:
+	text, (x, y), scale, color, thickness = line
+	cv2.putText(frame, text, (x - offset[0], y - offset[1]), FONT, scale, color, thickness)
+
+
+def draw_hud_direct(frame, angles: Mapping[str, float], exercise: str, phase: str, ok: bool, msg: str,
+					reps: int, plank_info=None) -> None:
+	"""Immediate-mode HUD: rectangles and putText on the frame (the reference for HudRenderer)."""
+	hud_height, left, right_x, right = hud_layout(frame.shape[1], angles, exercise, phase, ok, msg, reps, plank_info)
+	cv2.rectangle(frame, (0, 0), (LEFT_WIDTH, hud_height), (0, 0, 0), -1)
+	for line in left:
+		_put(frame, line)
+	cv2.rectangle(frame, (right_x, 0), (frame.shape[1], RIGHT_HEIGHT), (0, 0, 0), -1)
+	for line in right:
+		_put(frame, line)
+
+
+class _Tile:
+	"""One text line rendered on black: pixels, coverage (0-255) and placement relative to the text origin."""
+
+	__slots__ = ("image", "coverage", "dx", "dy")
+
+	def __init__(self, line: TextLine) -> None:
+		text, _, scale, color, thickness = line
+		(w, h), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+		pad = thickness + 2
+		self.image = np.zeros((h + baseline + 2 * pad, w + 2 * pad, 3), dtype=np.uint8)
+		self.dx, self.dy = pad, pad + h
+		cv2.putText(self.image, text, (self.dx, self.dy), FONT, scale, color, thickness)
+		coverage = np.zeros(self.image.shape[:2], dtype=np.uint8)
+		cv2.putText(coverage, text, (self.dx, self.dy), FONT, scale, 255, thickness)
+		# Crop to the ink so neighbouring lines' boxes do not overlap needlessly
+		rows, cols = np.flatnonzero(coverage.any(axis=1)), np.flatnonzero(coverage.any(axis=0))
+		top, bottom = (rows[0], rows[-1] + 1) if rows.size else (0, 0)
+		left, right = (cols[0], cols[-1] + 1) if cols.size else (0, 0)
+		self.image = self.image[top:bottom, left:right].copy()
+		self.coverage = coverage[top:bottom, left:right, None].astype(np.uint16)
+		self.dx -= left
+		self.dy -= top
+
+	def blend(self, region) -> None:
+		"""Draw onto ``region`` (uint8 BGR, the tile's size) as putText would."""
+		keep = (region * (255 - self.coverage) + 127) // 255
+		np.minimum(keep + self.image, 255, out=keep)
+		region[:] = keep
+
+
+Rect = Tuple[int, int, int, int]  # x, y, w, h in panel pixels
+
+
+def _overlaps(a: Optional[Rect], b: Optional[Rect]) -> bool:
+	if a is None or b is None:
+		return False
+	return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+class _Panel:
+	def __init__(self, height: int, width: int, offset: Tuple[int, int]) -> None:
+		self.offset = offset
+		self.image = np.zeros((height, width, 3), dtype=np.uint8)
+		self.lines: Optional[Tuple[TextLine, ...]] = None
+		self.rects: List[Optional[Rect]] = []
+		self.overflow: List[TextLine] = []
+
+
+class HudRenderer:
+	def __init__(self, max_tiles: int = 512) -> None:
+		"""
+		Args:
+			max_tiles: Distinct text lines kept rendered (least recently used dropped)
+		"""
+		self.max_tiles = max_tiles
+		self._tiles: "OrderedDict[TextLine, _Tile]" = OrderedDict()
+		self._panels: Dict[tuple, _Panel] = {}
+		self.tiles_rendered = 0
+		self.panels_composed = 0
+		self.lines_redrawn = 0
+
+	def _tile(self, line: TextLine) -> _Tile:
+		tile = self._tiles.get(line)
+		if tile is None:
+			tile = _Tile(line)
+			self.tiles_rendered += 1
+			if len(self._tiles) >= self.max_tiles:
+				self._tiles.popitem(last=False)
+			self._tiles[line] = tile
+		else:
+			self._tiles.move_to_end(line)
+		return tile
+
+	def _panel(self, side: str, height: int, width: int, offset: Tuple[int, int]) -> _Panel:
+		key = (side, height, width, offset)
+		panel = self._panels.get(key)
+		if panel is None:
+			panel = self._panels[key] = _Panel(height, width, offset)
+		return panel
+
+	def _place(self, panel: _Panel, line: TextLine) -> Tuple[_Tile, Optional[Rect]]:
+		"""The line's tile and its box in the panel (None when it runs past the panel)."""
+		tile = self._tile(line)
+		x = line[1][0] - panel.offset[0] - tile.dx
+		y = line[1][1] - panel.offset[1] - tile.dy
+		th, tw = tile.image.shape[:2]
+		ph, pw = panel.image.shape[:2]
+		if x < 0 or y < 0 or x + tw > pw or y + th > ph:
+			return tile, None
+		return tile, (x, y, tw, th)
+
+	def _compose(self, panel: _Panel, lines: Tuple[TextLine, ...]) -> None:
+		"""Bring the panel up to date with ``lines``.
+
+		Changed lines whose old and new boxes touch no other line are redrawn
+		in place; otherwise the panel is redrawn from all tiles, in order.
+		"""
+		if panel.lines == lines:
+			return
+		placed = [self._place(panel, line) for line in lines]
+		rects = [rect for _, rect in placed]
+		image = panel.image
+		if panel.lines is not None and len(panel.lines) == len(lines):
+			changed = [i for i, (old, new) in enumerate(zip(panel.lines, lines)) if old != new]
+			isolated = all(
+				not _overlaps(box, rects[j])
+				for i in changed for box in (panel.rects[i], rects[i])
+				for j in range(len(lines)) if j != i
+			)
+			if isolated:
+				for i in changed:
+					if panel.rects[i] is not None:
+						x, y, w, h = panel.rects[i]
+						image[y:y + h, x:x + w] = 0
+				for i in changed:
+					if rects[i] is not None:
+						x, y, w, h = rects[i]
+						image[y:y + h, x:x + w] = placed[i][0].image  # on black, the tile is exact
+				self.lines_redrawn += len(changed)
+				self._commit(panel, lines, rects)
+				return
+		image[:] = 0
+		for i, (tile, rect) in enumerate(placed):
+			if rect is None:
+				continue
+			x, y, w, h = rect
+			if any(_overlaps(rect, rects[j]) for j in range(i)):
+				tile.blend(image[y:y + h, x:x + w])  # over an earlier line, as putText would
+			else:
+				image[y:y + h, x:x + w] = tile.image
+		self.lines_redrawn += len(lines)
+		self.panels_composed += 1
+		self._commit(panel, lines, rects)
+
+	@staticmethod
+	def _commit(panel: _Panel, lines: Tuple[TextLine, ...], rects: List[Optional[Rect]]) -> None:
+		panel.lines = lines
+		panel.rects = rects
+		# Text running past the panel is drawn onto the frame itself
+		panel.overflow = [line for line, rect in zip(lines, rects) if rect is None]
+
+	@staticmethod
+	def _blit(frame, panel: _Panel) -> None:
+		x, y = panel.offset
+		h = min(panel.image.shape[0], frame.shape[0] - y)
+		w = min(panel.image.shape[1], frame.shape[1] - x)
+		if h > 0 and w > 0:
+			frame[y:y + h, x:x + w] = panel.image[:h, :w]
+		for line in panel.overflow:
+			_put(frame, line)
+
+	def draw(self, frame, angles: Mapping[str, float], exercise: str, phase: str, ok: bool, msg: str,
+			 reps: int, plank_info=None) -> None:
+		"""Same output as draw_hud_direct."""
+		fh, fw = frame.shape[:2]
+		hud_height, left, right_x, right = hud_layout(fw, angles, exercise, phase, ok, msg, reps, plank_info)
+		# cv2.rectangle corners are inclusive and clipped to the frame
+		left_panel = self._panel("left", hud_height + 1, LEFT_WIDTH + 1, (0, 0))
+		self._compose(left_panel, tuple(left))
+		self._blit(frame, left_panel)
+		right_x = max(right_x, 0)
+		right_panel = self._panel("right", RIGHT_HEIGHT + 1, fw - right_x, (right_x, 0))
+		self._compose(right_panel, tuple(right))
+		self._blit(frame, right_panel)
@@ -0,0 +1,107 @@
+"""
+On-disk cache of per-frame pose landmarks for trainer videos.
+
+Entries are keyed by a hash of the video's content plus the detector
+settings (model_complexity, confidences, ...), so editing the video or
+changing the detector invalidates them automatically. Landmarks are stored
+as a (N, 33, 4) float32 .npy file and loaded memory-mapped, which lets a
+builder re-run its segmentation/tolerance logic without any pose inference.
+"""
+
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from pose_detector import PoseDetector
+from video_landmarks import extract_video_landmarks
+
+
+CACHE_DIR = ".landmark_cache"
+# Bump when the stored array layout or landmark conversion changes
+CACHE_FORMAT_VERSION = 1
+
+
+def video_content_hash(video_path: str, chunk_size: int = 1 << 20) -> str:
+	digest = hashlib.sha256()
+	with open(video_path, "rb") as f:
+		for chunk in iter(lambda: f.read(chunk_size), b""):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+def cache_key(video_path: str, detector_settings: Dict) -> str:
+	payload = json.dumps({
+		"video": video_content_hash(video_path),
+		"detector": detector_settings,
+		"format": CACHE_FORMAT_VERSION,
+	}, sort_keys=True)
+	return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _entry_paths(key: str, cache_dir: str):
+	base = os.path.join(cache_dir, key)
+	return base + ".npy", base + ".json"
+
+
+def load_cached_landmarks(key: str, cache_dir: str = CACHE_DIR) -> Optional[np.ndarray]:
+	"""Return the cached (N, 33, 4) array memory-mapped read-only, or None."""
+	npy_path, _ = _entry_paths(key, cache_dir)
+	if not os.path.exists(npy_path):
+		return None
+	try:
+		return np.load(npy_path, mmap_mode="r")
+	except (OSError, ValueError) as e:
+		print(f"Warning: Ignoring unreadable landmark cache {npy_path}: {e}")
+		return None
+
+
+def store_landmarks(key: str, series: np.ndarray, meta: Optional[Dict] = None, cache_dir: str = CACHE_DIR) -> str:
+	"""Write an entry atomically (temp file + rename) and return its .npy path."""
+	os.makedirs(cache_dir, exist_ok=True)
+	npy_path, meta_path = _entry_paths(key, cache_dir)
+	tmp_path = npy_path + ".tmp"
+	with open(tmp_path, "wb") as f:
+		np.save(f, np.ascontiguousarray(series, dtype=np.float32))
+	os.replace(tmp_path, npy_path)
+	with open(meta_path, "w", encoding="utf-8") as f:
+		json.dump(dict(meta or {}, frames=int(len(series))), f, indent=2)
+	return npy_path
+
+
+def load_or_extract_landmarks(video_path: str, detector_settings: Dict, workers: int = 1,
+							  detector_factory: Optional[Callable[[], PoseDetector]] = None,
+							  use_cache: bool = True, cache_dir: str = CACHE_DIR,
+							  progress_every: int = 20) -> np.ndarray:
+	"""Cached wrapper around video_landmarks.extract_video_landmarks.
+
+	Args:
+		video_path: Video file to analyse
+		detector_settings: PoseDetector keyword arguments (part of the cache key)
+		workers: Worker processes to use on a cache miss
+		detector_factory: Returns the detector for sequential extraction; only
+			called on a cache miss, so a hit never loads the model
+		use_cache: False forces extraction and does not touch the cache
+		cache_dir: Directory holding cache entries
+		progress_every: Progress print interval for sequential extraction
+	"""
+	key = cache_key(video_path, detector_settings) if use_cache else None
+	if key is not None:
+		cached = load_cached_landmarks(key, cache_dir)
+		if cached is not None:
+			print(f"Loaded {len(cached)} frames of landmarks from cache ({key})")
+			return cached
+
+	detector = detector_factory() if detector_factory and workers <= 1 else None
+	series = extract_video_landmarks(video_path, detector_settings, workers=workers,
+									 detector=detector, progress_every=progress_every)
+	if key is not None:
+		path = store_landmarks(key, series, meta={
+			"video_path": video_path,
+			"detector_settings": detector_settings,
+			"format": CACHE_FORMAT_VERSION,
+		}, cache_dir=cache_dir)
+		print(f"Cached landmarks for {len(series)} frames at {path}")
+	return series
@@ -0,0 +1,68 @@
+"""
+Constant-velocity landmark prediction between detections.
+
+When pose inference runs on every Nth frame (``main.py --detect-every N``)
+the frames in between get landmarks extrapolated from the last two
+measurements instead of the stale last result, so the skeleton and HUD
+angles keep moving smoothly. Velocities are per landmark over the whole
+(33, 4) array (x, y, z; visibility is carried over) and lightly smoothed
+across measurements to damp detection jitter.
+
+Predicted frames are LandmarkFrames with ``predicted=True``; main.py counts
+reps only on measured frames.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, LandmarkFrame
+
+
+class LandmarkPredictor:
+	def __init__(self, smoothing: float = 0.5, max_horizon: float = 0.25) -> None:
+		"""
+		Args:
+			smoothing: Weight of the newest velocity estimate (1.0 = no smoothing)
+			max_horizon: Seconds past the last measurement to extrapolate at most;
+				later frames hold the position reached at the horizon
+		"""
+		self.smoothing = smoothing
+		self.max_horizon = max_horizon
+		self._t: Optional[float] = None
+		self._last: Optional[np.ndarray] = None
+		self._velocity = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+
+	@property
+	def ready(self) -> bool:
+		return self._last is not None
+
+	def reset(self) -> None:
+		self._t = None
+		self._last = None
+		self._velocity[:] = 0.0
+
+	def update(self, t: float, landmarks: Optional[LandmarkFrame]) -> None:
+		"""Feed a measured frame (None when no pose was found, which resets the track)."""
+		if landmarks is None:
+			self.reset()
+			return
+		data = landmarks.array
+		if self._last is not None and t > self._t:
+			velocity = (data[:, :3] - self._last[:, :3]) / (t - self._t)
+			# Landmarks that just appeared (NaN before) start at rest
+			velocity = np.where(np.isnan(velocity), 0.0, velocity)
+			self._velocity += self.smoothing * (velocity - self._velocity)
+		else:
+			self._velocity[:] = 0.0
+		self._t = t
+		self._last = np.array(data, dtype=np.float32)
+
+	def predict(self, t: float) -> Optional[LandmarkFrame]:
+		"""Landmarks extrapolated to time ``t``, or None without a track."""
+		if self._last is None:
+			return None
+		dt = min(max(t - self._t, 0.0), self.max_horizon)
+		data = self._last.copy()
+		data[:, :3] += self._velocity * dt
+		return LandmarkFrame(data, predicted=True)
@@ -0,0 +1,96 @@
+"""
+Compact binary recordings of a landmark stream.
+
+A recording is a 16-byte header followed by fixed-size records, one per
+frame: a float64 timestamp (seconds) and a (33, 4) float32 landmark array
+in LandmarkFrame layout (x, y in pixels, z, visibility; all-NaN when no pose
+was detected). Fixed-size records let a whole file be loaded with a single
+np.fromfile/np.memmap, so replaying it through the analysis code needs no
+video decoding and no pose inference.
+"""
+
+import os
+import struct
+from typing import Iterator, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, LandmarkFrame, as_landmark_array
+
+
+MAGIC = b"LMRK"
+FORMAT_VERSION = 1
+# magic, version, landmarks per frame, values per landmark, padding to 16 bytes
+HEADER = struct.Struct("<4sHHH6x")
+RECORD_DTYPE = np.dtype([("t", "<f8"), ("landmarks", "<f4", (NUM_LANDMARKS, 4))])
+
+
+class LandmarkRecorder:
+	"""Appends (timestamp, landmarks) records to a recording file."""
+
+	def __init__(self, path: str) -> None:
+		self.path = path
+		self.frames = 0
+		self._file = open(path, "wb")
+		self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, NUM_LANDMARKS, 4))
+		self._record = np.zeros(1, dtype=RECORD_DTYPE)
+
+	def write(self, t: float, lms: Union[Mapping[str, object], np.ndarray, None]) -> None:
+		"""Record one frame (landmarks or a (33, 4) array); None (no pose) is stored as NaN."""
+		self._record["t"] = t
+		if lms is None:
+			self._record["landmarks"] = np.nan
+		elif isinstance(lms, np.ndarray):
+			self._record["landmarks"] = lms
+		else:
+			self._record["landmarks"] = as_landmark_array(lms)
+		self._file.write(self._record.tobytes())
+		self.frames += 1
+
+	def close(self) -> None:
+		if not self._file.closed:
+			self._file.close()
+
+	def __enter__(self) -> "LandmarkRecorder":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.close()
+
+
+def load_recording(path: str, mmap: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+	"""Return (timestamps (N,), landmarks (N, 33, 4)) from a recording file.
+
+	A partial record at the end (a recording session that was killed) is
+	dropped.
+	"""
+	with open(path, "rb") as f:
+		header = f.read(HEADER.size)
+	if len(header) < HEADER.size:
+		raise ValueError(f"Not a landmark recording (truncated header): {path}")
+	magic, version, num_landmarks, fields = HEADER.unpack(header)
+	if magic != MAGIC:
+		raise ValueError(f"Not a landmark recording: {path}")
+	if version != FORMAT_VERSION or num_landmarks != NUM_LANDMARKS or fields != 4:
+		raise ValueError(f"Unsupported landmark recording v{version} ({num_landmarks}x{fields}): {path}")
+
+	count = (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+	if mmap and count > 0:
+		records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+	else:
+		records = np.fromfile(path, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+	return records["t"], records["landmarks"]
+
+
+def iter_landmarks(timestamps: np.ndarray, landmarks: np.ndarray) -> Iterator[Tuple[float, Optional[LandmarkFrame]]]:
+	"""Yield (timestamp, LandmarkFrame or None) per frame of loaded recording arrays."""
+	for t, data in zip(timestamps.tolist(), landmarks):
+		if np.isnan(data[:, 0]).all():
+			yield t, None
+		else:
+			yield t, LandmarkFrame(data)
+
+
+def iter_recording(path: str) -> Iterator[Tuple[float, Optional[LandmarkFrame]]]:
+	"""Yield (timestamp, LandmarkFrame or None) per recorded frame."""
+	return iter_landmarks(*load_recording(path))
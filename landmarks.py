@@ -0,0 +1,178 @@
+"""
+Landmark data types shared by detection and analysis code.
+
+Only depends on NumPy, so analysis modules, builders' offline steps, worker
+processes and tests can use landmarks without importing cv2 or MediaPipe.
+pose_detector re-exports everything here for existing imports.
+"""
+
+import numpy as np
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Iterator, Mapping as MappingType, Optional, Tuple
+
+
+@dataclass
+class LandmarkPoint:
+	x: float
+	y: float
+	z: float
+	visibility: float
+
+
+# MediaPipe Pose landmark order (mp.solutions.pose.PoseLandmark). Kept as a static
+# table so name lookups never go through the enum on the per-frame path.
+LANDMARK_NAMES: Tuple[str, ...] = (
+	"NOSE",
+	"LEFT_EYE_INNER", "LEFT_EYE", "LEFT_EYE_OUTER",
+	"RIGHT_EYE_INNER", "RIGHT_EYE", "RIGHT_EYE_OUTER",
+	"LEFT_EAR", "RIGHT_EAR",
+	"MOUTH_LEFT", "MOUTH_RIGHT",
+	"LEFT_SHOULDER", "RIGHT_SHOULDER",
+	"LEFT_ELBOW", "RIGHT_ELBOW",
+	"LEFT_WRIST", "RIGHT_WRIST",
+	"LEFT_PINKY", "RIGHT_PINKY",
+	"LEFT_INDEX", "RIGHT_INDEX",
+	"LEFT_THUMB", "RIGHT_THUMB",
+	"LEFT_HIP", "RIGHT_HIP",
+	"LEFT_KNEE", "RIGHT_KNEE",
+	"LEFT_ANKLE", "RIGHT_ANKLE",
+	"LEFT_HEEL", "RIGHT_HEEL",
+	"LEFT_FOOT_INDEX", "RIGHT_FOOT_INDEX",
+)
+LANDMARK_INDEX: Dict[str, int] = {name: idx for idx, name in enumerate(LANDMARK_NAMES)}
+NUM_LANDMARKS = len(LANDMARK_NAMES)
+
+# Skeleton edges as landmark index pairs (same as mp.solutions.pose.POSE_CONNECTIONS)
+POSE_CONNECTIONS: Tuple[Tuple[int, int], ...] = (
+	(0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+	(11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+	(12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+	(11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+	(27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+)
+
+
+class LandmarkFrame(Mapping):
+	"""Read-only landmarks of one frame backed by a (33, 4) float32 array.
+
+	Columns are x, y (pixels), z and visibility. A row of NaN marks a landmark
+	that is not available. Behaves like the old Dict[str, LandmarkPoint]
+	(``name in frame``, ``frame[name].x``, ``frame.get(name)``) and also
+	exposes attribute access (``frame.LEFT_ELBOW``) and the raw ``array``.
+	``predicted`` is True for landmarks extrapolated between detections
+	(landmark_predictor) rather than measured by the pose model.
+	"""
+
+	__slots__ = ("_data", "predicted")
+
+	def __init__(self, data: np.ndarray, predicted: bool = False) -> None:
+		data = np.asarray(data, dtype=np.float32)
+		if data.shape != (NUM_LANDMARKS, 4):
+			raise ValueError(f"Expected landmark array of shape ({NUM_LANDMARKS}, 4), got {data.shape}")
+		view = data.view()
+		view.flags.writeable = False
+		object.__setattr__(self, "_data", view)
+		object.__setattr__(self, "predicted", predicted)
+
+	def __reduce__(self):
+		return (LandmarkFrame, (np.array(self._data), self.predicted))
+
+	@classmethod
+	def from_mapping(cls, lms: MappingType[str, object]) -> "LandmarkFrame":
+		return cls(as_landmark_array(lms))
+
+	@property
+	def array(self) -> np.ndarray:
+		return self._data
+
+	def _row(self, name: str) -> int:
+		idx = LANDMARK_INDEX.get(name)
+		if idx is None or self._data[idx, 0] != self._data[idx, 0]:
+			return -1
+		return idx
+
+	def point_xy(self, name: str) -> Optional[Tuple[float, float]]:
+		idx = self._row(name)
+		if idx < 0:
+			return None
+		return (float(self._data[idx, 0]), float(self._data[idx, 1]))
+
+	def __getitem__(self, name: str) -> LandmarkPoint:
+		idx = self._row(name)
+		if idx < 0:
+			raise KeyError(name)
+		x, y, z, v = self._data[idx].tolist()
+		return LandmarkPoint(x=x, y=y, z=z, visibility=v)
+
+	def __getattr__(self, name: str) -> LandmarkPoint:
+		if name in LANDMARK_INDEX:
+			try:
+				return self[name]
+			except KeyError:
+				pass
+		raise AttributeError(name)
+
+	def __setattr__(self, name: str, value) -> None:
+		raise AttributeError("LandmarkFrame is read-only")
+
+	def __contains__(self, name: object) -> bool:
+		return isinstance(name, str) and self._row(name) >= 0
+
+	def __iter__(self) -> Iterator[str]:
+		present = ~np.isnan(self._data[:, 0])
+		return (LANDMARK_NAMES[i] for i in np.flatnonzero(present))
+
+	def __len__(self) -> int:
+		return int(np.count_nonzero(~np.isnan(self._data[:, 0])))
+
+	def __repr__(self) -> str:
+		kind = ", predicted" if self.predicted else ""
+		return f"LandmarkFrame({len(self)}/{NUM_LANDMARKS} landmarks{kind})"
+
+
+def as_landmark_array(lms: MappingType[str, object]) -> np.ndarray:
+	"""Return a (33, 4) float32 array for either a LandmarkFrame or a name->point dict."""
+	if isinstance(lms, LandmarkFrame):
+		return lms.array
+	data = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+	for name, p in lms.items():
+		idx = LANDMARK_INDEX.get(name)
+		if idx is None:
+			continue
+		data[idx] = (p.x, p.y, getattr(p, "z", 0.0), getattr(p, "visibility", 1.0))
+	return data
+
+
+def _mirror_name(name: str) -> str:
+	if name.startswith("LEFT_"):
+		return "RIGHT_" + name[5:]
+	if name.startswith("RIGHT_"):
+		return "LEFT_" + name[6:]
+	if name.endswith("_LEFT"):  # MOUTH_LEFT / MOUTH_RIGHT
+		return name[:-5] + "_RIGHT"
+	if name.endswith("_RIGHT"):
+		return name[:-6] + "_LEFT"
+	return name
+
+
+# Row i of a mirrored frame comes from row MIRROR_INDEX[i] (left/right swapped)
+MIRROR_INDEX = np.array([LANDMARK_INDEX[_mirror_name(name)] for name in LANDMARK_NAMES], dtype=np.intp)
+
+
+def mirror_landmarks(lms: Optional[LandmarkFrame], width: float) -> Optional[LandmarkFrame]:
+	"""Landmarks as the pose model would report them on the horizontally flipped frame.
+
+	x becomes ``width - x`` and left/right landmarks trade places, so a
+	selfie view only needs the displayed image flipped, not the inference input.
+	"""
+	if lms is None:
+		return None
+	data = lms.array[MIRROR_INDEX]  # fancy indexing copies
+	data[:, 0] = width - data[:, 0]
+	return LandmarkFrame(data, predicted=lms.predicted)
+
+
+def side_triplets(a: str, b: str, c: str, sides: Tuple[str, ...] = ("LEFT", "RIGHT")) -> np.ndarray:
+	"""(len(sides), 3) landmark indices for a joint, e.g. ("SHOULDER", "ELBOW", "WRIST")."""
+	return np.array([[LANDMARK_INDEX[f"{side}_{name}"] for name in (a, b, c)] for side in sides], dtype=np.intp)
@@ -1,14 +1,58 @@
+import argparse
+import contextlib
+import functools
+import os
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
-import numpy as np
-from typing import Dict, Tuple
+from typing import Dict, Mapping, Optional, Tuple
 
-from pose_detector import PoseDetector
+from pose_detector import BACKENDS, PoseDetector, draw_skeleton
+from pose_daemon import DAEMON_ENV, DEFAULT_SOCKET, PoseDaemonClient, open_pose_detector
 from reference_loader import ReferenceProvider
-from feedback import FeedbackEngine
+from feedback import FeedbackEngine, reference_joints
 from rep_counter import RepCounter
+from capture import WEBCAM_DEFAULTS, CaptureSettings, open_capture, parse_size
+from frame_pacer import FramePacer
+from frame_pipeline import FramePipeline
+from hud_renderer import HudRenderer
+from session_events import EventWriter, SessionTracker
+from landmark_recording import LandmarkRecorder, iter_landmarks, load_recording
+from landmarks import mirror_landmarks
+from shm_pipeline import ShmPipeline
+from stage_timer import StageTimer
+from complexity_governor import DEFAULT_LADDER, SCALED_LADDER, ComplexityGovernor
+from motion_gate import STATIC_EXERCISES, MotionGate
+from landmark_predictor import LandmarkPredictor
+from one_euro import LandmarkSmoother
+from video_landmarks import video_fps
 
 
 WINDOW_NAME = "AI Exercise Form Corrector"
+# Longest the pipelined loop waits for a result before polling keys again
+KEY_POLL_S = 0.01
+
+# Joint driving the rep counter for angle-based exercises, with side priority
+REP_JOINTS: Dict[str, Tuple[str, Tuple[str, str]]] = {
+	"BicepCurl": ("Elbow", ("LEFT", "RIGHT")),
+	"Squat": ("Knee", ("RIGHT", "LEFT")),
+}
+DEFAULT_HUD_JOINTS = ("Knee", "Hip", "Elbow", "Shoulder", "Back")
+_hud_joints_cache: Dict[str, Tuple[str, ...]] = {}
+
+
+def hud_joints(exercise: str, refs) -> Tuple[str, ...]:
+	"""Joints to evaluate and display for an exercise: its rep joint plus those in its reference data."""
+	joints = _hud_joints_cache.get(exercise)
+	if joints is None:
+		wanted = set(reference_joints(refs.get(exercise, {})))
+		if exercise in REP_JOINTS:
+			wanted.add(REP_JOINTS[exercise][0])
+		joints = tuple(j for j in DEFAULT_HUD_JOINTS if j in wanted) or DEFAULT_HUD_JOINTS
+		_hud_joints_cache[exercise] = joints
+	return joints
 
 
 def choose_phase(exercise: str, angles: Dict[str, float], refs: Dict[str, Dict[str, Tuple[float, float]]], engine: FeedbackEngine) -> Tuple[str, bool, str]:
@@ -40,182 +84,765 @@ def choose_phase(exercise: str, angles: Dict[str, float], refs: Dict[str, Dict[s
 	return best_phase, best_ok, best_msg
 
 
-def draw_overlay(frame, angles: Dict[str, float], exercise: str, phase: str, ok: bool, msg: str, reps: int, plank_info=None) -> None:
-	# HUD - make it taller for plank info
-	hud_height = 200 if exercise == "Plank" and plank_info else 160
-	cv2.rectangle(frame, (0, 0), (350, hud_height), (0, 0, 0), -1)
-	cv2.putText(frame, f"Exercise: {exercise}", (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-	cv2.putText(frame, f"Phase: {phase}", (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+# Cached panels and text tiles (see hud_renderer); draws what
+# hud_renderer.draw_hud_direct would, at a fraction of the cost
+HUD = HudRenderer()
+
+
+def draw_overlay(frame, angles: Mapping[str, float], exercise: str, phase: str, ok: bool, msg: str, reps: int, plank_info=None) -> None:
+	HUD.draw(frame, angles, exercise, phase, ok, msg, reps, plank_info)
+
+
+def analyze_frame(exercise: str, lms, engine: FeedbackEngine, refs, reps: RepCounter, now: Optional[float] = None,
+				  timer: Optional[StageTimer] = None):
+	"""Run angle, rep and feedback logic for one frame.
+
+	``now`` is the frame time in seconds for the plank timer (wall clock when
+	None; headless runs pass the video timestamp). With a ``timer`` the
+	"angles" and "feedback" stages are recorded. Reps are only counted on
+	measured landmarks, not on ones predicted between detections.
+	Returns (angles, phase, ok, msg, plank_info) for draw_overlay.
+	"""
+	start = time.perf_counter() if timer is not None else 0.0
+	# Angles are evaluated lazily: only the rep joint and the joints shown on
+	# the HUD (or read by the phase check) are computed, each once per frame
+	angles = engine.angle_view(lms if lms is not None else {}, joints=hud_joints(exercise, refs))
+	if timer is not None:
+		for joint in angles:  # evaluate the HUD joints now so they count as "angles"
+			angles[joint]
+		angles_done = time.perf_counter()
+		timer.add("angles", angles_done - start)
+
+	measured = lms is not None and not getattr(lms, "predicted", False)
+
+	# Handle angle-based exercises (BicepCurl and Squat) using direct angle measurement
+	if measured and exercise in REP_JOINTS:
+		joint, side_priority = REP_JOINTS[exercise]
+		angle = angles.joint(joint, side_priority)
+		if angle == angle:  # not NaN
+			reps.update_with_angle(angle)
 	
-	if exercise == "Plank" and plank_info:
-		# Show plank timer information
-		elapsed, total, active, left_angle, right_angle = plank_info
-		status = "ACTIVE" if active else "WAITING"
-		status_color = (0, 255, 0) if active else (0, 215, 255)
-		cv2.putText(frame, f"Timer: {elapsed:.1f}s", (10, 85), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 0), 2)
-		cv2.putText(frame, f"Status: {status}", (10, 115), cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
-		cv2.putText(frame, f"Total: {total:.1f}s", (10, 145), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-		# Show hip angles
-		if left_angle is not None:
-			cv2.putText(frame, f"L Hip: {left_angle:.0f}°", (10, 175), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 2)
-		if right_angle is not None:
-			cv2.putText(frame, f"R Hip: {right_angle:.0f}°", (150, 175), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 2)
-	else:
-		cv2.putText(frame, f"Reps: {reps}", (10, 85), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-		color = (0, 200, 0) if ok else (0, 0, 255)
-		cv2.putText(frame, msg, (10, 115), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+	# Handle exercise-specific logic
+	exercise_refs = refs.get(exercise, {})
+	plank_info = None
 	
-	cv2.putText(frame, "Keys: 1=Squat 2=Plank 3=BicepCurl", (10, hud_height - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1)
-	# Angle readouts (right side)
-	x0 = frame.shape[1] - 220
-	cv2.rectangle(frame, (x0 - 10, 0), (frame.shape[1], 170), (0, 0, 0), -1)
-	i = 0
-	for k in ["Knee", "Hip", "Elbow", "Shoulder", "Back"]:
-		ang = angles.get(k, float('nan'))
-		cv2.putText(frame, f"{k}: {"%.0f" % ang if ang == ang else "-"}", (x0, 25 + i * 28), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 2)
-		i += 1
-
-
-def main():
+	if exercise == "Plank":
+		# Use trained plank detection
+		phase = "Hold"
+		if lms is not None:
+			is_proper_plank, left_angle, right_angle = check_plank_position(lms)
+			update_plank_timer(is_proper_plank, now)
+			ok = is_proper_plank
+			msg = "Good plank posture!" if ok else "Adjust your posture"
+		else:
+			ok = False
+			msg = "Position yourself for plank"
+			left_angle = right_angle = None
+			
+		# Prepare plank info for overlay
+		elapsed = get_plank_elapsed_time(now)
+		plank_info = (elapsed, plank_total_time, plank_timer_active, left_angle, right_angle)
+		
+	elif exercise in ["BicepCurl", "Squat"]:
+		# For angle-based exercises, use the stage from rep counter
+		phase = reps.stage if reps.stage else "up"
+		ok = True  # Simplified feedback for angle-based exercises
+		if exercise == "BicepCurl":
+			msg = f"Bicep Curl - Stage: {phase.title()}"
+		else:
+			msg = f"Squat - Stage: {phase.title()}"
+	else:
+		phase, ok, msg = choose_phase(exercise, angles, exercise_refs, engine)
+		if measured:
+			reps.update(ok, phase)
+
+	if timer is not None:
+		timer.add("feedback", time.perf_counter() - angles_done)
+	return angles, phase, ok, msg, plank_info
+
+
+def stage(timer: Optional[StageTimer], name: str):
+	"""timer.measure(name), or a no-op context when timing is off."""
+	return timer.measure(name) if timer is not None else contextlib.nullcontext()
+
+
+def infer_frame(detector: PoseDetector, frame, governor: Optional[ComplexityGovernor] = None,
+				gate: Optional[MotionGate] = None, t: Optional[float] = None):
+	"""Pose results and landmarks for ``frame`` (captured at ``t`` seconds).
+
+	With a motion gate, inference is skipped (and the last results reused)
+	while the region around the pose stays still; the governor only sees
+	frames that actually ran inference.
+	"""
+	if gate is not None and gate.skip(frame):
+		return gate.results, gate.landmarks
+	infer_start = time.perf_counter()
+	results = detector.process(frame, t)
+	if governor is not None:
+		governor.observe(time.perf_counter() - infer_start)
+	lms = detector.get_landmarks(frame, results)
+	if gate is not None:
+		gate.update(frame, results, lms)
+	return results, lms
+
+
+def detect_or_predict(detector: PoseDetector, frame, t: float, frame_index: int,
+					  predictor: Optional[LandmarkPredictor] = None, detect_every: int = 1,
+					  governor: Optional[ComplexityGovernor] = None, gate: Optional[MotionGate] = None):
+	"""infer_frame on every ``detect_every``-th frame; landmarks predicted for time ``t`` in between.
+
+	Returns (results, landmarks); results is None for predicted frames.
+	"""
+	if predictor is not None and frame_index % detect_every and predictor.ready:
+		return None, predictor.predict(t)
+	results, lms = infer_frame(detector, frame, governor, gate, t)
+	if predictor is not None:
+		predictor.update(t, lms)
+	return results, lms
+
+
+def smoothed(source, smoother: LandmarkSmoother):
+	"""Apply a landmark smoother to a (timestamp, landmarks) stream."""
+	for t, lms in source:
+		yield t, smoother(t, lms)
+
+
+class MirrorView:
+	"""Selfie view without flipping the inference input.
+
+	Inference runs on the frame as captured; the landmarks are mirrored in
+	landmark space (x -> width - x, LEFT_/RIGHT_ swapped), which is what the
+	model reports on a flipped frame, and only the displayed image is flipped,
+	into a reused buffer.
+	"""
+
+	def __init__(self) -> None:
+		self._buffer = None
+
+	def landmarks(self, lms, frame):
+		return mirror_landmarks(lms, frame.shape[1])
+
+	def display(self, frame):
+		self._buffer = cv2.flip(frame, 1, self._buffer)
+		return self._buffer
+
+
+def draw_pose(frame, detector: Optional[PoseDetector], results, lms, view: Optional[MirrorView] = None):
+	"""Draw the skeleton and return the frame to show (flipped by ``view`` in mirror mode).
+
+	Measured frames keep the detector's own drawing style; landmarks without
+	results (predicted, or from the inference processes) are drawn with
+	draw_skeleton.
+	"""
+	if results is not None:
+		detector.draw(frame, results)  # results are in captured-frame coordinates
+	if view is not None:
+		frame = view.display(frame)
+	if results is None and lms is not None:
+		draw_skeleton(frame, lms.array)  # these landmarks are already in display coordinates
+	return frame
+
+
+class TimingPanel:
+	"""Optional HUD panel with rolling per-stage p50/p95/p99 (ms).
+
+	Percentiles are recomputed every ``refresh_every`` frames, not per frame.
+	"""
+
+	def __init__(self, timer: StageTimer, refresh_every: int = 15) -> None:
+		self.timer = timer
+		self.refresh_every = refresh_every
+		self._frames = 0
+		self._summary: Dict[str, Dict[str, float]] = {}
+
+	def draw(self, frame) -> None:
+		if self._frames % self.refresh_every == 0:
+			self._summary = self.timer.summary()
+		self._frames += 1
+		if not self._summary:
+			return
+		row_h = 18
+		model_level = self.timer.info.get("model_level")
+		rows = len(self._summary) + 1 + (model_level is not None)
+		top = frame.shape[0] - row_h * rows - 10
+		cv2.rectangle(frame, (0, top), (300, frame.shape[0]), (0, 0, 0), -1)
+		if model_level is not None:
+			cv2.putText(frame, f"model: {model_level}", (8, top + 14), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
+			top += row_h
+		cv2.putText(frame, "stage          p50    p95    p99 ms", (8, top + 14), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
+		for i, (name, st) in enumerate(self._summary.items(), start=1):
+			text = f"{name:12s} {st['p50_ms']:6.1f} {st['p95_ms']:6.1f} {st['p99_ms']:6.1f}"
+			cv2.putText(frame, text, (8, top + 14 + i * row_h), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (200, 200, 200), 1)
+
+
+def handle_key(key: int, exercise: str, reps: RepCounter) -> Tuple[str, RepCounter, bool]:
+	"""Apply a keyboard command. Returns (exercise, reps, quit_requested)."""
 	global plank_timer_active, plank_start_time, plank_total_time, plank_last_duration
-	
-	exercise = "Squat"  # change to "Squat", "Plank", or "BicepCurl" as needed
+
+	if key == ord('q'):
+		return exercise, reps, True
+	elif key == ord('1'):
+		exercise = "Squat"
+		reps = RepCounter(exercise)
+	elif key == ord('2'):
+		exercise = "Plank"
+		reps = RepCounter(exercise)
+		# Reset plank timer when switching to plank
+		plank_timer_active = False
+		plank_start_time = None
+		plank_total_time = 0.0
+		plank_last_duration = 0.0
+		print("[Plank] Timer reset for new session")
+	elif key == ord('3'):
+		exercise = "BicepCurl"
+		reps = RepCounter(exercise)
+	return exercise, reps, False
+
+
+def wait_for_frame(start: float, frame_index: int, fps: float) -> None:
+	"""Sleep until frame ``frame_index`` of a video played from ``start`` at ``fps`` is due."""
+	time.sleep(max(0.0, start + frame_index / fps - time.perf_counter()))
+
+
+def run_serial(cap, detector: PoseDetector, engine: FeedbackEngine, refs, exercise: str, mirror: bool = True,
+			   recorder: Optional[LandmarkRecorder] = None, timer: Optional[StageTimer] = None,
+			   panel: Optional[TimingPanel] = None, governor: Optional[ComplexityGovernor] = None,
+			   gate: Optional[MotionGate] = None, predictor: Optional[LandmarkPredictor] = None,
+			   detect_every: int = 1, smoother: Optional[LandmarkSmoother] = None,
+			   view: Optional[MirrorView] = None, pacer: Optional[FramePacer] = None,
+			   pace_fps: float = 0.0) -> None:
+	"""Capture, infer, analyze and render one frame after another on this thread.
+
+	Keys are polled every frame without sleeping; frames are only drawn and
+	shown when the ``pacer`` says a render is due. A video file is played at
+	``pace_fps`` (its own frame rate) so the wall-clock plank timer matches
+	it; 0 reads as fast as the loop runs, which a camera paces by itself.
+
+	With a ``predictor``, inference runs on every ``detect_every``-th frame and
+	the frames in between get predicted landmarks. With a ``view``, mirroring
+	happens in landmark space and on the displayed frame instead of on capture.
+	"""
+	reps = RepCounter(exercise)
+	pacer = pacer or FramePacer()
+	frame_index = 0
+	start = time.perf_counter()
+	while True:
+		if pace_fps > 0:
+			wait_for_frame(start, frame_index, pace_fps)
+		with stage(timer, "capture"):
+			ret, frame = cap.read()
+			if ret and mirror and view is None:
+				frame = cv2.flip(frame, 1)
+		if not ret:
+			break
+
+		if gate is not None:
+			gate.enabled = exercise in STATIC_EXERCISES
+		now = time.perf_counter()
+		results, lms = detect_or_predict(detector, frame, now, frame_index, predictor, detect_every, governor, gate)
+		frame_index += 1
+		if view is not None:
+			lms = view.landmarks(lms, frame)
+		if recorder is not None and results is not None:
+			recorder.write(now, lms)
+		if smoother is not None:
+			lms = smoother(now, lms)
+		angles, phase, ok, msg, plank_info = analyze_frame(exercise, lms, engine, refs, reps, timer=timer)
+
+		# Draw pose and overlays
+		if pacer.due():
+			with stage(timer, "draw"):
+				frame = draw_pose(frame, detector, results, lms, view)
+				draw_overlay(frame, angles, exercise, phase, ok, msg, reps.count, plank_info)
+				if panel is not None:
+					panel.draw(frame)
+
+			with stage(timer, "display"):
+				cv2.imshow(WINDOW_NAME, frame)
+		key = pacer.poll_key()
+		exercise, reps, quit_requested = handle_key(key, exercise, reps)
+		if quit_requested:
+			break
+
+
+def run_pipelined(cap, detector: PoseDetector, engine: FeedbackEngine, refs, exercise: str, mirror: bool = True,
+				  recorder: Optional[LandmarkRecorder] = None, timer: Optional[StageTimer] = None,
+				  panel: Optional[TimingPanel] = None, governor: Optional[ComplexityGovernor] = None,
+				  gate: Optional[MotionGate] = None, smoother: Optional[LandmarkSmoother] = None,
+				  view: Optional[MirrorView] = None, pacer: Optional[FramePacer] = None,
+				  pace_fps: float = 0.0) -> None:
+	"""Capture and pose inference on background threads, analysis and rendering here.
+
+	Each stage only ever works on the newest frame, so a slow inference step
+	drops stale frames instead of queueing them up. Every result is analyzed;
+	the newest analyzed frame is rendered when the ``pacer`` says so, and keys
+	are polled between results instead of blocking on them. A video file is
+	released at ``pace_fps`` like in run_serial.
+	"""
+	start = time.perf_counter()
+	frame_index = 0
+
+	def read_frame():
+		nonlocal frame_index
+		if pace_fps > 0:
+			wait_for_frame(start, frame_index, pace_fps)
+			frame_index += 1
+		with stage(timer, "capture"):
+			ret, frame = cap.read()
+			if not ret:
+				return None
+			return cv2.flip(frame, 1) if mirror and view is None else frame
+
+	def infer(frame):
+		# Runs on the inference thread, which is also where the governor may
+		# rebuild the detector's graph
+		results, lms = infer_frame(detector, frame, governor, gate, time.perf_counter())
+		return results, view.landmarks(lms, frame) if view is not None else lms
+
+	reps = RepCounter(exercise)
+	if gate is not None:
+		gate.enabled = exercise in STATIC_EXERCISES
+	pacer = pacer or FramePacer()
+	pipeline = FramePipeline(read_frame, infer).start()
+	pending = None  # newest analyzed frame not rendered yet
+	try:
+		while True:
+			try:
+				# Block no longer than until the next render is due (or a key poll)
+				item = pipeline.get(timeout=min(pacer.time_to_next(), KEY_POLL_S) if pending is not None else KEY_POLL_S)
+			except queue.Empty:
+				item = ()
+			if item is None:
+				break
+			if item:
+				capture_ts, frame, (results, lms) = item
+				if recorder is not None:
+					recorder.write(capture_ts, lms)
+				if smoother is not None:
+					lms = smoother(capture_ts, lms)
+				pending = (capture_ts, frame, results, lms,
+						   analyze_frame(exercise, lms, engine, refs, reps, timer=timer))
+
+			if pending is not None and pacer.due():
+				capture_ts, frame, results, lms, (angles, phase, ok, msg, plank_info) = pending
+				pending = None
+				with stage(timer, "draw"):
+					frame = draw_pose(frame, detector, results, lms, view)
+					draw_overlay(frame, angles, exercise, phase, ok, msg, reps.count, plank_info)
+					if panel is not None:
+						panel.draw(frame)
+
+				with stage(timer, "display"):
+					cv2.imshow(WINDOW_NAME, frame)
+				pipeline.stats.record_display(capture_ts)
+			key = pacer.poll_key()
+			exercise, reps, quit_requested = handle_key(key, exercise, reps)
+			if gate is not None:
+				gate.enabled = exercise in STATIC_EXERCISES
+			if quit_requested:
+				break
+	finally:
+		if not pipeline.stop():
+			# The caller releases the capture and detector next; wait until the
+			# thread still reading or inferring is done with them
+			print("[Pipeline] Waiting for capture/inference to finish...")
+			pipeline.stop(timeout=None)
+		pipeline.report()
+
+
+def run_multiprocess(pipeline: ShmPipeline, engine: FeedbackEngine, refs, exercise: str,
+					 recorder: Optional[LandmarkRecorder] = None, timer: Optional[StageTimer] = None,
+					 panel: Optional[TimingPanel] = None, smoother: Optional[LandmarkSmoother] = None,
+					 view: Optional[MirrorView] = None, pacer: Optional[FramePacer] = None) -> None:
+	"""Analysis and rendering over landmarks from a started ShmPipeline.
+
+	Capture and pose inference run in other processes; only landmark arrays
+	come back here, and the frame a result was computed on is copied out of
+	shared memory only when it is rendered. Same pacing and key polling as
+	run_pipelined.
+	"""
+	reps = RepCounter(exercise)
+	pacer = pacer or FramePacer()
+	pending = None  # newest analyzed result not rendered yet
+	buffer = None  # reused display copy of the frame
+	try:
+		while True:
+			try:
+				item = pipeline.get(timeout=min(pacer.time_to_next(), KEY_POLL_S) if pending is not None else KEY_POLL_S)
+			except queue.Empty:
+				item = ()
+			if item is None:
+				break
+			if item:
+				seq, capture_ts, lms, inference_s = item
+				if timer is not None:
+					timer.add("inference", inference_s)
+				if view is not None:
+					lms = mirror_landmarks(lms, pipeline.frame_shape[1])
+				if recorder is not None:
+					recorder.write(capture_ts, lms)
+				if smoother is not None:
+					lms = smoother(capture_ts, lms)
+				pending = (seq, capture_ts, lms, analyze_frame(exercise, lms, engine, refs, reps, timer=timer))
+
+			if pending is not None and pacer.due():
+				seq, capture_ts, lms, (angles, phase, ok, msg, plank_info) = pending
+				pending = None
+				frame = pipeline.frame(seq, buffer)
+				if frame is not None:  # None: the capture process already reused its slot
+					buffer = frame
+					with stage(timer, "draw"):
+						frame = draw_pose(frame, None, None, lms, view)
+						draw_overlay(frame, angles, exercise, phase, ok, msg, reps.count, plank_info)
+						if panel is not None:
+							panel.draw(frame)
+
+					with stage(timer, "display"):
+						cv2.imshow(WINDOW_NAME, frame)
+					pipeline.stats.record_display(capture_ts)
+			key = pacer.poll_key()
+			exercise, reps, quit_requested = handle_key(key, exercise, reps)
+			if quit_requested:
+				break
+	finally:
+		pipeline.stop()
+		pipeline.report()
+
+
+def run_processes(args: argparse.Namespace, exercise: str, refs, engine: FeedbackEngine, backend: str,
+				  timer: Optional[StageTimer]) -> None:
+	"""--processes: capture and N inference processes feeding run_multiprocess."""
+	if backend == "tasks-live":
+		print("[Processes] tasks-live returns results asynchronously; inference processes use tasks-video")
+		backend = "tasks-video"
+	ignored = [flag for flag, used in (("--target-fps", args.target_fps), ("--motion-gate", args.motion_gate),
+									   ("--detect-every", args.detect_every > 1)) if used]
+	if ignored:
+		print(f"[Processes] {', '.join(ignored)} not supported with --processes; ignored")
+	view = MirrorView() if args.mirror_landmarks and not args.video else None
+	pipeline = ShmPipeline(
+		args.video if args.video else 0,
+		functools.partial(build_detector, None, backend, args.roi),
+		workers=args.processes,
+		capture_settings=None if args.video else camera_settings(args),
+		mirror=not args.video and view is None,
+		pace_fps=video_fps(args.video) if args.video else 0.0,
+	)
+	try:
+		pipeline.start()
+	except RuntimeError as e:
+		print(e)
+		return
+	if not args.video:
+		print(pipeline.capture_summary)
+
+	recorder = LandmarkRecorder(args.record) if args.record else None
+	try:
+		run_multiprocess(pipeline, engine, refs, exercise, recorder=recorder, timer=timer,
+						 panel=TimingPanel(timer) if args.timings_hud else None,
+						 smoother=LandmarkSmoother() if args.smooth else None, view=view,
+						 pacer=FramePacer(args.display_fps))
+	finally:
+		if recorder is not None:
+			recorder.close()
+			print(f"Recorded {recorder.frames} frames of landmarks to {recorder.path}")
+		cv2.destroyAllWindows()
+
+
+def camera_settings(args) -> CaptureSettings:
+	"""Webcam mode from the --camera-* / --fourcc flags (WEBCAM_DEFAULTS otherwise)."""
+	width, height = args.camera_size or (None, None)
+	return CaptureSettings(
+		width=width,
+		height=height,
+		fps=args.camera_fps or None,
+		fourcc=args.fourcc or None,
+		buffer_size=args.camera_buffer or None,
+	)
+
+
+def frame_timestamp(cap, frame_index: int, fps: float) -> float:
+	"""Timestamp of the frame just read, in seconds of video time."""
+	pos_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+	if pos_ms > 0 or frame_index == 0:
+		return pos_ms / 1000.0
+	return frame_index / fps if fps > 0 else 0.0
+
+
+def capture_landmarks(cap, detector: PoseDetector, recorder: Optional[LandmarkRecorder] = None,
+					  timer: Optional[StageTimer] = None, gate: Optional[MotionGate] = None,
+					  predictor: Optional[LandmarkPredictor] = None, detect_every: int = 1):
+	"""Yield (video time, landmarks or None) for every frame of ``cap``.
+
+	Only measured frames are recorded; predicted ones (see detect_or_predict)
+	are analyzed but not written.
+	"""
+	fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+	frame_index = 0
+	while True:
+		with stage(timer, "capture"):
+			ret, frame = cap.read()
+		if not ret:
+			break
+		t = frame_timestamp(cap, frame_index, fps)
+		results, lms = detect_or_predict(detector, frame, t, frame_index, predictor, detect_every, gate=gate)
+		if recorder is not None and results is not None:
+			recorder.write(t, lms)
+		yield t, lms
+		frame_index += 1
+
+
+def run_headless(source, engine: FeedbackEngine, refs, exercise: str, events: EventWriter,
+				 fps: float = 0.0, total_frames: int = 0, timer: Optional[StageTimer] = None) -> None:
+	"""Analyze every frame without drawing or display, streaming JSONL events.
+
+	``source`` yields (timestamp, landmarks or None): capture_landmarks for a
+	video, landmark_recording.iter_landmarks for a replay. Runs as fast as the
+	source allows; times come from the source, so plank durations are in
+	video seconds regardless of processing speed.
+	"""
+	reps = RepCounter(exercise)
+	tracker = SessionTracker(events)
+	events.emit("start", exercise=exercise, fps=fps, frames=total_frames)
+
+	frame_index = 0
+	t = t0 = 0.0
+	wall_start = time.perf_counter()
+	try:
+		for t, lms in source:
+			if frame_index == 0:
+				t0 = t
+			angles, phase, ok, msg, plank_info = analyze_frame(exercise, lms, engine, refs, reps, now=t, timer=timer)
+
+			extra = {"predicted": True} if getattr(lms, "predicted", False) else {}
+			events.emit("frame", frame=frame_index, t=t, pose=lms is not None, phase=phase, ok=ok,
+						reps=reps.count, angles=dict(angles), **extra)
+			tracker.update(frame_index, t, phase, reps.count, plank_timer_active,
+						   plank_last_duration, plank_total_time)
+			frame_index += 1
+	finally:
+		if plank_timer_active:
+			update_plank_timer(False, t)
+			tracker.finish(frame_index, t, plank_last_duration, plank_total_time)
+		wall = time.perf_counter() - wall_start
+		events.emit("summary", exercise=exercise, frames=frame_index, duration=t - t0, reps=reps.count,
+					plank_total=plank_total_time, processing_s=wall,
+					processing_fps=frame_index / wall if wall > 0 else 0.0)
+		events.flush()
+
+
+def main(argv=None):
+	args = parse_args(argv)
+	if args.pose_daemon:
+		# Read by open_pose_detector, here and in --processes inference workers
+		os.environ[DAEMON_ENV] = args.pose_daemon
+	events = EventWriter(args.events) if args.headless or args.replay else None
+	# Keep stdout clean for a JSONL stream on stdout; progress prints go to stderr
+	redirect = contextlib.redirect_stdout(sys.stderr) if events and events.to_stdout else contextlib.nullcontext()
+	try:
+		with redirect:
+			run(args, events)
+	finally:
+		if events:
+			events.close()
+
+
+def build_detector(timer: Optional[StageTimer] = None, backend: str = "solutions",
+				   roi_crop: bool = False) -> PoseDetector:
+	# In-process, or a client of pose_daemon when --pose-daemon / POSE_DAEMON selects one
+	detector = open_pose_detector(backend, roi_crop=roi_crop, model_complexity=1, min_detection_confidence=0.5,
+								  min_tracking_confidence=0.5)
+	if roi_crop and not getattr(detector, "roi_crop", False):
+		print(f"[Backend] --roi is only supported by the solutions backend; ignored for {backend}")
+	detector.warm_up()
+	detector.timer = timer
+	return detector
+
+
+def run(args: argparse.Namespace, events: Optional[EventWriter] = None) -> None:
+	exercise = args.exercise
 	ref_provider = ReferenceProvider(json_path="references.json")
 	refs = ref_provider.data
 	engine = FeedbackEngine()
-	detector = PoseDetector(model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
-	reps = RepCounter(exercise)
 	
 	# Load trained plank ranges
 	load_plank_trained_ranges(ref_provider)
 
-	cap = cv2.VideoCapture(0)
-	if not cap.isOpened():
-		print("Could not open webcam.")
-		return
-
+	timer = StageTimer() if args.timings or args.timings_hud else None
 	try:
-		while True:
-			ret, frame = cap.read()
-			if not ret:
-				break
-			frame = cv2.flip(frame, 1)
-
-			results = detector.process(frame)
-			lms = detector.get_landmarks(frame, results)
-			angles: Dict[str, float] = {}
-			if lms is not None:
-				angles = engine.compute_all_angles(lms)
-
-			# Handle angle-based exercises (BicepCurl and Squat) using direct angle measurement
-			if lms is not None and exercise in ["BicepCurl", "Squat"]:
-				if exercise == "BicepCurl":
-					# Calculate elbow angle for bicep curl using LEFT side (as in your example)
-					for side_prefix in ["LEFT_", "RIGHT_"]:
-						shoulder_key = side_prefix + "SHOULDER"
-						elbow_key = side_prefix + "ELBOW"
-						wrist_key = side_prefix + "WRIST"
-						if all(key in lms for key in [shoulder_key, elbow_key, wrist_key]):
-							shoulder = [lms[shoulder_key].x, lms[shoulder_key].y]
-							elbow = [lms[elbow_key].x, lms[elbow_key].y]
-							wrist = [lms[wrist_key].x, lms[wrist_key].y]
-							
-							# Calculate angle using your bicep curl formula
-							a = np.array(shoulder)
-							b = np.array(elbow)
-							c = np.array(wrist)
-							radians = np.arctan2(c[1]-b[1], c[0]-b[0]) - np.arctan2(a[1]-b[1], a[0]-b[0])
-							angle = np.abs(radians*180.0/np.pi)
-							if angle > 180.0:
-								angle = 360 - angle
-							
-							reps.update_with_angle(angle)
-							break
-					
-				elif exercise == "Squat":
-					# Calculate knee angle for squat using RIGHT side (as in your example)
-					for side_prefix in ["RIGHT_", "LEFT_"]:
-						hip_key = side_prefix + "HIP"
-						knee_key = side_prefix + "KNEE"
-						ankle_key = side_prefix + "ANKLE"
-						if all(key in lms for key in [hip_key, knee_key, ankle_key]):
-							hip = [lms[hip_key].x, lms[hip_key].y]
-							knee = [lms[knee_key].x, lms[knee_key].y]
-							ankle = [lms[ankle_key].x, lms[ankle_key].y]
-							
-							# Calculate angle using your squat formula (cosine method)
-							a = np.array(hip)
-							b = np.array(knee)
-							c = np.array(ankle)
-							ba = a - b
-							bc = c - b
-							cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-							angle = np.degrees(np.arccos(np.clip(cosine_angle, -1.0, 1.0)))
-							
-							reps.update_with_angle(angle)
-							break
-			
-			# Handle exercise-specific logic
-			exercise_refs = refs.get(exercise, {})
-			plank_info = None
-			
-			if exercise == "Plank":
-				# Use trained plank detection
-				phase = "Hold"
-				if lms is not None:
-					is_proper_plank, left_angle, right_angle = check_plank_position(lms)
-					update_plank_timer(is_proper_plank)
-					ok = is_proper_plank
-					msg = "Good plank posture!" if ok else "Adjust your posture"
-				else:
-					ok = False
-					msg = "Position yourself for plank"
-					left_angle = right_angle = None
-					
-				# Prepare plank info for overlay
-				elapsed = get_plank_elapsed_time()
-				plank_info = (elapsed, plank_total_time, plank_timer_active, left_angle, right_angle)
-				
-			elif exercise in ["BicepCurl", "Squat"]:
-				# For angle-based exercises, use the stage from rep counter
-				phase = reps.stage if reps.stage else "up"
-				ok = True  # Simplified feedback for angle-based exercises
-				if exercise == "BicepCurl":
-					msg = f"Bicep Curl - Stage: {phase.title()}"
-				else:
-					msg = f"Squat - Stage: {phase.title()}"
-			else:
-				phase, ok, msg = choose_phase(exercise, angles, exercise_refs, engine)
-				reps.update(ok, phase)
-			
+		run_source(args, exercise, refs, engine, events, timer)
+	finally:
+		if timer is not None:
+			timer.report()
+			if args.timings:
+				timer.dump(args.timings, extra={"exercise": exercise, "source": args.replay or args.video or "webcam"})
 
-			# Draw pose and overlays
-			detector.draw(frame, results)
-			draw_overlay(frame, angles, exercise, phase, ok, msg, reps.count, plank_info)
 
-			cv2.imshow(WINDOW_NAME, frame)
-			key = cv2.waitKey(30) & 0xFF  # Increased wait time for better key detection
-			if key == ord('q'):
-				break
-			elif key == ord('1'):
-				exercise = "Squat"
-				reps = RepCounter(exercise)
-			elif key == ord('2'):
-				exercise = "Plank"
-				reps = RepCounter(exercise)
-				# Reset plank timer when switching to plank
-				plank_timer_active = False
-				plank_start_time = None
-				plank_total_time = 0.0
-				plank_last_duration = 0.0
-				print("[Plank] Timer reset for new session")
-			elif key == ord('3'):
-				exercise = "BicepCurl"
-				reps = RepCounter(exercise)
+def run_source(args: argparse.Namespace, exercise: str, refs, engine: FeedbackEngine,
+			   events: Optional[EventWriter], timer: Optional[StageTimer]) -> None:
+	if args.replay:
+		# Recorded landmarks: no capture and no pose model needed
+		timestamps, landmarks = load_recording(args.replay, mmap=True)
+		span = float(timestamps[-1] - timestamps[0]) if len(timestamps) > 1 else 0.0
+		fps = (len(timestamps) - 1) / span if span > 0 else 0.0
+		source = iter_landmarks(timestamps, landmarks)
+		if args.smooth:
+			source = smoothed(source, LandmarkSmoother())
+		run_headless(source, engine, refs, exercise, events, fps, len(timestamps), timer)
+		return
 
+	backend = args.backend
+	if events is not None and backend == "tasks-live":
+		# LIVE_STREAM hands back the newest finished result and drops frames while
+		# busy; headless analysis wants one result per frame
+		print("[Backend] tasks-live is for interactive runs; using tasks-video for headless analysis")
+		backend = "tasks-video"
+	if args.processes:
+		if events is None:
+			run_processes(args, exercise, refs, engine, backend, timer)
+			return
+		print("[Processes] --processes drops frames; headless analysis runs every frame in-process")
+
+	# Load and warm up the pose model on a worker thread while the camera opens;
+	# both take on the order of a second on a cold start
+	with ThreadPoolExecutor(max_workers=1) as pool:
+		detector_future = pool.submit(build_detector, timer, backend, args.roi)
+		cap, capture_report = open_capture(args.video if args.video else 0, camera_settings(args))
+		detector = detector_future.result()
+	if not args.video and cap.isOpened():
+		print(capture_report.summary())
+	panel = TimingPanel(timer) if args.timings_hud else None
+	governor = None
+	if args.target_fps and events is None:
+		if backend == "tasks-live":
+			# process() only submits the frame, so there is no latency to govern on
+			print("[Governor] --target-fps is not supported with the tasks-live backend")
+		elif isinstance(detector, PoseDaemonClient):
+			# The model lives in the daemon, shared with other clients' configurations
+			print("[Governor] --target-fps needs an in-process detector; ignored with --pose-daemon")
+		else:
+			governor = ComplexityGovernor(detector, args.target_fps, timer=timer,
+										  ladder=SCALED_LADDER if args.adaptive_resolution else DEFAULT_LADDER)
+	smoother = LandmarkSmoother() if args.smooth else None
+	view = MirrorView() if args.mirror_landmarks and not args.video else None
+	pacer = FramePacer(args.display_fps)
+	# Play files in real time, as run_processes does; cameras pace themselves
+	pace_fps = video_fps(args.video) if args.video else 0.0
+	predictor = None
+	if args.detect_every > 1:
+		if args.pipelined and events is None:
+			print("[Predict] --detect-every is ignored with --pipelined (inference already runs off the display thread)")
+		else:
+			predictor = LandmarkPredictor()
+	gate = None
+	if args.motion_gate:
+		gate = MotionGate(threshold=args.gate_threshold, max_skip=args.gate_max_skip, timer=timer)
+		gate.enabled = exercise in STATIC_EXERCISES
+	if not cap.isOpened():
+		print(f"Could not open video file: {args.video}" if args.video else "Could not open webcam.")
+		return
+
+	recorder = LandmarkRecorder(args.record) if args.record else None
+	try:
+		if events is not None:
+			source = capture_landmarks(cap, detector, recorder, timer, gate, predictor, args.detect_every)
+			if smoother is not None:
+				source = smoothed(source, smoother)
+			run_headless(source, engine, refs, exercise, events,
+						 cap.get(cv2.CAP_PROP_FPS) or 0.0, int(max(0, cap.get(cv2.CAP_PROP_FRAME_COUNT))), timer)
+		elif args.pipelined:
+			run_pipelined(cap, detector, engine, refs, exercise, mirror=not args.video, recorder=recorder,
+						  timer=timer, panel=panel, governor=governor, gate=gate, smoother=smoother, view=view,
+						  pacer=pacer, pace_fps=pace_fps)
+		else:
+			run_serial(cap, detector, engine, refs, exercise, mirror=not args.video, recorder=recorder,
+					   timer=timer, panel=panel, governor=governor, gate=gate, predictor=predictor,
+					   detect_every=args.detect_every, smoother=smoother, view=view, pacer=pacer,
+					   pace_fps=pace_fps)
 	finally:
 		cap.release()
-		cv2.destroyAllWindows()
+		detector.close()
+		if gate is not None:
+			gate.report()
+		if recorder is not None:
+			recorder.close()
+			print(f"Recorded {recorder.frames} frames of landmarks to {recorder.path}")
+		if events is None:
+			cv2.destroyAllWindows()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description="AI Exercise Form Corrector")
+	parser.add_argument("--pipelined", action="store_true",
+						help="run capture, pose inference and rendering on separate threads "
+							 "(drops stale frames, reports fps and capture-to-display latency)")
+	parser.add_argument("--processes", type=int, default=0, metavar="N",
+						help="run capture in its own process and pose inference in N processes, exchanging "
+							 "frames and landmarks through shared memory (uses N+1 more cores; drops stale "
+							 "frames, reports fps and latency like --pipelined)")
+	parser.add_argument("--video", help="read frames from this video file instead of the webcam")
+	parser.add_argument("--headless", action="store_true",
+						help="no drawing or display; analyze every frame as fast as possible and "
+							 "write JSONL events (angles, phases, reps, plank timer)")
+	parser.add_argument("--events", default="-", help="JSONL output path for --headless ('-' = stdout)")
+	parser.add_argument("--record", metavar="PATH",
+						help="save the landmark stream (timestamp + 33x4 landmarks per frame) to a binary file")
+	parser.add_argument("--replay", metavar="PATH",
+						help="replay a --record file through the analysis without capture or pose inference "
+							 "(implies --headless)")
+	parser.add_argument("--timings", nargs="?", const="stage_timings.json", metavar="PATH",
+						help="time every stage (capture, convert, inference, landmarks, angles, feedback, "
+							 "draw, display) and write rolling p50/p95/p99 to PATH on exit")
+	parser.add_argument("--timings-hud", action="store_true",
+						help="show the rolling per-stage percentiles on screen (enables timing)")
+	parser.add_argument("--backend", choices=BACKENDS, default="solutions",
+						help="pose backend: legacy MediaPipe solutions (blocking), or the Tasks "
+							 "PoseLandmarker in VIDEO mode or LIVE_STREAM mode (async; capture and "
+							 "drawing continue while inference runs; needs models/pose_landmarker_full.task)")
+	parser.add_argument("--pose-daemon", nargs="?", const=DEFAULT_SOCKET, metavar="SOCKET",
+						help="get landmarks from a running pose_daemon.py (warm model, no load at startup) "
+							 "instead of loading the model in-process; falls back to in-process if it does "
+							 "not answer (also selected by the POSE_DAEMON environment variable)")
+	parser.add_argument("--roi", action="store_true",
+						help="run pose inference on a padded crop around the previous frame's pose "
+							 "(full frame again whenever tracking is lost)")
+	parser.add_argument("--camera-size", type=parse_size, metavar="WxH",
+						help="webcam resolution to request, e.g. 640x480 (default: driver default)")
+	parser.add_argument("--camera-fps", type=float, default=0.0, metavar="FPS",
+						help="webcam frame rate to request (default: driver default)")
+	parser.add_argument("--fourcc", default=WEBCAM_DEFAULTS.fourcc,
+						help="webcam pixel format to request, e.g. MJPG or YUYV; '' keeps the driver default "
+							 "(default: %(default)s)")
+	parser.add_argument("--camera-buffer", type=int, default=WEBCAM_DEFAULTS.buffer_size, metavar="N",
+						help="frames the driver may queue; 1 always delivers the newest, 0 keeps the driver "
+							 "default (default: %(default)s)")
+	parser.add_argument("--display-fps", type=float, default=60.0, metavar="FPS",
+						help="render at most this many frames per second (the display refresh rate; 0 = every "
+							 "frame); analysis runs at its own rate and keys are polled without sleeping")
+	parser.add_argument("--mirror-landmarks", action="store_true",
+						help="webcam selfie view without flipping every captured frame: inference runs on "
+							 "the frame as captured, landmarks are mirrored, only the display is flipped")
+	parser.add_argument("--smooth", action="store_true",
+						help="One-Euro filter on the landmarks before angles are computed (less jitter; "
+							 "recordings stay raw, so pass it again with --replay)")
+	parser.add_argument("--detect-every", type=int, default=1, metavar="N",
+						help="run pose inference on every Nth frame and predict landmarks (constant "
+							 "velocity) in between; reps are counted on measured frames only")
+	parser.add_argument("--motion-gate", action="store_true",
+						help="during static holds (Plank) skip pose inference while the region around "
+							 "the last pose stays still, reusing the last landmarks")
+	parser.add_argument("--gate-threshold", type=float, default=4.0,
+						help="mean gray-level difference (0-255) that counts as motion for --motion-gate")
+	parser.add_argument("--gate-max-skip", type=int, default=15, metavar="N",
+						help="with --motion-gate, run inference at least every N+1 frames")
+	parser.add_argument("--target-fps", type=float, metavar="FPS",
+						help="adapt the pose model complexity (0/1/2) to hold this frame rate; "
+							 "switches are logged and shown in the timing metrics")
+	parser.add_argument("--adaptive-resolution", action="store_true",
+						help="with --target-fps, also allow downscaled inference input below complexity 0")
+	parser.add_argument("--exercise", default="Squat", choices=["Squat", "Plank", "BicepCurl"],
+						help="exercise to analyze at startup")
+	return parser.parse_args(argv)
 
 
 # ---- Plank Timer functionality ----
@@ -279,28 +906,29 @@ def check_plank_position(lms):
 	
 	return ok_left and ok_right, left_angle, right_angle
 
-def update_plank_timer(is_proper_plank):
-	"""Update plank timer based on posture"""
+def update_plank_timer(is_proper_plank, now=None):
+	"""Update plank timer based on posture (``now`` defaults to the wall clock)"""
 	global plank_timer_active, plank_start_time, plank_total_time, plank_last_duration
+	now = time.time() if now is None else now
 	
 	if is_proper_plank and not plank_timer_active:
 		# Start timer
 		plank_timer_active = True
-		plank_start_time = time.time()
+		plank_start_time = now
 		print("[Plank] Timer started!")
 	elif not is_proper_plank and plank_timer_active:
 		# Stop timer and record duration
-		end_time = time.time()
+		end_time = now
 		plank_last_duration = end_time - plank_start_time
 		plank_total_time += plank_last_duration
 		plank_timer_active = False
 		plank_start_time = None
 		print(f"[Plank] Timer stopped! Duration: {plank_last_duration:.1f}s, Total: {plank_total_time:.1f}s")
 
-def get_plank_elapsed_time():
+def get_plank_elapsed_time(now=None):
 	"""Get current elapsed time for active plank"""
-	if plank_timer_active and plank_start_time:
-		return time.time() - plank_start_time
+	if plank_timer_active and plank_start_time is not None:
+		return (time.time() if now is None else now) - plank_start_time
 	return 0.0
 
 
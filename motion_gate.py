@@ -0,0 +1,94 @@
+"""
+Motion-gated pose inference for static holds.
+
+During a plank the user barely moves, so running the pose model every frame
+mostly recomputes the same landmarks. MotionGate keeps a small grayscale
+thumbnail of the region around the last detected pose and compares each new
+frame against it; while the mean absolute difference stays below
+``threshold`` the caller skips inference and reuses the last results. A
+refresh is forced after ``max_skip`` skipped frames, and any frame without a
+usable pose (no reference box) always runs inference.
+
+The comparison is against the thumbnail of the last *inferred* frame, not
+the previous frame, so slow drift still adds up to a refresh.
+"""
+
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from pose_roi import roi_from_landmarks
+
+
+# Exercises that are held still and can use the gate
+STATIC_EXERCISES = ("Plank",)
+
+
+class MotionGate:
+	def __init__(self, threshold: float = 4.0, max_skip: int = 15, size: int = 48,
+				 padding: float = 0.1, timer=None) -> None:
+		"""
+		Args:
+			threshold: Mean absolute gray-level difference (0-255) that counts as motion
+			max_skip: Run inference at least once every ``max_skip + 1`` frames
+			size: Thumbnail side in pixels
+			padding: Margin around the pose box, as a fraction of its extent
+			timer: Optional StageTimer; records the "gate" stage
+		"""
+		import cv2
+		self._cv2 = cv2
+		self.threshold = threshold
+		self.max_skip = max_skip
+		self.size = size
+		self.padding = padding
+		self.timer = timer
+		self.enabled = True
+		# Last inference output, handed back on skipped frames
+		self.results = None
+		self.landmarks = None
+		self._box: Optional[Tuple[int, int, int, int]] = None
+		self._reference: Optional[np.ndarray] = None
+		self._skipped = 0
+		self.frames = 0
+		self.skipped_total = 0
+
+	def _thumbnail(self, frame_bgr) -> np.ndarray:
+		x0, y0, x1, y1 = self._box
+		cv2 = self._cv2
+		small = cv2.resize(frame_bgr[y0:y1, x0:x1], (self.size, self.size), interpolation=cv2.INTER_AREA)
+		return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+	def skip(self, frame_bgr) -> bool:
+		"""True if inference can be skipped for this frame (reuse .results/.landmarks)."""
+		if not self.enabled:
+			return False
+		self.frames += 1
+		if self._reference is None or self._skipped >= self.max_skip:
+			return False
+		start = time.perf_counter() if self.timer is not None else 0.0
+		diff = float(self._cv2.absdiff(self._thumbnail(frame_bgr), self._reference).mean())
+		if self.timer is not None:
+			self.timer.add("gate", time.perf_counter() - start)
+		if diff >= self.threshold:
+			return False
+		self._skipped += 1
+		self.skipped_total += 1
+		return True
+
+	def update(self, frame_bgr, results, landmarks) -> None:
+		"""Store the output of an inferred frame and its reference thumbnail."""
+		self.results = results
+		self.landmarks = landmarks
+		self._skipped = 0
+		h, w = frame_bgr.shape[:2]
+		data = landmarks.array if landmarks is not None else None
+		self._box = roi_from_landmarks(data, w, h, padding=self.padding, min_size=self.size)
+		if self._box is None and data is not None and np.count_nonzero(data[:, 3] >= 0.5) >= 4:
+			self._box = (0, 0, w, h)  # pose fills the frame: compare the whole frame
+		self._reference = self._thumbnail(frame_bgr) if self._box is not None else None
+
+	def report(self) -> None:
+		if self.frames:
+			print(f"[MotionGate] Inference skipped on {self.skipped_total} of {self.frames} gated frames "
+				  f"({100.0 * self.skipped_total / self.frames:.0f}%)")
@@ -0,0 +1,103 @@
+"""
+Vectorized One-Euro filter for landmark jitter.
+
+The One-Euro filter (Casiez et al., CHI 2012) is an exponential smoother whose
+cutoff frequency rises with the signal's speed: slow movements are smoothed
+hard (no jitter when holding still) and fast ones barely at all (little lag
+during a rep). OneEuroFilter keeps per-element state, so one call filters a
+whole (33, 3) landmark array in a few NumPy operations, O(1) per frame.
+
+LandmarkSmoother applies it to LandmarkFrames between get_landmarks and the
+angle computation in main.py; smooth_landmark_series runs the same filter
+over a cached (N, 33, 4) series so the offline builders can match the live
+path.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+from landmarks import LandmarkFrame
+
+
+def _alpha(cutoff, dt: float):
+	tau = 1.0 / (2.0 * math.pi * cutoff)
+	return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+	def __init__(self, min_cutoff: float = 1.0, beta: float = 0.05, d_cutoff: float = 1.0) -> None:
+		"""
+		Args:
+			min_cutoff: Cutoff frequency (Hz) at rest; lower = smoother, more lag
+			beta: Cutoff increase per unit of speed (units/s); higher = less lag when moving
+			d_cutoff: Cutoff frequency (Hz) for the speed estimate
+		"""
+		self.min_cutoff = min_cutoff
+		self.beta = beta
+		self.d_cutoff = d_cutoff
+		self.reset()
+
+	def reset(self) -> None:
+		self._t: Optional[float] = None
+		self._x: Optional[np.ndarray] = None
+		self._dx: Optional[np.ndarray] = None
+
+	def __call__(self, t: float, x: np.ndarray) -> np.ndarray:
+		"""Filter sample ``x`` (any fixed shape) taken at time ``t`` seconds.
+
+		NaN elements pass through and restart their state when they reappear.
+		"""
+		x = np.asarray(x, dtype=np.float64)
+		if self._x is None or self._x.shape != x.shape or t <= self._t:
+			self._t, self._x, self._dx = t, x.copy(), np.zeros_like(x)
+			return x.copy()
+		dt = t - self._t
+		prev = self._x
+		fresh = np.isnan(prev)  # missing last frame: start from the raw value
+		prev = np.where(fresh, x, prev)
+
+		dx = (x - prev) / dt
+		a_d = _alpha(self.d_cutoff, dt)
+		dx_hat = np.where(fresh, 0.0, a_d * dx + (1.0 - a_d) * self._dx)
+		cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+		a = _alpha(cutoff, dt)
+		x_hat = a * x + (1.0 - a) * prev
+
+		self._t = t
+		self._x = x_hat
+		self._dx = np.where(np.isnan(dx_hat), 0.0, dx_hat)
+		return x_hat
+
+
+class LandmarkSmoother:
+	"""One-Euro filter over the x, y, z columns of successive LandmarkFrames."""
+
+	def __init__(self, min_cutoff: float = 1.0, beta: float = 0.05, d_cutoff: float = 1.0) -> None:
+		self.filter = OneEuroFilter(min_cutoff, beta, d_cutoff)
+
+	def __call__(self, t: float, landmarks: Optional[LandmarkFrame]) -> Optional[LandmarkFrame]:
+		if landmarks is None:
+			self.filter.reset()
+			return None
+		data = np.array(landmarks.array, dtype=np.float32)
+		data[:, :3] = self.filter(t, data[:, :3])
+		return LandmarkFrame(data, predicted=landmarks.predicted)
+
+
+def smooth_landmark_series(series: np.ndarray, fps: float = 30.0, min_cutoff: float = 1.0,
+						   beta: float = 0.05, d_cutoff: float = 1.0) -> np.ndarray:
+	"""Filter an (N, 33, 4) landmark series frame by frame, as LandmarkSmoother would live.
+
+	All-NaN frames (no pose) pass through and reset the filter.
+	"""
+	out = np.array(series, dtype=np.float32, copy=True)
+	filt = OneEuroFilter(min_cutoff, beta, d_cutoff)
+	dt = 1.0 / fps if fps > 0 else 1.0 / 30.0
+	for i in range(len(out)):
+		if np.isnan(out[i, :, 0]).all():
+			filt.reset()
+			continue
+		out[i, :, :3] = filt(i * dt, out[i, :, :3])
+	return out
@@ -0,0 +1,416 @@
+"""
+Local pose-inference daemon and its PoseDetector-compatible client.
+
+Every script that builds a PoseDetector pays for importing MediaPipe and
+loading and warming up the model before its first frame. pose_daemon keeps
+warm detectors in a long-running process and serves landmarks over a Unix
+socket, so a client script starts without loading a model at all:
+
+    python pose_daemon.py                    # serve on DEFAULT_SOCKET
+    POSE_DAEMON=1 python debug_pushup_hud.py # scripts use it when POSE_DAEMON is set
+
+A connection sends its configuration (backend, PoseDetector settings, ROI
+mode) once and then frames; each frame comes back as the (33, 4) float32
+landmark array in pixels of that frame. Tracking state belongs to a
+stream, so a connection has a detector of its own for its lifetime,
+checked out from a per-configuration pool of warm detectors and reset
+when it is handed back. Unknown configurations are built on first use and
+stay warm afterwards.
+
+The default socket lives in a directory only its user can enter
+($XDG_RUNTIME_DIR, else a 0700 pose_daemon-<uid> directory in the temp
+dir), and the socket itself is 0600. A client only sends frames to a
+socket owned by its own user that no one else can open.
+
+open_pose_detector() is what the scripts call instead of PoseDetector(...):
+a PoseDaemonClient when the daemon is selected and answers, otherwise an
+in-process detector from pose_detector.create_pose_detector.
+
+Wire format (little-endian): a message of JSON is a uint32 length plus
+UTF-8 bytes; a frame is FRAME_HEADER (height, width, channels, timestamp
+seconds or NaN) plus the BGR pixels, height 0 closes the connection; a reply is REPLY (status,
+inference seconds, error length) plus the landmark array or the error text.
+"""
+
+import argparse
+import copy
+import json
+import math
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from frame_buffers import FrameBuffers
+from landmarks import NUM_LANDMARKS, LandmarkFrame
+from pose_detector import create_pose_detector, draw_skeleton
+
+
+def _runtime_dir() -> str:
+	"""$XDG_RUNTIME_DIR, else a per-user directory in the temp dir (created by the daemon)."""
+	runtime = os.environ.get("XDG_RUNTIME_DIR")
+	if runtime and os.path.isdir(runtime):
+		return runtime
+	user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+	return os.path.join(tempfile.gettempdir(), f"pose_daemon-{user}")
+
+
+DAEMON_ENV = "POSE_DAEMON"
+DEFAULT_SOCKET = os.path.join(_runtime_dir(), "pose_daemon.sock")
+FRAME_HEADER = struct.Struct("<IIId")
+REPLY = struct.Struct("<BdI")
+LENGTH = struct.Struct("<I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+# What main.py runs with; warmed at daemon start unless --preload says otherwise
+DEFAULT_CONFIG = {"backend": "solutions", "roi_crop": False,
+				  "settings": {"model_complexity": 1, "min_detection_confidence": 0.5,
+							   "min_tracking_confidence": 0.5}}
+
+
+def daemon_socket() -> Optional[str]:
+	"""Socket selected by the POSE_DAEMON environment variable ("1" = DEFAULT_SOCKET), or None."""
+	value = os.environ.get(DAEMON_ENV, "").strip()
+	if not value or value == "0":
+		return None
+	return DEFAULT_SOCKET if value == "1" else value
+
+
+def _private_dir(path: str) -> None:
+	"""Create ``path`` 0700 if missing; raise OSError unless only this user can write to it."""
+	os.makedirs(path, mode=0o700, exist_ok=True)
+	st = os.lstat(path)
+	if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+		raise OSError(f"{path} must be a directory owned by this user that others cannot write to "
+					  f"(owner uid {st.st_uid}, mode {stat.S_IMODE(st.st_mode):o})")
+
+
+def check_socket(path: str) -> None:
+	"""Raise OSError unless ``path`` is a socket owned by this user that others cannot open."""
+	st = os.lstat(path)
+	if not stat.S_ISSOCK(st.st_mode):
+		raise OSError(f"{path} is not a socket")
+	if st.st_uid != os.getuid() or st.st_mode & 0o077:
+		raise OSError(f"{path} is not private to this user (owner uid {st.st_uid}, "
+					  f"mode {stat.S_IMODE(st.st_mode):o}); not sending frames to it")
+
+
+def _recv_exact(sock, view: memoryview) -> None:
+	while view.nbytes:
+		n = sock.recv_into(view)
+		if n == 0:
+			raise EOFError("connection closed")
+		view = view[n:]
+
+
+def _recv_bytes(sock, n: int) -> bytes:
+	buf = bytearray(n)
+	_recv_exact(sock, memoryview(buf))
+	return bytes(buf)
+
+
+def _send_json(sock, obj) -> None:
+	data = json.dumps(obj).encode("utf-8")
+	sock.sendall(LENGTH.pack(len(data)) + data)
+
+
+def _recv_json(sock):
+	(n,) = LENGTH.unpack(_recv_bytes(sock, LENGTH.size))
+	return json.loads(_recv_bytes(sock, n).decode("utf-8"))
+
+
+class DetectorPool:
+	"""Warm detectors per configuration, checked out one per connection.
+
+	``factory(backend, **settings)`` must return a detector with warm_up(),
+	reset() (called when it comes back, since the next connection is a new
+	stream) and close(), like the create_pose_detector backends.
+	"""
+
+	def __init__(self, factory: Callable = create_pose_detector) -> None:
+		self._factory = factory
+		self._idle: Dict[str, List] = {}
+		self._lock = threading.Lock()
+		self.built = 0
+
+	@staticmethod
+	def key(config: Dict) -> str:
+		return json.dumps(config, sort_keys=True)
+
+	def _build(self, config: Dict):
+		detector = self._factory(config.get("backend", "solutions"), **config.get("settings", {}))
+		if config.get("roi_crop") and hasattr(detector, "roi_crop"):
+			detector.roi_crop = True
+		detector.warm_up()
+		with self._lock:
+			self.built += 1
+		return detector
+
+	def acquire(self, config: Dict) -> Tuple[object, bool]:
+		"""(detector, warm): an idle detector for ``config``, or a newly built one."""
+		with self._lock:
+			idle = self._idle.get(self.key(config))
+			if idle:
+				return idle.pop(), True
+		return self._build(config), False
+
+	def release(self, config: Dict, detector, healthy: bool = True) -> None:
+		if not healthy:
+			detector.close()
+			return
+		detector.reset()
+		with self._lock:
+			self._idle.setdefault(self.key(config), []).append(detector)
+
+	def preload(self, config: Dict) -> None:
+		self.release(config, self._build(config))
+
+	def close(self) -> None:
+		with self._lock:
+			detectors = [d for idle in self._idle.values() for d in idle]
+			self._idle.clear()
+		for detector in detectors:
+			detector.close()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+	"""One client connection: configuration, then frames until height 0 or EOF."""
+
+	def handle(self) -> None:
+		sock = self.request
+		pool: DetectorPool = self.server.pool
+		try:
+			config = _recv_json(sock)
+		except (EOFError, ConnectionError, ValueError):
+			return
+		try:
+			detector, warm = pool.acquire(config)
+		except Exception as e:
+			_send_json(sock, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+			return
+		healthy = True
+		frames, busy = 0, 0.0
+		try:
+			_send_json(sock, {"ok": True, "warm": warm, "roi_crop": bool(getattr(detector, "roi_crop", False))})
+			buffers = FrameBuffers(max_entries=1)
+			while True:
+				h, w, c, ts = FRAME_HEADER.unpack(_recv_bytes(sock, FRAME_HEADER.size))
+				if h == 0:
+					return
+				if c != 3 or h * w * c > MAX_FRAME_BYTES:
+					error = f"expected a BGR frame of at most {MAX_FRAME_BYTES} bytes, got {h}x{w}x{c}".encode()
+					sock.sendall(REPLY.pack(1, 0.0, len(error)) + error)
+					return
+				frame = buffers.get("frame", (h, w, c))
+				_recv_exact(sock, memoryview(frame.reshape(-1)))
+				start = time.perf_counter()
+				try:
+					lms = detector.get_landmarks(frame, detector.process(frame, None if math.isnan(ts) else ts))
+				except Exception as e:
+					healthy = False
+					error = f"{type(e).__name__}: {e}".encode()
+					sock.sendall(REPLY.pack(1, 0.0, len(error)) + error)
+					return
+				took = time.perf_counter() - start
+				frames += 1
+				busy += took
+				data = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32) if lms is None else lms.array
+				sock.sendall(REPLY.pack(0, took, 0) + np.ascontiguousarray(data, dtype=np.float32).tobytes())
+		except (EOFError, ConnectionError):
+			pass
+		finally:
+			pool.release(config, detector, healthy)
+			if frames:
+				print(f"[Daemon] {config.get('backend')} client done: {frames} frames, "
+					  f"{busy / frames * 1000:.1f} ms mean inference ({'warm' if warm else 'cold'} start)")
+
+
+class PoseDaemon:
+	"""Unix-socket server around a DetectorPool (serve_forever / shutdown / close)."""
+
+	def __init__(self, path: str = DEFAULT_SOCKET, pool: Optional[DetectorPool] = None) -> None:
+		if not hasattr(socket, "AF_UNIX"):
+			raise OSError("Unix domain sockets are not available on this platform")
+		self.path = path
+		self.pool = pool or DetectorPool()
+		_private_dir(os.path.dirname(os.path.abspath(path)))
+		if os.path.exists(path):
+			# Left behind by a daemon that did not shut down cleanly, unless one still answers
+			probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+			try:
+				probe.connect(path)
+				raise OSError(f"A pose daemon is already listening on {path}")
+			except (ConnectionRefusedError, FileNotFoundError):
+				os.unlink(path)
+			finally:
+				probe.close()
+		self._server = socketserver.ThreadingUnixStreamServer(path, _Handler)
+		os.chmod(path, 0o600)
+		self._server.daemon_threads = True
+		self._server.pool = self.pool
+
+	def serve_forever(self) -> None:
+		self._server.serve_forever(poll_interval=0.2)
+
+	def shutdown(self) -> None:
+		"""Stop serve_forever (from another thread)."""
+		self._server.shutdown()
+
+	def close(self) -> None:
+		self._server.server_close()
+		if os.path.exists(self.path):
+			os.unlink(self.path)
+		self.pool.close()
+
+
+class DaemonResults:
+	"""Landmarks returned by the daemon, in the results shape scripts test (``pose_landmarks``)."""
+
+	def __init__(self, data: Optional[np.ndarray]) -> None:
+		self._data = data
+
+	@property
+	def pose_landmarks(self) -> bool:
+		return self._data is not None
+
+	def landmark_array(self) -> Optional[np.ndarray]:
+		"""(33, 4) float32 in pixels of the frame sent, or None without a pose."""
+		return self._data
+
+
+class PoseDaemonClient:
+	"""PoseDetector stand-in whose model runs in pose_daemon.
+
+	Same process/get_landmarks/draw/close contract; ``settings`` carries the
+	backend like TaskPoseDetector's, so create_pose_detector(**settings)
+	builds the in-process equivalent. Raises OSError when the daemon cannot
+	be reached or its socket is not private to this user (check_socket), and
+	RuntimeError when it cannot build the detector.
+	"""
+
+	def __init__(self, backend: str = "solutions", socket_path: Optional[str] = None, roi_crop: bool = False,
+				 timeout: float = 60.0, **settings) -> None:
+		self.settings = dict(backend=backend, **settings)
+		self.socket_path = socket_path or daemon_socket() or DEFAULT_SOCKET
+		if not hasattr(socket, "AF_UNIX"):
+			raise OSError("Unix domain sockets are not available on this platform")
+		self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		try:
+			# Building a configuration the daemon has not seen yet takes a model load
+			self._sock.settimeout(timeout)
+			check_socket(self.socket_path)
+			self._sock.connect(self.socket_path)
+			_send_json(self._sock, {"backend": backend, "settings": settings, "roi_crop": roi_crop})
+			reply = _recv_json(self._sock)
+		except (OSError, EOFError) as e:
+			self._sock.close()
+			raise OSError(f"pose daemon at {self.socket_path}: {e}") from None
+		if not reply.get("ok"):
+			self._sock.close()
+			raise RuntimeError(f"pose daemon could not build the detector: {reply.get('error')}")
+		self.warm = reply["warm"]
+		self.roi_crop = reply["roi_crop"]
+		# Optional stage_timer.StageTimer; records the round trip as inference
+		self.timer = None
+
+	def warm_up(self, size: int = 256) -> None:
+		"""Nothing to do: the daemon keeps its detectors warm."""
+
+	def process(self, frame_bgr, timestamp_s: Optional[float] = None) -> DaemonResults:
+		start = time.perf_counter()
+		frame = np.ascontiguousarray(frame_bgr, dtype=np.uint8)
+		h, w = frame.shape[:2]
+		c = frame.shape[2] if frame.ndim == 3 else 1
+		self._sock.sendall(FRAME_HEADER.pack(h, w, c, math.nan if timestamp_s is None else timestamp_s))
+		self._sock.sendall(memoryview(frame.reshape(-1)))
+		status, _, error_len = REPLY.unpack(_recv_bytes(self._sock, REPLY.size))
+		if status != 0:
+			raise RuntimeError(f"pose daemon: {_recv_bytes(self._sock, error_len).decode('utf-8', 'replace')}")
+		data = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+		_recv_exact(self._sock, memoryview(data.reshape(-1)).cast("B"))
+		if self.timer is not None:
+			self.timer.add("inference", time.perf_counter() - start)
+		return DaemonResults(None if np.isnan(data[:, 0]).all() else data)
+
+	def get_landmarks(self, frame_bgr, results: DaemonResults) -> Optional[LandmarkFrame]:
+		data = results.landmark_array()
+		return None if data is None else LandmarkFrame(data)
+
+	def draw(self, frame_bgr, results: DaemonResults) -> None:
+		data = results.landmark_array()
+		if data is not None:
+			draw_skeleton(frame_bgr, data)
+
+	def close(self) -> None:
+		try:
+			self._sock.sendall(FRAME_HEADER.pack(0, 0, 0, math.nan))
+			# The daemon hangs up after returning the detector to its pool, so
+			# a script that reconnects right away gets it warm
+			self._sock.settimeout(5.0)
+			self._sock.recv(1)
+		except OSError:
+			pass
+		self._sock.close()
+
+
+def open_pose_detector(backend: str = "solutions", socket_path: Optional[str] = None, roi_crop: bool = False,
+					   **settings):
+	"""A PoseDaemonClient when a daemon is selected (``socket_path`` or POSE_DAEMON) and
+	answers, otherwise an in-process detector from create_pose_detector."""
+	path = socket_path or daemon_socket()
+	if path:
+		try:
+			client = PoseDaemonClient(backend, path, roi_crop=roi_crop, **settings)
+			print(f"[Daemon] using pose daemon at {path} ({'warm' if client.warm else 'cold'} detector)")
+			return client
+		except OSError as e:
+			print(f"[Daemon] {e}; loading the model in-process")
+	detector = create_pose_detector(backend, **settings)
+	if roi_crop and hasattr(detector, "roi_crop"):
+		detector.roi_crop = True
+	return detector
+
+
+def parse_preload(text: str) -> Dict:
+	""""solutions:1" / "tasks-video:2" -> a configuration with main.py's confidence thresholds."""
+	backend, _, complexity = text.partition(":")
+	config = copy.deepcopy(DEFAULT_CONFIG)
+	config["backend"] = backend
+	if complexity:
+		config["settings"]["model_complexity"] = int(complexity)
+	return config
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Serve warm pose detectors to local scripts over a Unix socket")
+	parser.add_argument("--socket", default=daemon_socket() or DEFAULT_SOCKET, help="socket path (default: %(default)s)")
+	parser.add_argument("--preload", nargs="*", default=["solutions:1"], metavar="BACKEND[:COMPLEXITY]",
+						help="configurations to load and warm up at start (default: %(default)s)")
+	args = parser.parse_args()
+
+	daemon = PoseDaemon(args.socket)
+	for text in args.preload:
+		start = time.perf_counter()
+		daemon.pool.preload(parse_preload(text))
+		print(f"[Daemon] {text} warm in {time.perf_counter() - start:.1f}s")
+	# SIGTERM ends serve_forever like Ctrl-C does
+	signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=daemon.shutdown).start())
+	print(f"[Daemon] listening on {args.socket} (set {DAEMON_ENV}={args.socket} or {DAEMON_ENV}=1 in clients)")
+	try:
+		daemon.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		daemon.close()
+		print("[Daemon] stopped")
+
+
+if __name__ == "__main__":
+	main()
@@ -1,60 +1,189 @@
-import cv2
-import mediapipe as mp
-from dataclasses import dataclass
-from typing import Dict, Optional
+import time
+from typing import Optional, Tuple
 
+import numpy as np
 
-@dataclass
-class LandmarkPoint:
-	x: float
-	y: float
-	z: float
-	visibility: float
+from frame_buffers import FrameBuffers
+from pose_roi import RoiResults, roi_from_landmarks
+# Landmark types live in the NumPy-only landmarks module; re-exported here so
+# existing ``from pose_detector import LandmarkPoint`` imports keep working.
+from landmarks import (
+	LANDMARK_INDEX,
+	LANDMARK_NAMES,
+	NUM_LANDMARKS,
+	POSE_CONNECTIONS,
+	LandmarkFrame,
+	LandmarkPoint,
+	as_landmark_array,
+	side_triplets,
+)
 
 
 class PoseDetector:
 	def __init__(self, static_image_mode: bool = False, model_complexity: int = 1,
 				 enable_segmentation: bool = False, min_detection_confidence: float = 0.5,
 				 min_tracking_confidence: float = 0.5) -> None:
-		self._mp_pose = mp.solutions.pose
-		self._pose = self._mp_pose.Pose(
+		# Constructor arguments, so equivalent detectors can be built elsewhere
+		# (worker processes, cache keys).
+		self.settings = dict(
 			static_image_mode=static_image_mode,
 			model_complexity=model_complexity,
 			enable_segmentation=enable_segmentation,
 			min_detection_confidence=min_detection_confidence,
 			min_tracking_confidence=min_tracking_confidence,
 		)
+		# cv2 and MediaPipe (and the TensorFlow Lite runtime behind it) are only
+		# imported once a detector is actually built
+		import cv2
+		import mediapipe as mp
+		self._cv2 = cv2
+		self._mp_pose = mp.solutions.pose
+		self._pose = self._mp_pose.Pose(**self.settings)
 		self._mp_drawing = mp.solutions.drawing_utils
 		self._mp_styles = mp.solutions.drawing_styles
+		# Built once; get_default_pose_landmarks_style() makes a new dict of 33 specs per call
+		self._landmark_style = self._mp_styles.get_default_pose_landmarks_style()
+		self._connection_style = self._mp_styles.DrawingSpec(color=(0, 255, 0), thickness=2)
+		# Resize/RGB outputs are written into arrays reused across frames
+		self.buffers = FrameBuffers()
+		# Frames are resized by this factor before inference (landmarks are
+		# normalized, so get_landmarks/draw still map onto the full frame)
+		self.input_scale = 1.0
+		# ROI mode: infer on a padded box around the previous frame's pose
+		# (see pose_roi), resized so its longer side is at most roi_max_side
+		self.roi_crop = False
+		self.roi_padding = 0.25
+		self.roi_max_side = 384
+		self.roi: Optional[Tuple[int, int, int, int]] = None
+		# Optional stage_timer.StageTimer; records convert/inference/landmarks
+		self.timer = None
+
+	def set_model_complexity(self, model_complexity: int) -> None:
+		"""Rebuild the pose graph with another model (0 = lite, 1 = full, 2 = heavy).
+
+		Tracking restarts, so the next frame runs the person detector again.
+		"""
+		if model_complexity == self.settings["model_complexity"]:
+			return
+		self._pose.close()
+		self.settings["model_complexity"] = model_complexity
+		self._pose = self._mp_pose.Pose(**self.settings)
+
+	def reset(self) -> None:
+		"""Forget the tracking state so the next frame starts a new stream
+		(pose_daemon hands a detector to the next client this way)."""
+		self._pose.reset()
+		self.roi = None
 
-	def process(self, frame_bgr):
-		image_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+	def warm_up(self, size: int = 256) -> None:
+		"""Run one blank frame through the graph so model loading and graph setup
+		happen now (e.g. while the camera opens) instead of on the first real frame."""
+		blank = np.zeros((size, size, 3), dtype=np.uint8)
+		blank.flags.writeable = False
+		self._pose.process(blank)
+
+	def process(self, frame_bgr, timestamp_s: Optional[float] = None):
+		# The solutions graph stamps frames itself; timestamp_s is accepted
+		# for parity with TaskPoseDetector
+		timer = self.timer
+		start = time.perf_counter() if timer is not None else 0.0
+		image = frame_bgr
+		scale = self.input_scale
+		box = self.roi if self.roi_crop else None
+		if box is not None:
+			image = frame_bgr[box[1]:box[3], box[0]:box[2]]
+			scale *= min(1.0, self.roi_max_side / max(image.shape[:2]))
+		if scale != 1.0:
+			image = self.buffers.resize(image, scale, self._cv2.INTER_AREA)
+		image_rgb = self.buffers.bgr_to_rgb(image)
 		image_rgb.flags.writeable = False
+		if timer is not None:
+			converted = time.perf_counter()
+			timer.add("convert", converted - start)
 		results = self._pose.process(image_rgb)
 		image_rgb.flags.writeable = True
+		if timer is not None:
+			timer.add("inference", time.perf_counter() - converted)
+		if self.roi_crop:
+			h, w = frame_bgr.shape[:2]
+			results = RoiResults(results, box or (0, 0, w, h), w)
+			# Falls back to the full frame (None) when tracking is lost
+			self.roi = roi_from_landmarks(results.landmark_array(), w, h, current=box, padding=self.roi_padding)
 		return results
 
 	def draw(self, frame_bgr, results) -> None:
-		if results.pose_landmarks:
+		if isinstance(results, RoiResults):
+			data = results.landmark_array()
+			if data is not None:
+				draw_skeleton(frame_bgr, data)
+		elif results.pose_landmarks:
 			self._mp_drawing.draw_landmarks(
 				frame_bgr,
 				results.pose_landmarks,
 				self._mp_pose.POSE_CONNECTIONS,
-				landmark_drawing_spec=self._mp_styles.get_default_pose_landmarks_style(),
-				connection_drawing_spec=self._mp_styles.DrawingSpec(color=(0, 255, 0), thickness=2),
+				landmark_drawing_spec=self._landmark_style,
+				connection_drawing_spec=self._connection_style,
 			)
 
-	def get_landmarks(self, frame_bgr, results) -> Optional[Dict[str, LandmarkPoint]]:
+	def get_landmarks(self, frame_bgr, results) -> Optional[LandmarkFrame]:
 		if not results.pose_landmarks:
 			return None
+		if isinstance(results, RoiResults):
+			# Already mapped back to full-frame pixels in process()
+			return LandmarkFrame(results.landmark_array())
+		start = time.perf_counter() if self.timer is not None else 0.0
 		h, w = frame_bgr.shape[:2]
-		indexed: Dict[str, LandmarkPoint] = {}
-		for idx, lm in enumerate(results.pose_landmarks.landmark):
-			name = self._mp_pose.PoseLandmark(idx).name
-			indexed[name] = LandmarkPoint(
-				x=lm.x * w,
-				y=lm.y * h,
-				z=lm.z,
-				visibility=lm.visibility,
-			)
-		return indexed
+		data = np.array(
+			[(lm.x, lm.y, lm.z, lm.visibility) for lm in results.pose_landmarks.landmark],
+			dtype=np.float32,
+		)
+		data[:, 0] *= w
+		data[:, 1] *= h
+		if self.timer is not None:
+			self.timer.add("landmarks", time.perf_counter() - start)
+		return LandmarkFrame(data)
+
+	def close(self) -> None:
+		self._pose.close()
+
+
+_CONNECTION_INDEX = np.array(POSE_CONNECTIONS, dtype=np.intp)
+
+
+def draw_skeleton(frame_bgr, data: np.ndarray, min_visibility: float = 0.5) -> None:
+	"""Draw the skeleton from (33, 4) full-frame pixel landmarks (e.g. LandmarkFrame.array).
+
+	Two cv2.polylines calls: all visible bones as 2-point polylines, then the
+	joints as zero-length segments whose round caps are the 3 px dots.
+	"""
+	import cv2
+	with np.errstate(invalid="ignore"):
+		visible = data[:, 3] >= min_visibility
+	pts = np.nan_to_num(np.round(data[:, :2])).astype(np.int32)
+	bones = pts[_CONNECTION_INDEX[visible[_CONNECTION_INDEX].all(axis=1)]]
+	if len(bones):
+		cv2.polylines(frame_bgr, bones, False, (0, 255, 0), 2)
+	joints = pts[visible]
+	if len(joints):
+		cv2.polylines(frame_bgr, np.repeat(joints[:, None], 2, axis=1), False, (0, 0, 255), 6)
+
+
+# "solutions": legacy blocking mp.solutions.pose.Pose (PoseDetector above).
+# "tasks-video" / "tasks-live": Tasks PoseLandmarker in VIDEO or LIVE_STREAM
+# mode (pose_landmarker.TaskPoseDetector). Offline consumers (builders,
+# headless runs) need a result for every frame, which LIVE_STREAM does not give.
+BACKENDS = ("solutions", "tasks-video", "tasks-live")
+OFFLINE_BACKENDS = ("solutions", "tasks-video")
+
+
+def create_pose_detector(backend: str = "solutions", **settings):
+	"""Build a detector for ``backend`` from PoseDetector keyword arguments
+	(plus ``model_path`` for the Tasks backends); ``create_pose_detector(**d.settings)``
+	rebuilds an equivalent detector."""
+	if backend == "solutions":
+		return PoseDetector(**settings)
+	if backend in ("tasks-video", "tasks-live"):
+		from pose_landmarker import TaskPoseDetector
+		mode = "live_stream" if backend == "tasks-live" else "video"
+		return TaskPoseDetector(running_mode=mode, **settings)
+	raise ValueError(f"Unknown pose backend {backend!r}; expected one of {BACKENDS}")
@@ -0,0 +1,291 @@
+"""
+MediaPipe Tasks PoseLandmarker backend with the PoseDetector interface.
+
+PoseDetector wraps the legacy ``mp.solutions.pose.Pose``, whose ``process()``
+blocks the caller. TaskPoseDetector keeps the same process/get_landmarks/draw
+contract on top of the Tasks ``PoseLandmarker``:
+
+- VIDEO mode calls ``detect_for_video`` synchronously, so every frame gets its
+  own result (builders, headless runs). Frames are stamped with their time
+  in the video, passed to process() by the caller, so tracking and
+  smoothing see video time whatever the decode speed.
+- LIVE_STREAM mode submits the frame with ``detect_async`` and returns at once
+  with the newest result the callback has delivered, so capture and rendering
+  keep going while inference is in flight. That result may belong to an
+  earlier frame, and MediaPipe drops frames submitted while the graph is busy.
+
+The Tasks API loads a ``.task`` model bundle instead of a complexity flag;
+model_complexity 0/1/2 picks the lite/full/heavy bundle from models/ unless
+model_path is given.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from frame_buffers import FrameBuffers
+from landmarks import LandmarkFrame
+
+
+MODEL_DIR = "models"
+MODEL_VARIANTS = ("lite", "full", "heavy")
+MODEL_URL = ("https://storage.googleapis.com/mediapipe-models/pose_landmarker/"
+			 "pose_landmarker_{variant}/float16/latest/pose_landmarker_{variant}.task")
+RUNNING_MODES = ("image", "video", "live_stream")
+
+
+def default_model_path(model_complexity: int = 1) -> str:
+	variant = MODEL_VARIANTS[model_complexity]
+	return os.path.join(MODEL_DIR, f"pose_landmarker_{variant}.task")
+
+
+class TaskPoseResults:
+	"""A PoseLandmarkerResult in the legacy results shape (``pose_landmarks.landmark``)."""
+
+	def __init__(self, landmarks=None, timestamp_ms: int = -1) -> None:
+		# NormalizedLandmark list of the first detected pose, or None
+		self._landmarks = landmarks
+		self._proto = None
+		self.timestamp_ms = timestamp_ms
+
+	@classmethod
+	def from_result(cls, result, timestamp_ms: int) -> "TaskPoseResults":
+		poses = result.pose_landmarks if result is not None else None
+		return cls(poses[0] if poses else None, timestamp_ms)
+
+	@property
+	def pose_landmarks(self):
+		"""NormalizedLandmarkList proto (what drawing_utils expects), built on first access."""
+		if not self._landmarks:
+			return None
+		if self._proto is None:
+			from mediapipe.framework.formats import landmark_pb2
+			self._proto = landmark_pb2.NormalizedLandmarkList(landmark=[
+				landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z, visibility=lm.visibility or 0.0)
+				for lm in self._landmarks
+			])
+		return self._proto
+
+	def normalized_array(self) -> Optional[np.ndarray]:
+		"""(33, 4) float32 of normalized x, y, z, visibility, or None without a pose."""
+		if not self._landmarks:
+			return None
+		return np.array(
+			[(lm.x, lm.y, lm.z, lm.visibility or 0.0) for lm in self._landmarks],
+			dtype=np.float32,
+		)
+
+
+class StreamClock:
+	"""Millisecond timestamps for detect_for_video / detect_async.
+
+	Live streams are stamped with the wall clock since creation. Video
+	frames keep the spacing of the caller's timestamps (seconds of video
+	time; a nominal 30 fps step when none is given), shifted so the first
+	one follows whatever the graph has already seen (e.g. the warm-up
+	frame). Both modes reject timestamps that do not increase.
+	"""
+
+	NOMINAL_STEP_MS = 33
+
+	def __init__(self, live: bool, clock=time.perf_counter) -> None:
+		self.live = live
+		self._clock = clock
+		self.reset()
+
+	def reset(self) -> None:
+		"""Start over, for a new landmarker graph."""
+		self.t0 = self._clock()
+		self.last_ms = -1
+		self._video_offset_ms: Optional[int] = None
+
+	def next_ms(self, timestamp_s: Optional[float] = None) -> int:
+		if self.live:
+			ts = int((self._clock() - self.t0) * 1000.0)
+		elif timestamp_s is None:
+			ts = self.last_ms + self.NOMINAL_STEP_MS
+		else:
+			video_ms = int(round(timestamp_s * 1000.0))
+			if self._video_offset_ms is None:
+				self._video_offset_ms = self.last_ms + 1 - video_ms
+			ts = video_ms + self._video_offset_ms
+		if ts <= self.last_ms:
+			ts = self.last_ms + 1
+		self.last_ms = ts
+		return ts
+
+
+class TaskPoseDetector:
+	def __init__(self, running_mode: str = "video", model_path: Optional[str] = None,
+				 static_image_mode: bool = False, model_complexity: int = 1,
+				 enable_segmentation: bool = False, min_detection_confidence: float = 0.5,
+				 min_tracking_confidence: float = 0.5) -> None:
+		if running_mode not in RUNNING_MODES:
+			raise ValueError(f"running_mode must be one of {RUNNING_MODES}, got {running_mode!r}")
+		if static_image_mode:
+			running_mode = "image"
+		model_path = model_path or default_model_path(model_complexity)
+		if not os.path.exists(model_path):
+			raise FileNotFoundError(
+				f"PoseLandmarker model not found at {model_path}; download it from "
+				f"{MODEL_URL.format(variant=MODEL_VARIANTS[model_complexity])}"
+			)
+		# Same keys as PoseDetector.settings plus the backend, so
+		# pose_detector.create_pose_detector(**settings) rebuilds this detector
+		self.settings = dict(
+			backend="tasks-live" if running_mode == "live_stream" else "tasks-video",
+			model_path=model_path,
+			static_image_mode=static_image_mode,
+			model_complexity=model_complexity,
+			enable_segmentation=enable_segmentation,
+			min_detection_confidence=min_detection_confidence,
+			min_tracking_confidence=min_tracking_confidence,
+		)
+		self.running_mode = running_mode
+
+		import cv2
+		import mediapipe as mp
+		self._cv2 = cv2
+		self._mp = mp
+		self._mp_pose = mp.solutions.pose
+		self._mp_drawing = mp.solutions.drawing_utils
+		self._mp_styles = mp.solutions.drawing_styles
+		self._landmark_style = self._mp_styles.get_default_pose_landmarks_style()
+		self._connection_style = self._mp_styles.DrawingSpec(color=(0, 255, 0), thickness=2)
+
+		self._latest = TaskPoseResults()
+		self._lock = threading.Lock()
+		self._result_ready = threading.Event()
+		self._clock = StreamClock(live=running_mode == "live_stream")
+		self.submitted = 0
+		self.completed = 0
+
+		self._landmarker = self._create_landmarker()
+		self.buffers = FrameBuffers()
+		# Frames are resized by this factor before inference (see PoseDetector)
+		self.input_scale = 1.0
+		# Optional stage_timer.StageTimer; records convert/inference/landmarks,
+		# plus submit/async_latency in LIVE_STREAM mode
+		self.timer = None
+
+	def _create_landmarker(self):
+		vision = self._mp.tasks.vision
+		s = self.settings
+		options = vision.PoseLandmarkerOptions(
+			base_options=self._mp.tasks.BaseOptions(model_asset_path=s["model_path"]),
+			running_mode={
+				"image": vision.RunningMode.IMAGE,
+				"video": vision.RunningMode.VIDEO,
+				"live_stream": vision.RunningMode.LIVE_STREAM,
+			}[self.running_mode],
+			num_poses=1,
+			min_pose_detection_confidence=s["min_detection_confidence"],
+			min_pose_presence_confidence=s["min_detection_confidence"],
+			min_tracking_confidence=s["min_tracking_confidence"],
+			output_segmentation_masks=s["enable_segmentation"],
+			result_callback=self._on_result if self.running_mode == "live_stream" else None,
+		)
+		return vision.PoseLandmarker.create_from_options(options)
+
+	def set_model_complexity(self, model_complexity: int) -> None:
+		"""Switch to the lite/full/heavy bundle in models/ (raises FileNotFoundError if absent)."""
+		if model_complexity == self.settings["model_complexity"]:
+			return
+		model_path = default_model_path(model_complexity)
+		if not os.path.exists(model_path):
+			raise FileNotFoundError(f"PoseLandmarker model not found at {model_path}")
+		self._landmarker.close()
+		self.settings.update(model_complexity=model_complexity, model_path=model_path)
+		self._landmarker = self._create_landmarker()
+
+	def _on_result(self, result, output_image, timestamp_ms: int) -> None:
+		results = TaskPoseResults.from_result(result, timestamp_ms)
+		with self._lock:
+			if timestamp_ms >= self._latest.timestamp_ms:
+				self._latest = results
+			self.completed += 1
+		if self.timer is not None:
+			self.timer.add("async_latency", time.perf_counter() - self._clock.t0 - timestamp_ms / 1000.0)
+		self._result_ready.set()
+
+	def _detect(self, image_rgb, timestamp_s: Optional[float] = None) -> TaskPoseResults:
+		image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=image_rgb)
+		if self.running_mode == "image":
+			return TaskPoseResults.from_result(self._landmarker.detect(image), -1)
+		ts = self._clock.next_ms(timestamp_s)
+		if self.running_mode == "video":
+			return TaskPoseResults.from_result(self._landmarker.detect_for_video(image, ts), ts)
+		self.submitted += 1
+		self._landmarker.detect_async(image, ts)
+		with self._lock:
+			return self._latest
+
+	def reset(self) -> None:
+		"""Start a new stream (see PoseDetector.reset). The Tasks API cannot
+		clear a landmarker's tracking state, so the graph is rebuilt, its
+		timestamps start over, and it is warmed up again."""
+		self._landmarker.close()
+		self._landmarker = self._create_landmarker()
+		self._clock.reset()
+		with self._lock:
+			self._latest = TaskPoseResults()
+		self.warm_up()
+
+	def warm_up(self, size: int = 256, timeout: float = 5.0) -> None:
+		"""Run one blank frame through the graph so setup happens before the first
+		real frame (in LIVE_STREAM mode, wait up to ``timeout`` for its result)."""
+		blank = np.zeros((size, size, 3), dtype=np.uint8)
+		self._result_ready.clear()
+		self._detect(blank)
+		if self.running_mode == "live_stream":
+			self._result_ready.wait(timeout)
+
+	def process(self, frame_bgr, timestamp_s: Optional[float] = None) -> TaskPoseResults:
+		"""Pose for this frame (VIDEO/IMAGE), or the newest finished one (LIVE_STREAM).
+
+		``timestamp_s`` is the frame's time in seconds (video position, or
+		capture time for a camera); VIDEO mode stamps the frame with it.
+		"""
+		timer = self.timer
+		start = time.perf_counter() if timer is not None else 0.0
+		if self.input_scale != 1.0:
+			frame_bgr = self.buffers.resize(frame_bgr, self.input_scale, self._cv2.INTER_AREA)
+		# mp.Image copies the pixels, so the buffer can be reused while an
+		# async detection is still running
+		image_rgb = self.buffers.bgr_to_rgb(frame_bgr)
+		if timer is not None:
+			converted = time.perf_counter()
+			timer.add("convert", converted - start)
+		results = self._detect(image_rgb, timestamp_s)
+		if timer is not None:
+			timer.add("submit" if self.running_mode == "live_stream" else "inference",
+					  time.perf_counter() - converted)
+		return results
+
+	def draw(self, frame_bgr, results) -> None:
+		if results.pose_landmarks:
+			self._mp_drawing.draw_landmarks(
+				frame_bgr,
+				results.pose_landmarks,
+				self._mp_pose.POSE_CONNECTIONS,
+				landmark_drawing_spec=self._landmark_style,
+				connection_drawing_spec=self._connection_style,
+			)
+
+	def get_landmarks(self, frame_bgr, results) -> Optional[LandmarkFrame]:
+		start = time.perf_counter() if self.timer is not None else 0.0
+		data = results.normalized_array()
+		if data is None:
+			return None
+		h, w = frame_bgr.shape[:2]
+		data[:, 0] *= w
+		data[:, 1] *= h
+		if self.timer is not None:
+			self.timer.add("landmarks", time.perf_counter() - start)
+		return LandmarkFrame(data)
+
+	def close(self) -> None:
+		self._landmarker.close()
@@ -0,0 +1,103 @@
+"""
+Region-of-interest cropping driven by the previous frame's pose.
+
+With ROI cropping on, PoseDetector converts and runs inference only on a
+padded box around the last detected pose instead of the full camera frame,
+then maps the landmarks back to full-frame pixels. When no pose is found (or
+too few landmarks are visible) the next frame is processed in full again.
+
+The box is sticky: it is only recomputed when the pose leaves it or it has
+become much larger than needed. A crop that moved every frame would shift the
+image MediaPipe's own tracker works in, costing both accuracy and the
+tracker's shortcut past the person detector.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+Box = Tuple[int, int, int, int]  # x0, y0, x1, y1 in full-frame pixels
+
+
+def roi_from_landmarks(data: Optional[np.ndarray], frame_w: int, frame_h: int,
+					   current: Optional[Box] = None, padding: float = 0.25,
+					   min_visibility: float = 0.5, min_points: int = 4,
+					   min_size: int = 96) -> Optional[Box]:
+	"""Crop box for the next frame from this frame's (33, 4) full-frame landmarks.
+
+	Args:
+		data: Landmarks in full-frame pixels (None when no pose was detected)
+		frame_w, frame_h: Full frame size
+		current: Box used for this frame; kept while it still fits the pose
+		padding: Margin on each side, as a fraction of the pose's larger extent
+		min_visibility: Landmarks below this visibility do not shape the box
+		min_points: Fewer visible landmarks than this counts as tracking lost
+		min_size: Smallest box side in pixels
+
+	Returns:
+		(x0, y0, x1, y1) or None to process the full frame.
+	"""
+	if data is None:
+		return None
+	visible = data[:, 3] >= min_visibility
+	if np.count_nonzero(visible) < min_points:
+		return None
+	pts = data[visible, :2]
+	lo, hi = pts.min(axis=0), pts.max(axis=0)
+	extent = float(max(hi - lo))
+
+	# The pose plus half the padding must still be inside the current box,
+	# and the current box must not be far larger than a fresh one
+	if current is not None:
+		margin = extent * padding * 0.5
+		fits = (lo[0] - margin >= current[0] and lo[1] - margin >= current[1]
+				and hi[0] + margin <= current[2] and hi[1] + margin <= current[3])
+		side = max(extent * (1.0 + 2.0 * padding), min_size)
+		if fits and (current[2] - current[0]) * (current[3] - current[1]) <= 2.25 * side * side:
+			return current
+
+	# Square box around the pose centre (the pose models take square inputs)
+	side = max(extent * (1.0 + 2.0 * padding), min_size)
+	cx, cy = (lo + hi) / 2.0
+	x0 = int(max(0.0, cx - side / 2.0))
+	y0 = int(max(0.0, cy - side / 2.0))
+	x1 = int(min(float(frame_w), cx + side / 2.0))
+	y1 = int(min(float(frame_h), cy + side / 2.0))
+	if x1 - x0 < 2 or y1 - y0 < 2:
+		return None
+	if x0 == 0 and y0 == 0 and x1 == frame_w and y1 == frame_h:
+		return None  # the pose fills the frame; nothing to crop
+	return (x0, y0, x1, y1)
+
+
+class RoiResults:
+	"""Pose results for a crop, plus the box to map them back to the full frame."""
+
+	def __init__(self, results, box: Box, frame_w: int) -> None:
+		self.results = results
+		self.box = box
+		self._frame_w = frame_w
+		self._array: Optional[np.ndarray] = None
+
+	@property
+	def pose_landmarks(self):
+		return self.results.pose_landmarks
+
+	def landmark_array(self) -> Optional[np.ndarray]:
+		"""(33, 4) float32 of x, y in full-frame pixels, z and visibility; None without a pose."""
+		if not self.results.pose_landmarks:
+			return None
+		if self._array is None:
+			data = np.array(
+				[(lm.x, lm.y, lm.z, lm.visibility) for lm in self.results.pose_landmarks.landmark],
+				dtype=np.float32,
+			)
+			x0, y0, x1, y1 = self.box
+			crop_w = x1 - x0
+			data[:, 0] = data[:, 0] * crop_w + x0
+			data[:, 1] = data[:, 1] * (y1 - y0) + y0
+			# z is on the scale of the image width; rescale from crop to frame
+			data[:, 2] *= crop_w / self._frame_w
+			self._array = data
+		return self._array
@@ -0,0 +1,83 @@
+"""
+JSONL event stream for headless sessions.
+
+Each line is one JSON object with an "event" field ("start", "frame",
+"phase", "rep", "plank_start", "plank_stop" or "summary") plus the frame
+index and the video timestamp ``t`` in seconds. NaN angles are written as
+null so every line is strict JSON.
+"""
+
+import json
+import math
+import sys
+from typing import Any, Dict, Optional, TextIO
+
+
+def _clean(value: Any) -> Any:
+	if isinstance(value, float):
+		return None if math.isnan(value) or math.isinf(value) else round(value, 3)
+	if isinstance(value, dict):
+		return {k: _clean(v) for k, v in value.items()}
+	if isinstance(value, (list, tuple)):
+		return [_clean(v) for v in value]
+	if hasattr(value, "item"):  # NumPy scalar
+		return _clean(value.item())
+	return value
+
+
+class EventWriter:
+	"""Writes one JSON object per line to ``path`` ("-" for stdout)."""
+
+	def __init__(self, path: str = "-") -> None:
+		self.path = path
+		self._stream: TextIO = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+		self.count = 0
+
+	@property
+	def to_stdout(self) -> bool:
+		return self._stream is sys.stdout
+
+	def emit(self, event: str, **fields: Any) -> None:
+		record: Dict[str, Any] = {"event": event}
+		record.update(fields)
+		self._stream.write(json.dumps(_clean(record), allow_nan=False) + "\n")
+		self.count += 1
+
+	def flush(self) -> None:
+		self._stream.flush()
+
+	def close(self) -> None:
+		self.flush()
+		if not self.to_stdout:
+			self._stream.close()
+
+
+class SessionTracker:
+	"""Turns per-frame analysis state into change events (phase, reps, plank timer)."""
+
+	def __init__(self, writer: EventWriter) -> None:
+		self.writer = writer
+		self._phase: Optional[str] = None
+		self._reps = 0
+		self._plank_active = False
+
+	def update(self, frame: int, t: float, phase: str, reps: int, plank_active: bool,
+			   plank_last: float = 0.0, plank_total: float = 0.0) -> None:
+		if phase != self._phase:
+			self.writer.emit("phase", frame=frame, t=t, previous=self._phase, phase=phase)
+			self._phase = phase
+		if reps > self._reps:
+			self.writer.emit("rep", frame=frame, t=t, count=reps)
+		self._reps = reps
+		self._update_plank(frame, t, plank_active, plank_last, plank_total)
+
+	def finish(self, frame: int, t: float, plank_last: float = 0.0, plank_total: float = 0.0) -> None:
+		"""Close a plank hold still running when the stream ends."""
+		self._update_plank(frame, t, False, plank_last, plank_total)
+
+	def _update_plank(self, frame: int, t: float, active: bool, last: float, total: float) -> None:
+		if active and not self._plank_active:
+			self.writer.emit("plank_start", frame=frame, t=t)
+		elif self._plank_active and not active:
+			self.writer.emit("plank_stop", frame=frame, t=t, duration=last, total=total)
+		self._plank_active = active
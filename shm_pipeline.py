@@ -0,0 +1,382 @@
+"""
+Multiprocess capture / inference pipeline over shared memory.
+
+frame_pipeline runs capture and inference on threads, which share one GIL
+with analysis and rendering. Here each stage is its own process:
+
+- a capture process decodes frames straight into a frame ring, a
+  ``multiprocessing.shared_memory`` block of fixed frame slots;
+- one or more inference processes claim the newest unclaimed frame, copy
+  it out of its slot (one memcpy, no pickling) and run their own detector
+  on the copy, then write the (33, 4) landmark array into a second ring;
+- the caller (main.py's analysis and render loop) only reads landmark
+  arrays, plus a copy of the matching frame when it renders.
+
+Like frame_pipeline, every stage works on the newest data: frames that no
+worker picked up before they were overwritten, and results that arrived
+after a newer one was consumed, are dropped rather than queued.
+
+Each slot carries its sequence number, set to -1 before the slot is
+written and to the frame's sequence number once the payload is complete.
+Readers copy a slot out and check the number before and after the copy,
+discarding what was overwritten in between, so a torn frame never reaches
+a detector (whose tracking state would keep it). The sequence numbers are
+read and written under a lock shared by all processes of a ring; its
+acquire/release are the memory barriers that order the payload against
+them on any CPU, while the payload itself is copied outside the lock.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from capture import CaptureSettings, open_capture
+from frame_pipeline import PipelineStats
+from landmarks import NUM_LANDMARKS, LandmarkFrame
+
+
+FRAME_SLOTS = 8
+RESULT_SLOTS = 16
+POLL_S = 0.001
+START_TIMEOUT_S = 10.0
+MODEL_TIMEOUT_S = 60.0
+
+
+class SharedRing:
+	"""Fixed-size slots in one SharedMemory block.
+
+	Layout: the newest published sequence number, then per slot a sequence
+	number, a capture timestamp and one float of extra data (inference
+	seconds for landmarks), then the payload slots. ``lock`` guards the
+	header; every process using the ring must pass the same
+	multiprocessing lock (a threading lock is enough within one process).
+	"""
+
+	def __init__(self, slots: int, payload_shape: Tuple[int, ...], dtype, name: Optional[str] = None,
+				 lock=None) -> None:
+		self._lock = lock if lock is not None else threading.Lock()
+		self.slots = slots
+		self.payload_shape = tuple(payload_shape)
+		self.dtype = np.dtype(dtype)
+		header = 8 + 3 * 8 * slots
+		payload = int(np.prod(self.payload_shape)) * self.dtype.itemsize * slots
+		if name is None:
+			self.shm = shared_memory.SharedMemory(create=True, size=header + payload)
+		else:
+			self.shm = shared_memory.SharedMemory(name=name)
+		buf = self.shm.buf
+		self._head = np.ndarray((1,), dtype=np.int64, buffer=buf)
+		self.seq = np.ndarray((slots,), dtype=np.int64, buffer=buf, offset=8)
+		self.ts = np.ndarray((slots,), dtype=np.float64, buffer=buf, offset=8 + 8 * slots)
+		self.extra = np.ndarray((slots,), dtype=np.float64, buffer=buf, offset=8 + 16 * slots)
+		self.payload = np.ndarray((slots,) + self.payload_shape, dtype=self.dtype, buffer=buf, offset=header)
+		if name is None:
+			self._head[0] = -1
+			self.seq[:] = -1
+
+	@property
+	def name(self) -> str:
+		return self.shm.name
+
+	def spec(self) -> tuple:
+		"""Arguments to attach to this ring from another process."""
+		return self.slots, self.payload_shape, self.dtype.str, self.name
+
+	def latest(self) -> int:
+		"""Sequence number of the newest published slot (-1 before the first)."""
+		with self._lock:
+			return int(self._head[0])
+
+	def begin_write(self, seq: int) -> np.ndarray:
+		"""Invalidate the slot for ``seq`` and return its payload to fill in place."""
+		idx = seq % self.slots
+		with self._lock:
+			self.seq[idx] = -1
+		return self.payload[idx]
+
+	def end_write(self, seq: int, ts: float, extra: float = 0.0) -> None:
+		idx = seq % self.slots
+		with self._lock:
+			self.ts[idx] = ts
+			self.extra[idx] = extra
+			self.seq[idx] = seq
+			if seq > self._head[0]:
+				self._head[0] = seq
+
+	def valid(self, seq: int) -> bool:
+		"""Whether the slot holds the complete payload of ``seq``."""
+		with self._lock:
+			return bool(self.seq[seq % self.slots] == seq)
+
+	def copy(self, seq: int, out: np.ndarray) -> Optional[Tuple[float, float]]:
+		"""Copy the payload of ``seq`` into ``out``; returns the slot's (timestamp,
+		extra), or None when the slot holds another frame or was rewritten
+		during the copy (``out`` is then garbage)."""
+		idx = seq % self.slots
+		with self._lock:
+			if self.seq[idx] != seq:
+				return None
+			meta = float(self.ts[idx]), float(self.extra[idx])
+		np.copyto(out, self.payload[idx])
+		return meta if self.valid(seq) else None
+
+	def close(self) -> None:
+		# Views into the buffer must go before the mapping can be closed
+		self._head = self.seq = self.ts = self.extra = self.payload = None
+		self.shm.close()
+
+	def unlink(self) -> None:
+		self.shm.unlink()
+
+
+def _capture_main(source, settings: Optional[CaptureSettings], mirror: bool, pace_fps: float, conn, lock,
+				  stop, ended) -> None:
+	"""Capture process: frames from ``source`` into the frame ring allocated by the parent."""
+	import cv2
+	cap, report = open_capture(source, settings)
+	ring = slot = out = None
+	try:
+		ret, frame = cap.read() if cap.isOpened() else (False, None)
+		if not ret:
+			conn.send(("error", f"Could not read from {source!r}"))
+			return
+		conn.send(("ready", frame.shape, report.summary()))
+		spec = conn.recv()
+		if spec is None:
+			return
+		ring = SharedRing(*spec, lock=lock)
+		seq = 0
+		capture_ts = start = time.perf_counter()
+		while not stop.is_set():
+			slot = ring.begin_write(seq)
+			if frame is not None:
+				# The first frame (read before the ring existed), a frame the
+				# backend returned in its own buffer, or every frame when
+				# mirroring: flip or copy it into the slot
+				if mirror:
+					cv2.flip(frame, 1, slot)
+				else:
+					np.copyto(slot, frame)
+			ring.end_write(seq, capture_ts)
+			seq += 1
+			if mirror:
+				ret, frame = cap.read(frame)
+			else:
+				# Decode straight into the next slot; published once complete
+				slot = ring.begin_write(seq)
+				ret, out = cap.read(slot)
+				frame = None if not ret or np.shares_memory(out, slot) else out
+			if ret and frame is not None and (frame.shape != ring.payload_shape or frame.dtype != ring.dtype):
+				print(f"[Pipeline] capture stopped: {source!r} switched to {frame.shape} {frame.dtype} "
+					  f"frames, the ring holds {ring.payload_shape} {ring.dtype}")
+				break
+			if pace_fps > 0:
+				# Video file standing in for a camera: release frames at its frame rate
+				time.sleep(max(0.0, start + seq / pace_fps - time.perf_counter()))
+			capture_ts = time.perf_counter()
+			if not ret:
+				break
+	finally:
+		ended.set()
+		cap.release()
+		slot = out = None  # views into the ring
+		if ring is not None:
+			ring.close()
+
+
+def _inference_main(detector_factory: Callable, frame_spec: tuple, frame_lock, result_spec: tuple, result_lock,
+					claimed, inferred, ready, stop, ended) -> None:
+	"""Inference process: newest unclaimed frame -> private copy -> detector -> landmark ring."""
+	detector = detector_factory()
+	with ready.get_lock():
+		ready.value += 1
+	frames = SharedRing(*frame_spec, lock=frame_lock)
+	results = SharedRing(*result_spec, lock=result_lock)
+	# The detector only ever sees this private copy: a slot rewritten while it
+	# is copied is dropped before it can reach the tracking state
+	frame = np.empty(frames.payload_shape, dtype=frames.dtype)
+	out = None
+	try:
+		while not stop.is_set():
+			with claimed.get_lock():
+				seq = frames.latest()
+				if seq > claimed.value:
+					claimed.value = seq
+				else:
+					seq = -1
+			if seq < 0:
+				if ended.is_set():
+					return
+				time.sleep(POLL_S)
+				continue
+			meta = frames.copy(seq, frame)
+			if meta is None:
+				continue  # overwritten before or while it was copied
+			capture_ts = meta[0]
+			start = time.perf_counter()
+			lms = detector.get_landmarks(frame, detector.process(frame, capture_ts))
+			took = time.perf_counter() - start
+			out = results.begin_write(seq)
+			if lms is None:
+				out[:] = np.nan
+			else:
+				out[:] = lms.array
+			results.end_write(seq, capture_ts, took)
+			with inferred.get_lock():
+				inferred.value += 1
+	finally:
+		out = None  # view into the result ring
+		frames.close()
+		results.close()
+		close = getattr(detector, "close", None)
+		if close is not None:
+			close()
+
+
+class ShmPipeline:
+	"""Capture and inference in separate processes, landmarks back to the caller.
+
+	``detector_factory`` is a picklable zero-argument callable run in each
+	inference process (e.g. ``functools.partial(create_pose_detector,
+	"solutions", model_complexity=1)``); the processes are started with the
+	spawn method, so it has to be importable from a module. ``pace_fps``
+	releases frames of a video file at that rate instead of as fast as they
+	decode (a camera paces itself). :meth:`get`
+	returns ``(seq, capture_ts, landmarks or None, inference seconds)`` for
+	the newest result not returned yet, and :meth:`frame` copies out the
+	frame a result was computed on.
+	"""
+
+	def __init__(self, source: Union[int, str], detector_factory: Callable, workers: int = 2,
+				 capture_settings: Optional[CaptureSettings] = None, mirror: bool = False, pace_fps: float = 0.0,
+				 frame_slots: int = FRAME_SLOTS, result_slots: int = RESULT_SLOTS) -> None:
+		self._ctx = multiprocessing.get_context("spawn")
+		self._source = source
+		self._detector_factory = detector_factory
+		self.workers = max(1, workers)
+		self._capture_settings = capture_settings
+		self._mirror = mirror
+		self._pace_fps = pace_fps
+		self._frame_slots = frame_slots
+		self._result_slots = result_slots
+		self._stop = self._ctx.Event()
+		self._ended = self._ctx.Event()
+		self._claimed = self._ctx.Value("q", -1)
+		self._inferred = self._ctx.Value("q", 0)
+		self._ready = self._ctx.Value("i", 0)
+		self._frame_lock = self._ctx.Lock()
+		self._result_lock = self._ctx.Lock()
+		self._processes: List[multiprocessing.process.BaseProcess] = []
+		self._capture: Optional[multiprocessing.process.BaseProcess] = None
+		self.frames: Optional[SharedRing] = None
+		self.results: Optional[SharedRing] = None
+		self.frame_shape: Optional[Tuple[int, ...]] = None
+		self.capture_summary = ""
+		self._last = -1
+		self.dropped_results = 0
+		self.stats = PipelineStats()
+
+	def start(self) -> "ShmPipeline":
+		"""Open the source in the capture process, allocate the rings, start the workers.
+
+		Capture starts streaming once every worker has built its detector, so
+		no frames are dropped while the models load. Raises RuntimeError when
+		the source cannot be opened or read, or a worker fails to start.
+		"""
+		parent, child = self._ctx.Pipe()
+		self._capture = self._ctx.Process(
+			target=_capture_main, name="capture", daemon=True,
+			args=(self._source, self._capture_settings, self._mirror, self._pace_fps, child, self._frame_lock,
+				  self._stop, self._ended))
+		self._capture.start()
+		if not parent.poll(START_TIMEOUT_S):
+			self.stop()
+			raise RuntimeError(f"Capture process did not open {self._source!r}")
+		message = parent.recv()
+		if message[0] != "ready":
+			self.stop()
+			raise RuntimeError(message[1])
+		_, self.frame_shape, self.capture_summary = message
+		self.frames = SharedRing(self._frame_slots, self.frame_shape, np.uint8, lock=self._frame_lock)
+		self.results = SharedRing(self._result_slots, (NUM_LANDMARKS, 4), np.float32, lock=self._result_lock)
+		for i in range(self.workers):
+			p = self._ctx.Process(
+				target=_inference_main, name=f"inference-{i}", daemon=True,
+				args=(self._detector_factory, self.frames.spec(), self._frame_lock, self.results.spec(),
+					  self._result_lock, self._claimed, self._inferred, self._ready, self._stop, self._ended))
+			p.start()
+			self._processes.append(p)
+		deadline = time.perf_counter() + MODEL_TIMEOUT_S
+		while self._ready.value < self.workers:
+			if time.perf_counter() > deadline or not all(p.is_alive() for p in self._processes):
+				parent.send(None)
+				self.stop()
+				raise RuntimeError("Inference processes failed to build their detectors; see their error output above")
+			time.sleep(0.01)
+		parent.send(self.frames.spec())
+		return self
+
+	def get(self, timeout: Optional[float] = None) -> Optional[Tuple[int, float, Optional[LandmarkFrame], float]]:
+		"""Newest result not returned yet; None once the stream ended and was drained.
+
+		Raises queue.Empty on timeout.
+		"""
+		deadline = None if timeout is None else time.perf_counter() + timeout
+		while True:
+			# Workers finish out of order: take the newest complete slot
+			seqs = self.results.seq
+			newer = seqs[seqs > self._last]
+			if newer.size:
+				seq = int(newer.max())
+				data = np.empty(self.results.payload_shape, dtype=np.float32)
+				meta = self.results.copy(seq, data)
+				if meta is not None:
+					capture_ts, took = meta
+					self.dropped_results += newer.size - 1
+					self._last = seq
+					self.stats.processed += 1
+					lms = None if np.isnan(data[:, 0]).all() else LandmarkFrame(data)
+					return seq, capture_ts, lms, took
+				continue
+			if not any(p.is_alive() for p in self._processes):
+				if self._ended.is_set():
+					return None
+				raise RuntimeError("Inference processes exited; see their error output above")
+			if deadline is not None and time.perf_counter() >= deadline:
+				raise queue.Empty
+			time.sleep(POLL_S)
+
+	def frame(self, seq: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+		"""Copy of frame ``seq`` (into ``out`` if given), or None when it was already overwritten."""
+		if not self.frames.valid(seq):
+			return None
+		if out is None or out.shape != self.frames.payload_shape:
+			out = np.empty(self.frames.payload_shape, dtype=self.frames.dtype)
+		return out if self.frames.copy(seq, out) is not None else None
+
+	def stop(self) -> None:
+		self._stop.set()
+		for p in self._processes + ([self._capture] if self._capture is not None else []):
+			p.join(timeout=2.0)
+			if p.is_alive():
+				p.terminate()
+				p.join()
+		if self.frames is not None:
+			self.stats.captured = self.frames.latest() + 1
+		for ring in (self.frames, self.results):
+			if ring is not None:
+				ring.close()
+				ring.unlink()
+		self.frames = self.results = None
+
+	def report(self) -> None:
+		if self.frames is not None:
+			self.stats.captured = self.frames.latest() + 1
+		inferred = self._inferred.value
+		self.stats.report(max(0, self.stats.captured - inferred), self.dropped_results)
+		print(f"[Pipeline] {self.workers} inference processes, {inferred} frames inferred")
@@ -0,0 +1,109 @@
+"""
+Per-stage latency instrumentation for the frame loop.
+
+StageTimer keeps the last ``window`` durations of each named stage
+(capture, convert, inference, landmarks, angles, feedback, draw, display,
+...) in fixed-size ring buffers and reports rolling p50/p95/p99. Recording
+a sample is a perf_counter difference and one array store, so it can stay
+on for every frame.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class RingBuffer:
+	"""Fixed-size float buffer that overwrites its oldest sample."""
+
+	def __init__(self, size: int) -> None:
+		self._data = np.zeros(size, dtype=np.float64)
+		self._next = 0
+		self.count = 0
+
+	def append(self, value: float) -> None:
+		self._data[self._next] = value
+		self._next = (self._next + 1) % len(self._data)
+		self.count += 1
+
+	def values(self) -> np.ndarray:
+		return self._data[:min(self.count, len(self._data))]
+
+
+class StageTimer:
+	"""Rolling latency statistics per pipeline stage (thread-safe)."""
+
+	PERCENTILES = (50, 95, 99)
+
+	def __init__(self, window: int = 300) -> None:
+		self.window = window
+		self._stages: Dict[str, RingBuffer] = {}
+		# Non-latency state worth reporting with the timings (e.g. the current
+		# model level); included in report() and dump()
+		self.info: Dict[str, object] = {}
+		self._lock = threading.Lock()
+
+	def add(self, stage: str, seconds: float) -> None:
+		with self._lock:
+			buf = self._stages.get(stage)
+			if buf is None:
+				buf = self._stages[stage] = RingBuffer(self.window)
+			buf.append(seconds)
+
+	def set_info(self, key: str, value) -> None:
+		with self._lock:
+			self.info[key] = value
+
+	@contextmanager
+	def measure(self, stage: str) -> Iterator[None]:
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.add(stage, time.perf_counter() - start)
+
+	@property
+	def stages(self) -> List[str]:
+		"""Stage names in the order they were first recorded."""
+		return list(self._stages)
+
+	def summary(self) -> Dict[str, Dict[str, float]]:
+		"""{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms}} over the current window."""
+		with self._lock:
+			snapshot = {name: (buf.count, buf.values().copy()) for name, buf in self._stages.items()}
+		out: Dict[str, Dict[str, float]] = {}
+		for name, (count, values) in snapshot.items():
+			if not values.size:
+				continue
+			ms = values * 1000.0
+			pcts = np.percentile(ms, self.PERCENTILES)
+			stats = {"count": count, "mean_ms": float(ms.mean())}
+			stats.update({f"p{p}_ms": float(v) for p, v in zip(self.PERCENTILES, pcts)})
+			out[name] = stats
+		return out
+
+	def report(self) -> None:
+		summary = self.summary()
+		for key, value in dict(self.info).items():
+			if isinstance(value, (list, dict)):
+				value = f"{len(value)} entries (see the JSON dump)"
+			print(f"[Timing] {key}: {value}")
+		if not summary:
+			return
+		print(f"[Timing] per-stage latency over the last {self.window} samples (ms):")
+		print(f"[Timing] {'stage':12s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'mean':>8s}")
+		for name, s in summary.items():
+			print(f"[Timing] {name:12s} {s['p50_ms']:8.2f} {s['p95_ms']:8.2f} {s['p99_ms']:8.2f} {s['mean_ms']:8.2f}")
+
+	def dump(self, path: str, extra: Optional[Dict] = None) -> None:
+		"""Write the summary (plus optional metadata) as JSON."""
+		payload = dict(extra or {}, window=self.window, stages=self.summary())
+		if self.info:
+			payload["info"] = dict(self.info)
+		with open(path, "w", encoding="utf-8") as f:
+			json.dump(payload, f, indent=2)
+		print(f"[Timing] Stage timings written to {path}")
@@ -2,6 +2,8 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from capture import WEBCAM_DEFAULTS, open_capture
+
 # Initialize MediaPipe drawing utilities and pose model
 mp_drawing = mp.solutions.drawing_utils
 mp_pose = mp.solutions.pose
@@ -41,29 +43,31 @@ def calculate_angle(a, b, c):
 
 # --- Main Pushup Tracker Logic ---
 # Note: For pushups, positioning the camera to the side or slightly above and to the side works best.
-cap = cv2.VideoCapture(0)
+cap, capture_report = open_capture(0, WEBCAM_DEFAULTS)
+print(capture_report.summary())
 
 # Pushup counter variables
 pushup_counter = 0
 pushup_stage = None # "up" (arms straight) or "down" (chest near floor)
 
 with mp_pose.Pose(min_detection_confidence=0.6, min_tracking_confidence=0.6) as pose:
+    rgb = None  # RGB conversion buffer, reused while the frame size stays the same
     while cap.isOpened():
         ret, frame = cap.read()
         if not ret:
             print("Failed to grab frame")
             break
 
-        # Recolor image to RGB for MediaPipe
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        image.flags.writable = False
+        # Recolor image to RGB for MediaPipe, reusing last frame's buffer
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, rgb)
+        rgb.flags.writeable = False
 
         # Make detection
-        results = pose.process(image)
+        results = pose.process(rgb)
+        rgb.flags.writeable = True
 
-        # Recolor back to BGR for OpenCV
-        image.flags.writable = True
-        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        # Draw on the captured BGR frame itself (no RGB -> BGR round trip)
+        image = frame
 
         # Get frame dimensions for calculating pixel coordinates
         frame_height, frame_width, _ = frame.shape
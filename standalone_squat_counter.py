@@ -9,6 +9,8 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from capture import WEBCAM_DEFAULTS, open_capture
+
 # Initialize MediaPipe drawing utilities and pose model
 mp_drawing = mp.solutions.drawing_utils
 mp_pose = mp.solutions.pose
@@ -34,29 +36,31 @@ def calculate_angle(a, b, c):
 def main():
     """Main squat counter - matches your script functionality"""
     # --- Main Squat Counter Logic ---
-    cap = cv2.VideoCapture(0)  # 0 for default webcam
+    cap, capture_report = open_capture(0, WEBCAM_DEFAULTS)  # 0 for default webcam
+    print(capture_report.summary())
 
     # Squat counter variables
     squat_counter = 0
     squat_stage = None  # "up" or "down"
 
     with mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5) as pose:
+        rgb = None  # RGB conversion buffer, reused while the frame size stays the same
         while cap.isOpened():
             ret, frame = cap.read()
             if not ret:
                 print("Failed to grab frame")
                 break
 
-            # Recolor image to RGB for MediaPipe
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image.flags.writeable = False
+            # Recolor image to RGB for MediaPipe, reusing last frame's buffer
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, rgb)
+            rgb.flags.writeable = False
 
             # Make detection
-            results = pose.process(image)
+            results = pose.process(rgb)
+            rgb.flags.writeable = True
 
-            # Recolor back to BGR for OpenCV
-            image.flags.writeable = True
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            # Draw on the captured BGR frame itself (no RGB -> BGR round trip)
+            image = frame
 
             try:
                 landmarks = results.pose_landmarks.landmark
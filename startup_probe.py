@@ -0,0 +1,57 @@
+"""
+Time-to-first-processed-frame probe for startup benchmarks.
+
+Runs an entry point with the detectors' process() wrapped so that the
+first frame through any of them prints a marker line with the wall-clock
+time and ends the process:
+
+    python startup_probe.py main.py --headless --video clip.mp4
+
+bench_startup.py launches each entry point this way and measures from
+launch to the marker, which covers interpreter start, imports, model
+loading and opening the source. The detectors themselves carry no probe
+code, so nothing changes for a run that is not started through here.
+"""
+
+import functools
+import os
+import runpy
+import sys
+import time
+
+
+MARKER = "[startup-probe] first-frame-at"
+
+
+def _exit_after_first_frame(process):
+	@functools.wraps(process)
+	def probed(self, *args, **kwargs):
+		process(self, *args, **kwargs)
+		print(f"{MARKER} {time.time():.6f}", flush=True)
+		# os._exit rather than SystemExit: the frame may have been processed on
+		# a worker thread, where SystemExit would only end that thread
+		os._exit(0)
+	return probed
+
+
+def install() -> None:
+	"""Wrap process() of every detector class (in-process backends and the daemon client)."""
+	import pose_daemon
+	import pose_detector
+	import pose_landmarker
+	for cls in (pose_detector.PoseDetector, pose_landmarker.TaskPoseDetector, pose_daemon.PoseDaemonClient):
+		cls.process = _exit_after_first_frame(cls.process)
+
+
+def main():
+	if len(sys.argv) < 2:
+		sys.exit("usage: python startup_probe.py SCRIPT [ARGS...]")
+	script = sys.argv[1]
+	sys.argv = sys.argv[1:]
+	sys.path[0] = os.path.dirname(os.path.abspath(script))
+	install()
+	runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,153 @@
+"""
+Test script for the vectorized batch angle API
+
+This script tests:
+1. calculate_angles matches calculate_angle triplet by triplet
+2. NaN points propagate and first_valid falls back per frame
+3. Builder series angles match the per-frame compute_* functions
+4. FeedbackEngine.compute_all_angles matches per-joint scalar evaluation
+5. The lazy angle view only evaluates the joints that are read
+"""
+
+import numpy as np
+
+from angle_utils import calculate_angle, calculate_angles, first_valid, landmark_angles
+from landmarks import LANDMARK_INDEX, NUM_LANDMARKS, LandmarkFrame, side_triplets
+
+
+def _random_series(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    series = rng.uniform(0, 640, size=(n, NUM_LANDMARKS, 4)).astype(np.float32)
+    series[..., 3] = rng.uniform(0, 1, size=(n, NUM_LANDMARKS))
+    return series
+
+
+def test_matches_scalar():
+    """Test batch results against the scalar implementation"""
+    print("=== Testing Batch vs Scalar ===")
+
+    pts = np.random.default_rng(1).uniform(-100, 100, size=(500, 3, 2))
+    batch = calculate_angles(pts)
+    scalar = np.array([calculate_angle(*p) for p in pts])
+    assert np.allclose(batch, scalar)
+    assert ((batch >= 0) & (batch <= 180)).all()
+    print(f"  ✓ {len(pts)} triplets match calculate_angle")
+
+    right = calculate_angles(np.array([[[1, 0, 0], [0, 0, 0], [0, 0, 1]]], dtype=float))
+    assert np.isclose(right[0], 90.0)
+    print("  ✓ 3-D input measures the angle in space")
+
+
+def test_nan_handling():
+    """Test NaN propagation, visibility masking and side fallback"""
+    print("\n=== Testing NaN Handling ===")
+
+    pts = np.array([[[0, 1], [0, 0], [1, 0]], [[np.nan, 1], [0, 0], [1, 0]]], dtype=float)
+    out = calculate_angles(pts)
+    assert np.isclose(out[0], 90.0) and np.isnan(out[1])
+    print("  ✓ Missing point gives NaN")
+
+    series = _random_series(4)
+    elbows = side_triplets("SHOULDER", "ELBOW", "WRIST")
+    series[0, LANDMARK_INDEX["LEFT_ELBOW"], 3] = 0.1
+    series[1:, elbows.ravel(), 3] = 0.9
+    per_side = landmark_angles(series, elbows, min_visibility=0.3)
+    assert np.isnan(per_side[0, 0]) and not np.isnan(per_side[1, 0])
+
+    chosen = first_valid(*per_side.T)
+    assert np.isclose(chosen[1], per_side[1, 0])
+    if not np.isnan(per_side[0, 1]):
+        assert np.isclose(chosen[0], per_side[0, 1])
+    print("  ✓ Low-visibility side masked, other side used as fallback")
+
+
+def test_builder_series_angles():
+    """Test builder series helpers against their per-frame functions"""
+    print("\n=== Testing Builder Series Angles ===")
+
+    import trainer_reference_builder_pushup as pushup
+    import trainer_reference_builder_squat as squat
+
+    series = _random_series(50, seed=2)
+    series[3] = np.nan  # no pose
+    series[7, LANDMARK_INDEX["LEFT_KNEE"]] = np.nan  # left knee missing
+
+    for module, funcs in (
+        (squat, (squat.compute_knee_angle, squat.compute_hip_angle, squat.compute_back_angle)),
+        (pushup, (pushup.compute_elbow_angle, pushup.compute_shoulder_angle, pushup.compute_back_angle)),
+    ):
+        batch = module.compute_series_angles(series)
+        for func, values in zip(funcs, batch):
+            expected = np.array([func(LandmarkFrame(frame)) for frame in series])
+            assert np.allclose(values, expected, equal_nan=True), func.__name__
+        print(f"  ✓ {module.__name__} series angles match per-frame results")
+
+
+def test_feedback_engine_single_pass():
+    """Test the precompiled all-joints evaluation against compute_joint_angle"""
+    print("\n=== Testing FeedbackEngine Single Pass ===")
+
+    from feedback import JOINT_DEFINITIONS, FeedbackEngine
+
+    engine = FeedbackEngine()
+    series = _random_series(10, seed=3)
+    series[::2, LANDMARK_INDEX["LEFT_HIP"]] = np.nan  # force right-side fallback
+    for frame in series:
+        lms = LandmarkFrame(frame)
+        for priority in (("LEFT", "RIGHT"), ("RIGHT", "LEFT")):
+            angles = engine.compute_all_angles(lms, priority)
+            for joint in JOINT_DEFINITIONS:
+                first = engine.compute_joint_angle(lms, joint, priority[0])
+                expected = first if first == first else engine.compute_joint_angle(lms, joint, priority[1])
+                assert np.isclose(angles[joint], expected, equal_nan=True), joint
+    print(f"  ✓ {len(JOINT_DEFINITIONS)} joints match with both side priorities")
+
+
+def test_lazy_angle_view():
+    """Test lazy per-joint evaluation and reference-derived joint subsets"""
+    print("\n=== Testing Lazy Angle View ===")
+
+    from feedback import FeedbackEngine, reference_joints
+
+    engine = FeedbackEngine()
+    lms = LandmarkFrame(_random_series(1, seed=4)[0])
+    full = engine.compute_all_angles(lms)
+
+    view = engine.angle_view(lms, joints=("Knee", "Back"))
+    assert list(view) == ["Knee", "Back"]
+    assert np.isclose(view["Knee"], full["Knee"])
+    assert "1 of" in repr(view)
+    view["Back"], view["Hip"]  # Hip shares Back's triplet
+    assert "2 of" in repr(view)
+    assert np.isclose(view.get("Elbow"), full["Elbow"])
+    assert np.isclose(view.joint("Knee", ("RIGHT", "LEFT")), engine.compute_joint_angle(lms, "Knee", "RIGHT"))
+    print("  ✓ Only read triplets are evaluated, values match compute_all_angles")
+
+    assert reference_joints({"Knee": {"Min": 1, "Max": 2}, "Back": {"Min": 1, "Max": 2}}) == ("Knee", "Back")
+    assert reference_joints({"Hold": {"Back": [170, 185], "Hip": [160, 185]}, "Analysis": {}}) == ("Hip", "Back")
+    print("  ✓ Joint subsets derived from both reference layouts")
+
+
+def main():
+    """Run all tests"""
+    print("Batch Angle Test Suite")
+    print("=" * 50)
+
+    try:
+        test_matches_scalar()
+        test_nan_handling()
+        test_builder_series_angles()
+        test_feedback_engine_single_pass()
+        test_lazy_angle_view()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
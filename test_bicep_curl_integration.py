@@ -16,7 +16,7 @@ from typing import Dict
 from bicep_curl_exercise import BicepCurlExercise, BicepCurlIntegration, create_bicep_curl_processor
 from rep_counter import RepCounter
 from reference_loader import ReferenceProvider
-from pose_detector import LandmarkPoint
+from landmarks import LandmarkPoint
 
 
 class MockLandmark:
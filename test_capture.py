@@ -0,0 +1,116 @@
+"""
+Test script for capture settings negotiation
+
+This script tests:
+1. Settings are applied in driver-friendly order and read back
+2. The report flags what the driver did not grant
+3. Video files open with their own properties; parsing helpers
+"""
+
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from capture import (CaptureReport, CaptureSettings, apply_settings, fourcc_to_str, open_capture, parse_size,
+                     read_settings)
+
+
+class FakeCamera:
+    """Driver that only supports 640x480 and 1280x720, at most 30 fps."""
+
+    def __init__(self):
+        self.props = {cv2.CAP_PROP_FRAME_WIDTH: 640.0, cv2.CAP_PROP_FRAME_HEIGHT: 480.0, cv2.CAP_PROP_FPS: 30.0,
+                      cv2.CAP_PROP_FOURCC: float(cv2.VideoWriter_fourcc(*"YUYV")), cv2.CAP_PROP_BUFFERSIZE: 4.0}
+        self.calls = []
+
+    def set(self, prop, value):
+        self.calls.append(prop)
+        if prop == cv2.CAP_PROP_FPS:
+            value = min(value, 30.0)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH and value not in (640, 1280):
+            value = 1280 if value > 640 else 640
+        self.props[prop] = float(value)
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0.0)
+
+
+def test_negotiation():
+    """Test apply order, read-back and the mismatch report"""
+    print("=== Testing Negotiation ===")
+
+    cam = FakeCamera()
+    requested = CaptureSettings(width=1920, height=720, fps=60, fourcc="mjpg", buffer_size=1)
+    apply_settings(cam, requested)
+    assert cam.calls[0] == cv2.CAP_PROP_FOURCC
+    assert cam.calls.index(cv2.CAP_PROP_FRAME_WIDTH) < cam.calls.index(cv2.CAP_PROP_FPS)
+    print("  ✓ Pixel format set before size and frame rate")
+
+    granted = read_settings(cam)
+    assert granted == CaptureSettings(width=1280, height=720, fps=30.0, fourcc="MJPG", buffer_size=1)
+    report = CaptureReport(requested, granted, "FAKE")
+    assert report.mismatches() == ["width 1920 -> 1280", "fps 60 -> 30.0"]
+    summary = report.summary()
+    assert summary.startswith("[Capture] 1280x720@30 MJPG buffer 1 via FAKE") and "not granted" in summary
+    print(f"  ✓ {summary}")
+
+    assert CaptureReport(CaptureSettings(fps=30), CaptureSettings(fps=29.97)).mismatches() == []
+    assert "requested" not in CaptureReport(CaptureSettings(), granted).summary()
+    print("  ✓ Near-equal frame rates and driver defaults are not reported")
+
+
+def test_files_and_helpers():
+    """Test opening a video file and the parsing helpers"""
+    print("\n=== Testing Files and Helpers ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25.0, (160, 120))
+        for _ in range(3):
+            writer.write(np.zeros((120, 160, 3), dtype=np.uint8))
+        writer.release()
+
+        cap, report = open_capture(path, CaptureSettings(width=640, height=480))
+        assert cap.isOpened() and cap.read()[0]
+        cap.release()
+        assert report.requested == CaptureSettings() and report.mismatches() == []
+        assert (report.granted.width, report.granted.height, report.granted.fps) == (160, 120, 25.0)
+        print(f"  ✓ File opened with its own mode: {report.summary()}")
+
+        cap, report = open_capture(os.path.join(tmp, "missing.avi"))
+        assert not cap.isOpened() and report.granted == CaptureSettings()
+        print("  ✓ Missing source reported as not opened")
+
+    assert fourcc_to_str(cv2.VideoWriter_fourcc(*"MJPG")) == "MJPG" and fourcc_to_str(0) == ""
+    assert parse_size("1280X720") == (1280, 720)
+    try:
+        parse_size("720p")
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    print("  ✓ fourcc and size parsing")
+
+
+def main():
+    """Run all tests"""
+    print("Capture Settings Test Suite")
+    print("=" * 50)
+
+    try:
+        test_negotiation()
+        test_files_and_helpers()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Test script for the adaptive model-complexity governor
+
+This script tests:
+1. Stepping down when inference exceeds the budget, and up with headroom
+2. Hysteresis: cooldown, window refill and back-off for a level that was too slow
+"""
+
+from complexity_governor import DEFAULT_LADDER, SCALED_LADDER, ComplexityGovernor, Level
+from stage_timer import StageTimer
+
+
+class FakeDetector:
+    """Records the settings the governor applies."""
+
+    def __init__(self, model_complexity=1):
+        self.settings = {"model_complexity": model_complexity}
+        self.input_scale = 1.0
+        self.rebuilds = 0
+
+    def set_model_complexity(self, model_complexity):
+        if model_complexity != self.settings["model_complexity"]:
+            self.rebuilds += 1
+        self.settings["model_complexity"] = model_complexity
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def feed(governor, clock, ms, frames, dt=1 / 30):
+    for _ in range(frames):
+        clock.now += dt
+        governor.observe(ms / 1000.0)
+
+
+def test_step_down_and_up():
+    """Test switching in both directions"""
+    print("=== Testing Step Down and Up ===")
+
+    clock, detector, timer = FakeClock(), FakeDetector(1), StageTimer()
+    gov = ComplexityGovernor(detector, target_fps=30, window=10, cooldown_s=1.0, retry_after_s=2.0,
+                             clock=clock, timer=timer)
+    assert gov.level == Level(1) and abs(gov.budget_s - 0.02) < 1e-9
+
+    feed(gov, clock, 35.0, 40)  # 35 ms median vs a 20 ms budget
+    assert gov.level == Level(0) and detector.settings["model_complexity"] == 0
+    assert len(gov.switches) == 1 and gov.switches[0]["reason"] == "over budget"
+    assert timer.info["model_level"] == Level(0).label
+    print("  ✓ Over budget: complexity 1 -> 0")
+
+    feed(gov, clock, 5.0, 70)  # well under half the budget, past the 2 s retry back-off
+    assert gov.level == Level(1) and gov.switches[-1]["reason"] == "headroom"
+    print("  ✓ Headroom: complexity 0 -> 1")
+
+    scaled = ComplexityGovernor(FakeDetector(0), target_fps=30, ladder=SCALED_LADDER,
+                                window=10, cooldown_s=0.0, clock=clock)
+    feed(scaled, clock, 50.0, 25)
+    assert scaled.level == Level(0, 0.5) and scaled.detector.input_scale == 0.5
+    print("  ✓ Scaled ladder drops input resolution below complexity 0")
+
+
+def test_hysteresis():
+    """Test that the governor does not flap between levels"""
+    print("\n=== Testing Hysteresis ===")
+
+    clock, detector = FakeClock(), FakeDetector(1)
+    gov = ComplexityGovernor(detector, target_fps=30, ladder=DEFAULT_LADDER, window=10,
+                             cooldown_s=1.0, retry_after_s=10.0, clock=clock)
+
+    # Between the step-up threshold and the budget: stay put
+    feed(gov, clock, 15.0, 100)
+    assert gov.level == Level(1) and not gov.switches
+    print("  ✓ No switch inside the hysteresis band")
+
+    # Complexity 2 turns out too slow: back to 1, and 2 is not retried right away
+    feed(gov, clock, 5.0, 40)
+    assert gov.level == Level(2)
+    feed(gov, clock, 30.0, 20)
+    assert gov.level == Level(1)
+    feed(gov, clock, 5.0, 150)  # 5 s of headroom, less than retry_after_s
+    assert gov.level == Level(1)
+    feed(gov, clock, 5.0, 200)
+    assert gov.level == Level(2)
+    print(f"  ✓ Slow level retried only after back-off ({len(gov.switches)} switches)")
+
+    # Window refill: a single slow frame right after the cooldown does not switch
+    feed(gov, clock, 5.0, 5)
+    assert gov.level == Level(2)
+    print("  ✓ Decisions wait for a full window")
+
+
+def main():
+    """Run all tests"""
+    print("Complexity Governor Test Suite")
+    print("=" * 50)
+
+    try:
+        test_step_down_and_up()
+        test_hysteresis()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Test script for the reusable conversion buffers
+
+This script tests:
+1. RGB conversion and resize match cv2 and reuse the same array
+2. New shapes allocate, and only max_entries shapes are kept
+"""
+
+import cv2
+import numpy as np
+
+from frame_buffers import FrameBuffers
+
+
+def frame(h=120, w=160, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+
+def test_conversions_reuse_memory():
+    """Test that conversions match cv2 and write into the same buffer"""
+    print("=== Testing Conversions ===")
+
+    buffers = FrameBuffers()
+    rgb = buffers.bgr_to_rgb(frame())
+    assert np.array_equal(rgb, cv2.cvtColor(frame(), cv2.COLOR_BGR2RGB))
+    rgb.flags.writeable = False  # as PoseDetector.process leaves it during inference
+    again = buffers.bgr_to_rgb(frame(seed=1))
+    assert again is rgb and np.array_equal(again, cv2.cvtColor(frame(seed=1), cv2.COLOR_BGR2RGB))
+    print("  ✓ BGR -> RGB into one reused array")
+
+    small = buffers.resize(frame(), 0.5)
+    assert small.shape == (60, 80, 3)
+    assert np.array_equal(small, cv2.resize(frame(), (80, 60), interpolation=cv2.INTER_AREA))
+    assert buffers.resize(frame(seed=2), 0.5) is small
+    crop = frame()[10:70, 20:100]  # non-contiguous, like an ROI crop
+    assert np.array_equal(buffers.bgr_to_rgb(crop), cv2.cvtColor(np.ascontiguousarray(crop), cv2.COLOR_BGR2RGB))
+    assert buffers.allocations == 3
+    print(f"  ✓ Resize reused too ({buffers.allocations} allocations in total)")
+
+
+def test_shapes_and_eviction():
+    """Test allocation on new shapes and the entry limit"""
+    print("\n=== Testing Shapes and Eviction ===")
+
+    buffers = FrameBuffers(max_entries=2)
+    first = buffers.bgr_to_rgb(frame(120, 160))
+    buffers.bgr_to_rgb(frame(90, 90))
+    assert buffers.bgr_to_rgb(frame(120, 160)) is first
+    print("  ✓ Each shape keeps its own buffer")
+
+    buffers.bgr_to_rgb(frame(64, 64))  # evicts the least recently used (90x90)
+    assert len(buffers._arrays) == 2
+    assert buffers.bgr_to_rgb(frame(120, 160)) is first
+    before = buffers.allocations
+    buffers.bgr_to_rgb(frame(90, 90))
+    assert buffers.allocations == before + 1
+    print("  ✓ Least recently used shape dropped beyond max_entries")
+
+
+def main():
+    """Run all tests"""
+    print("Frame Buffers Test Suite")
+    print("=" * 50)
+
+    try:
+        test_conversions_reuse_memory()
+        test_shapes_and_eviction()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
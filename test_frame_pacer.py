@@ -0,0 +1,158 @@
+"""
+Test script for display pacing and non-blocking key polling
+
+This script tests:
+1. The render schedule: fixed rate, no catch-up bursts, 0 = every frame
+2. Serial and pipelined loops render at the pacer's rate and keep the
+   '1'/'2'/'3'/'q' keys working
+3. Video files play at their frame rate in both loops
+"""
+
+import contextlib
+import io
+import time
+import types
+
+import numpy as np
+
+import main as app
+from feedback import FeedbackEngine
+from frame_pacer import FramePacer
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_schedule():
+    """Test when renders are due"""
+    print("=== Testing Schedule ===")
+
+    clock = FakeClock()
+    pacer = FramePacer(target_fps=50.0, clock=clock)  # every 20 ms
+    due = []
+    for _ in range(10):  # analysis at 200 fps
+        due.append(pacer.due())
+        clock.t += 0.005
+    assert due == [True, False, False, False, True, False, False, False, True, False]
+    assert pacer.rendered == 3 and pacer.skipped == 7
+    print("  ✓ 200 fps analysis rendered at 50 fps")
+
+    assert abs(pacer.time_to_next() - 0.01) < 1e-9
+    clock.t += 0.5  # long stall
+    assert pacer.due() and not pacer.due() and pacer.time_to_next() > 0.019
+    print("  ✓ No burst of catch-up renders after a stall")
+
+    every = FramePacer(target_fps=0, clock=clock)
+    assert all(every.due() for _ in range(5)) and every.time_to_next() == 0.0
+    print("  ✓ target_fps=0 renders every frame")
+
+
+class FakeCapture:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def read(self):
+        if self.frames <= 0:
+            return False, None
+        self.frames -= 1
+        return True, np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+class FakeDetector:
+    def process(self, frame, timestamp_s=None):
+        return types.SimpleNamespace(pose_landmarks=None)
+
+    def get_landmarks(self, frame, results):
+        return None
+
+    def draw(self, frame, results):
+        pass
+
+
+class ScriptedPacer(FramePacer):
+    """Renders every other frame and plays back a key sequence."""
+
+    def __init__(self, keys):
+        super().__init__(target_fps=0)
+        self.keys = list(keys)
+        self.polls = 0
+        self._tick = 0
+
+    def due(self):
+        self._tick += 1
+        return self._tick % 2 == 1
+
+    def time_to_next(self):
+        return 0.0
+
+    def poll_key(self):
+        self.polls += 1
+        return self.keys.pop(0) if self.keys else 0xFF
+
+
+def run_loop(runner, frames, keys, **kwargs):
+    shown, exercises = [], []
+    pacer = ScriptedPacer(keys)
+    original = (app.cv2.imshow, app.draw_overlay)
+    app.cv2.imshow = lambda name, frame: shown.append(frame)
+    app.draw_overlay = lambda frame, angles, exercise, *rest: exercises.append(exercise)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runner(FakeCapture(frames), FakeDetector(), FeedbackEngine(), {}, "Squat", pacer=pacer, **kwargs)
+    finally:
+        app.cv2.imshow, app.draw_overlay = original
+    return shown, exercises, pacer
+
+
+def test_loops():
+    """Test rendering and key handling in both interactive loops"""
+    print("\n=== Testing Interactive Loops ===")
+
+    keys = [0xFF, ord('3'), 0xFF, 0xFF, ord('2'), 0xFF, ord('1')]
+    shown, exercises, pacer = run_loop(app.run_serial, 10, keys)
+    assert pacer.polls == 10 and len(shown) == 5
+    assert exercises == ["Squat", "BicepCurl", "BicepCurl", "Plank", "Squat"]
+    print("  ✓ Serial: keys polled every frame, every other frame rendered, modes switch")
+
+    shown, exercises, pacer = run_loop(app.run_serial, 100, [0xFF, ord('q')])
+    assert pacer.polls == 2
+    print("  ✓ Serial: 'q' quits")
+
+    shown, exercises, pacer = run_loop(app.run_pipelined, 10 ** 9, [0xFF] * 3 + [ord('2')] + [0xFF] * 20 + [ord('q')])
+    assert shown and pacer.polls == 25
+    assert exercises[0] == "Squat" and exercises[-1] == "Plank"
+    print(f"  ✓ Pipelined: {len(shown)} renders, mode switch and quit")
+
+    for runner in (app.run_serial, app.run_pipelined):
+        start = time.perf_counter()
+        shown, _, _ = run_loop(runner, 10, [], pace_fps=100.0)
+        took = time.perf_counter() - start
+        assert took >= 0.09 and shown, took
+        print(f"  ✓ {runner.__name__}: 10 video frames at 100 fps played in {took * 1000:.0f} ms")
+
+
+def main():
+    """Run all tests"""
+    print("Frame Pacer Test Suite")
+    print("=" * 50)
+
+    try:
+        test_schedule()
+        test_loops()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
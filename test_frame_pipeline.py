@@ -0,0 +1,134 @@
+"""
+Test script for the threaded capture / inference pipeline
+
+This script tests:
+1. LatestQueue evicts the oldest item instead of blocking
+2. Frames flow through to results, then the end-of-stream marker
+3. Exceptions in capture or inference are re-raised by get()
+4. stop() reports a thread that is still busy
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+from frame_pipeline import FramePipeline, LatestQueue
+
+
+def frames(count):
+    """read_frame over ``count`` small frames at ~200 fps, then end of stream"""
+    it = iter(range(count))
+
+    def read_frame():
+        time.sleep(0.005)  # paced like a camera, so inference sees frames
+        i = next(it, None)
+        return None if i is None else np.full((4, 4, 3), i, dtype=np.uint8)
+    return read_frame
+
+
+def drain(pipeline, timeout=5.0):
+    out = []
+    while True:
+        item = pipeline.get(timeout=timeout)
+        if item is None:
+            return out
+        out.append(item)
+
+
+def test_latest_queue():
+    """Test the single-slot hand-off"""
+    print("=== Testing LatestQueue ===")
+
+    q = LatestQueue(maxsize=1)
+    q.put(1)
+    q.put(2)
+    assert q.get(timeout=0) == 2 and q.dropped == 1
+    try:
+        q.get(timeout=0.01)
+        raise AssertionError("expected queue.Empty")
+    except queue.Empty:
+        pass
+    print("  ✓ Newest item wins, dropped items are counted")
+
+
+def test_results():
+    """Test results and the end of the stream"""
+    print("\n=== Testing Results ===")
+
+    pipeline = FramePipeline(frames(20), lambda frame: int(frame[0, 0, 0])).start()
+    try:
+        results = drain(pipeline)
+    finally:
+        assert pipeline.stop()
+    assert results and all(int(frame[0, 0, 0]) == payload for _, frame, payload in results)
+    assert [p for _, _, p in results] == sorted(p for _, _, p in results)
+    print(f"  ✓ {len(results)} results in capture order, then None")
+
+
+def test_errors():
+    """Test that a failing stage ends the stream with its exception"""
+    print("\n=== Testing Errors ===")
+
+    def infer(frame):
+        raise ValueError("bad frame")
+
+    def unplugged():
+        raise OSError("camera unplugged")
+
+    for name, read_frame, infer_fn in (("inference", frames(100), infer),
+                                       ("capture", unplugged, lambda frame: None)):
+        pipeline = FramePipeline(read_frame, infer_fn).start()
+        try:
+            drain(pipeline)
+            raise AssertionError("expected the stage's exception")
+        except (ValueError, OSError) as e:
+            assert str(e) in ("bad frame", "camera unplugged")
+        finally:
+            assert pipeline.stop()
+        print(f"  ✓ Exception in {name} re-raised by get()")
+
+
+def test_stop_busy():
+    """Test that stop() reports a thread stuck in infer()"""
+    print("\n=== Testing Stop ===")
+
+    release = threading.Event()
+    entered = threading.Event()
+
+    def infer(frame):
+        entered.set()
+        release.wait()
+
+    pipeline = FramePipeline(frames(100), infer).start()
+    assert entered.wait(timeout=5.0)
+    assert not pipeline.stop(timeout=0.05)
+    print("  ✓ stop() returns False while inference is still running")
+    release.set()
+    assert pipeline.stop(timeout=None)
+    print("  ✓ stop() returns True once both threads have exited")
+
+
+def main():
+    """Run all tests"""
+    print("Frame Pipeline Test Suite")
+    print("=" * 50)
+
+    try:
+        test_latest_queue()
+        test_results()
+        test_errors()
+        test_stop_busy()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Test script for the cached HUD renderer and the polyline skeleton
+
+This script tests:
+1. HudRenderer output matches the immediate-mode HUD over a changing session
+2. Unchanged frames reuse the composed panels; changed lines redraw in place
+3. draw_skeleton matches per-bone cv2.line / per-joint cv2.circle drawing
+"""
+
+import cv2
+import numpy as np
+
+from hud_renderer import HudRenderer, draw_hud_direct
+from landmarks import NUM_LANDMARKS, POSE_CONNECTIONS
+from pose_detector import draw_skeleton
+
+
+def session(i):
+    """HUD arguments for frame i, switching from squats to a plank halfway."""
+    knee = 95.0 + 75.0 * np.cos(i / 9.0)
+    if i < 60:
+        return ({"Knee": knee, "Hip": float("nan") if i % 5 == 0 else knee + 3.0, "Back": 170.0},
+                "Squat", "down" if knee < 100 else "up", knee > 90,
+                "Good form" if knee > 90 else "Go lower and keep your back straight", i // 20, None)
+    return ({"Hip": knee, "Back": 171.0}, "Plank", "hold", True, "", 0,
+            (i / 30.0, 40.0, i % 3 == 0, knee if i % 4 else None, 169.9))
+
+
+def test_matches_direct():
+    """Test pixel parity with draw_hud_direct"""
+    print("=== Testing Parity ===")
+
+    renderer = HudRenderer()
+    rng = np.random.default_rng(0)
+    for size in ((480, 640), (120, 160)):  # the small frame clips and overlaps both panels
+        exact = True
+        for i in range(120):
+            camera = rng.integers(0, 256, size + (3,), dtype=np.uint8)
+            expected, actual = camera.copy(), camera.copy()
+            draw_hud_direct(expected, *session(i))
+            renderer.draw(actual, *session(i))
+            diff = np.abs(expected.astype(np.int16) - actual).max()
+            # Overlapping plank lines are blended from coverage: off by at most one level
+            assert diff <= 1 and (diff == 0 or session(i)[1] == "Plank"), (size, i, diff)
+            exact &= diff == 0
+        print(f"  ✓ {size[1]}x{size[0]}: 120 frames match{' exactly' if exact else ' (within 1 level)'}")
+
+
+def test_caching():
+    """Test that unchanged HUDs cost no redraws"""
+    print("\n=== Testing Caching ===")
+
+    renderer = HudRenderer()
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    renderer.draw(frame, *session(0))
+    tiles, composed, redrawn = renderer.tiles_rendered, renderer.panels_composed, renderer.lines_redrawn
+    for _ in range(10):
+        renderer.draw(frame, *session(0))
+    assert (renderer.tiles_rendered, renderer.panels_composed, renderer.lines_redrawn) == (tiles, composed, redrawn)
+    print("  ✓ Repeated HUD: no tiles rendered, nothing recomposed")
+
+    args = list(session(0))
+    args[5] = 7  # only the rep count changes
+    renderer.draw(frame, *args)
+    assert renderer.tiles_rendered == tiles + 1 and renderer.lines_redrawn == redrawn + 1
+    assert renderer.panels_composed == composed
+    renderer.draw(frame, *session(0))
+    assert renderer.tiles_rendered == tiles + 1  # "Reps: 0" still cached
+    print("  ✓ One changed line: one tile, redrawn in place")
+
+
+def test_skeleton():
+    """Test the polyline skeleton against per-element drawing"""
+    print("\n=== Testing Skeleton ===")
+
+    rng = np.random.default_rng(1)
+    data = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    data[:, 0] = rng.uniform(100, 540, NUM_LANDMARKS)
+    data[:, 1] = rng.uniform(50, 430, NUM_LANDMARKS)
+    data[:, 3] = rng.uniform(0.2, 1.0, NUM_LANDMARKS)
+    data[5] = np.nan  # missing landmark
+
+    expected = np.zeros((480, 640, 3), dtype=np.uint8)
+    with np.errstate(invalid="ignore"):
+        visible = data[:, 3] >= 0.5
+    pts = np.nan_to_num(np.round(data[:, :2])).astype(np.int32)
+    for a, b in POSE_CONNECTIONS:
+        if visible[a] and visible[b]:
+            cv2.line(expected, tuple(int(v) for v in pts[a]), tuple(int(v) for v in pts[b]), (0, 255, 0), 2)
+    for x, y in pts[visible]:
+        cv2.circle(expected, (int(x), int(y)), 3, (0, 0, 255), -1)
+
+    actual = np.zeros_like(expected)
+    draw_skeleton(actual, data)
+    assert np.array_equal(actual, expected)
+    print("  ✓ Same pixels as cv2.line/cv2.circle per bone and joint")
+
+    nothing = np.zeros_like(expected)
+    draw_skeleton(nothing, np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32))
+    assert not nothing.any()
+    print("  ✓ No visible landmarks draws nothing")
+
+
+def main():
+    """Run all tests"""
+    print("HUD Renderer Test Suite")
+    print("=" * 50)
+
+    try:
+        test_matches_direct()
+        test_caching()
+        test_skeleton()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
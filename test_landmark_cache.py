@@ -0,0 +1,89 @@
+"""
+Test script for the on-disk trainer video landmark cache
+
+This script tests:
+1. Cache keys change with video content and detector settings
+2. Stored landmark arrays load back memory-mapped and unchanged
+3. A cache hit skips pose inference entirely
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from landmark_cache import cache_key, load_cached_landmarks, load_or_extract_landmarks, store_landmarks
+
+
+SETTINGS = dict(model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+
+def _write_fake_video(path: str, payload: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
+def test_cache_keys():
+    """Test that keys depend on content and settings"""
+    print("=== Testing Cache Keys ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "trainer.mp4")
+        _write_fake_video(video, b"frame-data-1")
+        key = cache_key(video, SETTINGS)
+
+        assert cache_key(video, dict(SETTINGS)) == key
+        assert cache_key(video, dict(SETTINGS, model_complexity=2)) != key
+        _write_fake_video(video, b"frame-data-2")
+        assert cache_key(video, SETTINGS) != key
+        print(f"  ✓ Key {key} changes with settings and content")
+
+
+def test_store_and_hit():
+    """Test round trip and that a hit never builds a detector"""
+    print("\n=== Testing Store / Load ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "trainer.mp4")
+        cache_dir = os.path.join(tmp, "cache")
+        _write_fake_video(video, b"frame-data")
+
+        series = np.random.rand(120, 33, 4).astype(np.float32)
+        series[5] = np.nan  # frame without a pose
+        key = cache_key(video, SETTINGS)
+        store_landmarks(key, series, cache_dir=cache_dir)
+
+        loaded = load_cached_landmarks(key, cache_dir)
+        assert isinstance(loaded, np.memmap)
+        assert np.array_equal(np.nan_to_num(loaded, nan=-1), np.nan_to_num(series, nan=-1))
+        print(f"  ✓ Loaded {loaded.shape} memory-mapped")
+
+        def no_detector():
+            raise AssertionError("cache hit must not build a detector")
+
+        hit = load_or_extract_landmarks(video, SETTINGS, detector_factory=no_detector, cache_dir=cache_dir)
+        assert hit.shape == series.shape
+        print("  ✓ Cache hit skipped inference")
+        del loaded, hit
+
+
+def main():
+    """Run all tests"""
+    print("Landmark Cache Test Suite")
+    print("=" * 50)
+
+    try:
+        test_cache_keys()
+        test_store_and_hit()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Test script for the array-backed LandmarkFrame
+
+This script tests:
+1. Dict-style and attribute access on a LandmarkFrame
+2. Missing landmarks (NaN rows) behave like absent dict keys
+3. FeedbackEngine and BicepCurlExercise give the same angles for a frame and a dict
+4. Analysis modules import without cv2 or MediaPipe
+"""
+
+import math
+import subprocess
+import sys
+
+import numpy as np
+
+from landmarks import LandmarkFrame, LandmarkPoint, LANDMARK_INDEX, NUM_LANDMARKS, as_landmark_array
+from feedback import FeedbackEngine
+from bicep_curl_exercise import BicepCurlExercise
+
+
+def create_test_landmarks(elbow_angle: float):
+    """Create a dict of landmarks forming the given left elbow angle"""
+    angle_rad = math.radians(elbow_angle)
+    return {
+        "LEFT_SHOULDER": LandmarkPoint(100.0, 100.0, 0.0, 0.9),
+        "LEFT_ELBOW": LandmarkPoint(200.0, 100.0, 0.0, 0.9),
+        "LEFT_WRIST": LandmarkPoint(200.0 + 100 * math.cos(angle_rad - math.pi / 2),
+                                    100.0 + 100 * math.sin(angle_rad - math.pi / 2), 0.0, 0.9),
+    }
+
+
+def test_frame_access():
+    """Test mapping and attribute access"""
+    print("=== Testing LandmarkFrame Access ===")
+
+    data = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+    data[LANDMARK_INDEX["LEFT_ELBOW"]] = (10.0, 20.0, -0.5, 0.8)
+    frame = LandmarkFrame(data)
+
+    assert "LEFT_ELBOW" in frame
+    assert "RIGHT_ELBOW" not in frame
+    assert frame.get("RIGHT_ELBOW") is None
+    assert list(frame.keys()) == ["LEFT_ELBOW"]
+    assert frame["LEFT_ELBOW"].x == 10.0 and frame.LEFT_ELBOW.y == 20.0
+    assert frame.point_xy("LEFT_ELBOW") == (10.0, 20.0)
+    print(f"  {frame!r}: LEFT_ELBOW={frame.LEFT_ELBOW}")
+
+    try:
+        frame.LEFT_ELBOW = None
+        print("  ✗ Attribute assignment should fail")
+    except AttributeError:
+        print("  ✓ Frame is read-only")
+    assert not frame.array.flags.writeable
+
+
+def test_consumers_accept_frame():
+    """Test that analysis code gives the same result for a frame and a dict"""
+    print("\n=== Testing Consumers With LandmarkFrame ===")
+
+    engine = FeedbackEngine()
+    bicep = BicepCurlExercise()
+    for angle in [30.0, 90.0, 160.0]:
+        lms = create_test_landmarks(angle)
+        frame = LandmarkFrame(as_landmark_array(lms))
+
+        dict_angles = engine.compute_all_angles(lms)
+        frame_angles = engine.compute_all_angles(frame)
+        dict_elbow = bicep.calculate_elbow_angle(lms)
+        frame_elbow = bicep.calculate_elbow_angle(frame)
+
+        assert abs(dict_angles["Elbow"] - frame_angles["Elbow"]) < 1e-3
+        assert math.isnan(frame_angles["Knee"])
+        assert abs(dict_elbow - frame_elbow) < 1e-3
+        print(f"  {angle:5.1f}°: dict={dict_elbow:.2f}°, frame={frame_elbow:.2f}° ✓")
+
+
+def test_analysis_imports_stay_light():
+    """Test that landmark types and analysis code do not pull in inference libraries"""
+    print("\n=== Testing Lightweight Imports ===")
+
+    modules = "landmarks, angle_utils, feedback, rep_counter, bicep_curl_exercise, landmark_recording, pose_detector"
+    code = (f"import sys; import {modules}; "
+            "print(','.join(m for m in ('cv2', 'mediapipe', 'tensorflow') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    loaded = out.stdout.strip()
+    assert loaded == "", f"heavy modules imported: {loaded}"
+    print("  ✓ No cv2/mediapipe/tensorflow until a PoseDetector is built")
+
+
+def main():
+    """Run all tests"""
+    print("LandmarkFrame Test Suite")
+    print("=" * 50)
+
+    try:
+        test_frame_access()
+        test_consumers_accept_frame()
+        test_analysis_imports_stay_light()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Test script for mirroring in landmark space
+
+This script tests:
+1. Coordinate mapping, LEFT/RIGHT swap and round trip
+2. Angles and reps match the flipped-frame pose
+3. The display-only flip in main.MirrorView
+"""
+
+import contextlib
+import io
+
+import cv2
+import numpy as np
+
+import main as app
+from feedback import FeedbackEngine
+from landmarks import LANDMARK_INDEX, NUM_LANDMARKS, LandmarkFrame, mirror_landmarks
+from rep_counter import RepCounter
+
+
+WIDTH = 640.0
+
+
+def curl_pose(angle_deg, flipped=False):
+    """Left arm curling to angle_deg; the right arm is out of view.
+
+    With ``flipped`` the pose is built directly as it appears in the
+    horizontally flipped frame: x mirrored and the arms' names swapped.
+    """
+    data = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+    data[:, 2:] = (0.0, 0.9)
+    a = np.radians(angle_deg)
+    left = {"SHOULDER": (400.0, 200.0), "ELBOW": (400.0, 320.0)}
+    left["WRIST"] = tuple(np.array(left["ELBOW"]) + 120.0 * np.array([np.sin(a), -np.cos(a)]))
+    side = "RIGHT" if flipped else "LEFT"
+    for joint, (x, y) in left.items():
+        data[LANDMARK_INDEX[f"{side}_{joint}"], :2] = (WIDTH - x if flipped else x, y)
+    return LandmarkFrame(data)
+
+
+def test_mapping():
+    """Test the landmark-space mirror itself"""
+    print("=== Testing Mapping ===")
+
+    rng = np.random.default_rng(0)
+    data = rng.uniform(0, WIDTH, (NUM_LANDMARKS, 4)).astype(np.float32)
+    lms = LandmarkFrame(data)
+    mirrored = mirror_landmarks(lms, WIDTH)
+    pairs = (("LEFT_WRIST", "RIGHT_WRIST"), ("RIGHT_HIP", "LEFT_HIP"), ("MOUTH_LEFT", "MOUTH_RIGHT"), ("NOSE", "NOSE"))
+    for name, other in pairs:
+        assert np.isclose(mirrored[name].x, WIDTH - lms[other].x)
+        assert mirrored[name].y == lms[other].y and mirrored[name].visibility == lms[other].visibility
+    print("  ✓ x -> width - x with left/right swapped")
+
+    assert np.allclose(mirror_landmarks(mirrored, WIDTH).array, data, atol=1e-4)
+    assert np.array_equal(lms.array, data)  # input untouched
+    print("  ✓ Mirroring twice is the identity")
+
+    assert mirror_landmarks(None, WIDTH) is None
+    assert mirror_landmarks(LandmarkFrame(data, predicted=True), WIDTH).predicted
+    print("  ✓ None passes through, predicted flag kept")
+
+
+def test_angles_and_reps():
+    """Test that angles and reps equal those of the flipped-frame pose"""
+    print("\n=== Testing Angles and Reps ===")
+
+    engine = FeedbackEngine()
+    for angle in (170, 90, 30):
+        mirrored = engine.compute_all_angles(mirror_landmarks(curl_pose(angle), WIDTH))
+        flipped = engine.compute_all_angles(curl_pose(angle, flipped=True))
+        assert mirrored.keys() == flipped.keys()
+        assert all(np.isclose(mirrored[k], flipped[k]) or (np.isnan(mirrored[k]) and np.isnan(flipped[k]))
+                   for k in mirrored)
+    print("  ✓ Joint angles identical to the flipped-frame pose")
+
+    angles = [170, 120, 60, 20, 60, 120, 170] * 3
+    counts = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for make in (lambda a: mirror_landmarks(curl_pose(a), WIDTH), lambda a: curl_pose(a, flipped=True)):
+            reps, refs = RepCounter("BicepCurl"), {}
+            for a in angles:
+                app.analyze_frame("BicepCurl", make(a), engine, refs, reps, now=0.0)
+            counts.append(reps.count)
+    assert counts[0] == counts[1] == 3
+    print(f"  ✓ {counts[0]} reps either way")
+
+
+def test_display_flip():
+    """Test that MirrorView flips for display into a reused buffer"""
+    print("\n=== Testing Display Flip ===")
+
+    view = app.MirrorView()
+    frame = np.random.default_rng(1).integers(0, 255, (120, 160, 3), dtype=np.uint8)
+    shown = view.display(frame)
+    assert np.array_equal(shown, cv2.flip(frame, 1))
+    assert view.display(frame) is shown
+    assert np.array_equal(frame[:, 0], shown[:, -1])
+    print("  ✓ Display buffer flipped and reused")
+
+    lms = view.landmarks(curl_pose(90), frame)
+    assert np.isclose(lms["RIGHT_SHOULDER"].x, 160 - 400.0)
+    print("  ✓ Landmarks mirrored across the frame width")
+
+
+def main():
+    """Run all tests"""
+    print("Landmark Mirror Test Suite")
+    print("=" * 50)
+
+    try:
+        test_mapping()
+        test_angles_and_reps()
+        test_display_flip()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
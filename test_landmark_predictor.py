@@ -0,0 +1,106 @@
+"""
+Test script for landmark prediction between detections
+
+This script tests:
+1. Constant-velocity extrapolation, the horizon clamp and track resets
+2. Predicted frames are flagged and skipped by rep counting
+"""
+
+import contextlib
+import io
+import pickle
+
+import numpy as np
+
+import main as app
+from feedback import FeedbackEngine
+from landmarks import LANDMARK_INDEX, NUM_LANDMARKS, LandmarkFrame
+from landmark_predictor import LandmarkPredictor
+from rep_counter import RepCounter
+
+
+def moving_frame(t, vx=100.0):
+    """All landmarks moving right at vx pixels per second."""
+    data = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    data[:, 0] = 50.0 + vx * t
+    data[:, 1] = np.arange(NUM_LANDMARKS) * 10.0
+    data[:, 3] = 0.9
+    return LandmarkFrame(data)
+
+
+def test_prediction():
+    """Test extrapolation between measurements"""
+    print("=== Testing Prediction ===")
+
+    predictor = LandmarkPredictor(smoothing=1.0, max_horizon=0.2)
+    assert predictor.predict(0.0) is None
+    predictor.update(0.0, moving_frame(0.0))
+    predictor.update(0.1, moving_frame(0.1))
+
+    pred = predictor.predict(0.15)
+    assert pred.predicted and not moving_frame(0.0).predicted
+    assert np.allclose(pred.array[:, 0], moving_frame(0.15).array[:, 0], atol=1e-3)
+    assert np.allclose(pred.array[:, 1], moving_frame(0.15).array[:, 1])
+    print("  ✓ Constant velocity extrapolated to the display time")
+
+    far = predictor.predict(5.0)
+    assert np.allclose(far.array[:, 0], 50.0 + 100.0 * 0.3, atol=1e-3)
+    print("  ✓ Extrapolation clamped to max_horizon")
+
+    predictor.update(0.2, None)
+    assert not predictor.ready and predictor.predict(0.25) is None
+    print("  ✓ Lost pose resets the track")
+
+    restored = pickle.loads(pickle.dumps(pred))
+    assert restored.predicted and "predicted" in repr(restored)
+    print("  ✓ Flag survives pickling")
+
+
+def test_reps_on_measured_frames_only():
+    """Test that analyze_frame ignores predicted frames for rep counting"""
+    print("\n=== Testing Reps on Measured Frames ===")
+
+    shoulder, elbow = np.array([300.0, 200.0]), np.array([300.0, 320.0])
+
+    def curl_frame(angle_deg, predicted):
+        data = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+        data[:, 2:] = (0.0, 0.9)
+        a = np.radians(angle_deg)
+        wrist = elbow + 120.0 * np.array([np.sin(a), -np.cos(a)])
+        for name, xy in (("LEFT_SHOULDER", shoulder), ("LEFT_ELBOW", elbow), ("LEFT_WRIST", wrist)):
+            data[LANDMARK_INDEX[name], :2] = xy
+        return LandmarkFrame(data, predicted=predicted)
+
+    engine, refs = FeedbackEngine(), {}
+    angles = [170, 120, 60, 20, 60, 120, 170] * 2
+    with contextlib.redirect_stdout(io.StringIO()):
+        measured = RepCounter("BicepCurl")
+        for a in angles:
+            app.analyze_frame("BicepCurl", curl_frame(a, False), engine, refs, measured, now=0.0)
+        predicted = RepCounter("BicepCurl")
+        for a in angles:
+            app.analyze_frame("BicepCurl", curl_frame(a, True), engine, refs, predicted, now=0.0)
+    assert measured.count == 2 and predicted.count == 0
+    print(f"  ✓ {measured.count} reps from measured frames, none from predicted ones")
+
+
+def main():
+    """Run all tests"""
+    print("Landmark Predictor Test Suite")
+    print("=" * 50)
+
+    try:
+        test_prediction()
+        test_reps_on_measured_frames_only()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
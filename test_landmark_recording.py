@@ -0,0 +1,124 @@
+"""
+Test script for landmark recording and replay
+
+This script tests:
+1. Recordings round-trip timestamps, landmarks and no-pose frames
+2. Corrupt files are rejected
+3. Replaying a recorded curl session counts reps without pose inference
+"""
+
+import contextlib
+import io
+import math
+import os
+import tempfile
+
+import numpy as np
+
+from landmark_recording import LandmarkRecorder, iter_recording, load_recording
+from landmarks import LANDMARK_INDEX, NUM_LANDMARKS, LandmarkFrame
+
+
+def _curl_frame(elbow_angle: float) -> np.ndarray:
+    """Left arm landmarks with the given elbow angle"""
+    data = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+    a = math.radians(elbow_angle)
+    data[LANDMARK_INDEX["LEFT_SHOULDER"]] = (300, 200, 0, 0.9)
+    data[LANDMARK_INDEX["LEFT_ELBOW"]] = (300, 320, 0, 0.9)
+    data[LANDMARK_INDEX["LEFT_WRIST"]] = (300 + 120 * math.sin(a), 320 - 120 * math.cos(a), 0, 0.9)
+    return data
+
+
+def test_round_trip():
+    """Test writing and reading a recording"""
+    print("=== Testing Recording Round Trip ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.lmrec")
+        frame = _curl_frame(90)
+        with LandmarkRecorder(path) as rec:
+            rec.write(0.0, LandmarkFrame(frame))
+            rec.write(0.033, None)
+            rec.write(0.066, frame)
+
+        timestamps, landmarks = load_recording(path)
+        assert np.allclose(timestamps, [0.0, 0.033, 0.066])
+        assert landmarks.shape == (3, NUM_LANDMARKS, 4)
+        assert np.array_equal(landmarks[0], frame, equal_nan=True)
+        assert np.isnan(landmarks[1]).all()
+
+        replayed = list(iter_recording(path))
+        assert replayed[1][1] is None
+        assert replayed[2][1].point_xy("LEFT_ELBOW") == (300.0, 320.0)
+        print(f"  ✓ {len(replayed)} frames replayed ({os.path.getsize(path)} bytes)")
+
+        with open(path, "ab") as f:
+            f.write(b"\0" * 100)  # killed mid-write: a partial fourth record
+        for mmap in (False, True):
+            timestamps, landmarks = load_recording(path, mmap=mmap)
+            assert len(timestamps) == 3 and landmarks.shape == (3, NUM_LANDMARKS, 4)
+        with open(path, "r+b") as f:
+            f.truncate(16 + 50)  # header and part of the first record
+        assert len(load_recording(path, mmap=True)[0]) == 0
+        print("  ✓ Partial trailing record dropped (fromfile and memmap)")
+
+        bad = os.path.join(tmp, "bad.lmrec")
+        with open(bad, "wb") as f:
+            f.write(b"not a recording at all")
+        try:
+            load_recording(bad)
+            raise AssertionError("corrupt file accepted")
+        except ValueError as e:
+            print(f"  ✓ Rejected corrupt file: {e}")
+
+
+def test_replay_counts_reps():
+    """Test rep counting over a replayed session"""
+    print("\n=== Testing Replay Rep Counting ===")
+
+    import main as app
+    from bicep_curl_exercise import BicepCurlExercise
+    from feedback import FeedbackEngine
+    from rep_counter import RepCounter
+
+    curls = 4
+    angles = [170, 120, 60, 20, 60, 120] * curls + [170]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "curls.lmrec")
+        with LandmarkRecorder(path) as rec:
+            for i, angle in enumerate(angles):
+                rec.write(i / 30.0, _curl_frame(angle))
+
+        engine = FeedbackEngine()
+        reps = RepCounter("BicepCurl")
+        processor = BicepCurlExercise()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for t, lms in iter_recording(path):
+                app.analyze_frame("BicepCurl", lms, engine, {}, reps, now=t)
+                processor.process_frame(lms)
+
+    assert reps.count == curls, reps.count
+    assert processor.rep_count == curls, processor.rep_count
+    print(f"  ✓ RepCounter and BicepCurlExercise both counted {curls} reps")
+
+
+def main():
+    """Run all tests"""
+    print("Landmark Recording Test Suite")
+    print("=" * 50)
+
+    try:
+        test_round_trip()
+        test_replay_counts_reps()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
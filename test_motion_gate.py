@@ -0,0 +1,96 @@
+"""
+Test script for motion-gated inference
+
+This script tests:
+1. Still frames skip inference, motion inside the pose box forces it
+2. The max-skip refresh and the no-pose / disabled cases
+"""
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, LandmarkFrame
+from motion_gate import MotionGate
+
+
+def plank_landmarks():
+    """Visible landmarks spread over x 100..300, y 200..260 of a 480x360 frame."""
+    data = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    data[:, 0] = np.linspace(100, 300, NUM_LANDMARKS)
+    data[:, 1] = np.linspace(200, 260, NUM_LANDMARKS)
+    data[:, 3] = 0.9
+    return LandmarkFrame(data)
+
+
+def frame(value=90, noise=None):
+    img = np.full((360, 480, 3), value, dtype=np.uint8)
+    if noise is not None:
+        img = np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    return img
+
+
+def test_skip_and_motion():
+    """Test skipping on still frames"""
+    print("=== Testing Skip and Motion ===")
+
+    gate = MotionGate(threshold=4.0, max_skip=100)
+    lms = plank_landmarks()
+    gate.update(frame(), "results", lms)
+
+    rng = np.random.default_rng(0)
+    still = [frame(noise=rng.integers(-2, 3, (360, 480, 3))) for _ in range(10)]
+    assert all(gate.skip(f) for f in still)
+    assert gate.landmarks is lms and gate.results == "results"
+    print("  ✓ Sensor noise alone skips inference")
+
+    moved = frame()
+    moved[180:280, 150:250] = 200  # inside the pose box
+    assert not gate.skip(moved)
+    print("  ✓ Motion inside the pose box forces inference")
+
+    outside = frame()
+    outside[0:60, 400:480] = 255  # far from the pose
+    assert gate.skip(outside)
+    print("  ✓ Motion outside the pose box is ignored")
+    assert gate.skipped_total == 11 and gate.frames == 12
+
+
+def test_refresh_and_fallbacks():
+    """Test forced refresh, missing pose and disabled gate"""
+    print("\n=== Testing Refresh and Fallbacks ===")
+
+    gate = MotionGate(max_skip=3)
+    gate.update(frame(), None, plank_landmarks())
+    decisions = [gate.skip(frame()) for _ in range(5)]
+    assert decisions == [True, True, True, False, False]
+    print("  ✓ Inference forced after max_skip skipped frames")
+
+    gate.update(frame(), None, None)
+    assert not gate.skip(frame())
+    print("  ✓ No pose -> always infer")
+
+    gate.update(frame(), None, plank_landmarks())
+    gate.enabled = False
+    assert not gate.skip(frame())
+    print("  ✓ Disabled gate never skips")
+
+
+def main():
+    """Run all tests"""
+    print("Motion Gate Test Suite")
+    print("=" * 50)
+
+    try:
+        test_skip_and_motion()
+        test_refresh_and_fallbacks()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Test script for the One-Euro landmark filter
+
+This script tests:
+1. Jitter reduction at rest and limited lag while moving
+2. Missing landmarks, and live/offline agreement
+"""
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, LandmarkFrame
+from one_euro import LandmarkSmoother, OneEuroFilter, smooth_landmark_series
+
+
+FPS = 30.0
+
+
+def test_jitter_and_lag():
+    """Test smoothing strength at rest and while moving"""
+    print("=== Testing Jitter and Lag ===")
+
+    rng = np.random.default_rng(0)
+    filt = OneEuroFilter()
+    base = np.tile([[320.0, 240.0, 0.0]], (NUM_LANDMARKS, 1))
+    raw, out = [], []
+    for i in range(120):
+        x = base + rng.normal(0.0, 2.0, base.shape)
+        raw.append(x)
+        out.append(filt(i / FPS, x))
+    raw_std = np.std(np.array(raw)[30:, :, 0])
+    out_std = np.std(np.array(out)[30:, :, 0])
+    assert out_std < raw_std / 2
+    print(f"  ✓ Holding still: jitter {raw_std:.2f} px -> {out_std:.2f} px")
+
+    filt.reset()
+    errors = []
+    for i in range(60):
+        x = base + [600.0 * i / FPS, 0.0, 0.0]  # 600 px/s sweep
+        errors.append(np.abs(filt(i / FPS, x) - x)[:, 0].max())
+    assert max(errors[10:]) < 40.0
+    print(f"  ✓ Moving at 600 px/s: lag {max(errors[10:]):.1f} px")
+
+
+def test_missing_and_parity():
+    """Test NaN handling and that the series helper matches the live smoother"""
+    print("\n=== Testing Missing Landmarks and Parity ===")
+
+    rng = np.random.default_rng(1)
+    series = np.zeros((50, NUM_LANDMARKS, 4), dtype=np.float32)
+    series[:, :, 0] = 100.0 + rng.normal(0.0, 2.0, (50, NUM_LANDMARKS))
+    series[:, :, 1] = 200.0
+    series[:, :, 3] = 0.9
+    series[10:15, 5, :] = np.nan  # one landmark lost for a few frames
+    series[30] = np.nan           # no pose at all
+
+    offline = smooth_landmark_series(series, fps=FPS)
+    assert np.isnan(offline[10:15, 5]).all() and np.isnan(offline[30]).all()
+    assert not np.isnan(offline[15, 5, :3]).any() and np.isclose(offline[15, 5, 0], series[15, 5, 0])
+    print("  ✓ Missing landmarks pass through and restart cleanly")
+
+    smoother = LandmarkSmoother()
+    live = []
+    for i, frame in enumerate(series):
+        lms = None if np.isnan(frame[:, 0]).all() else LandmarkFrame(frame)
+        out = smoother(i / FPS, lms)
+        live.append(out.array if out is not None else np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32))
+    assert np.allclose(np.array(live), offline, equal_nan=True, atol=1e-4)
+    assert np.array_equal(offline[:, :, 3], series[:, :, 3], equal_nan=True)
+    print("  ✓ Offline series filter matches the live smoother")
+
+
+def main():
+    """Run all tests"""
+    print("One-Euro Filter Test Suite")
+    print("=" * 50)
+
+    try:
+        test_jitter_and_lag()
+        test_missing_and_parity()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
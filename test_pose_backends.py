@@ -0,0 +1,106 @@
+"""
+Test script for pose detector backend selection
+
+This script tests:
+1. Tasks PoseLandmarker results convert to the same landmark layout
+2. Backend factory validation and the missing-model error
+3. Tasks timestamps: video time in VIDEO mode, wall clock in LIVE_STREAM
+"""
+
+import types
+
+import numpy as np
+
+from pose_detector import BACKENDS, OFFLINE_BACKENDS, create_pose_detector
+from pose_landmarker import StreamClock, TaskPoseResults, default_model_path
+
+
+def fake_result(num_landmarks=33):
+    """Stand-in for a PoseLandmarkerResult with one detected pose."""
+    pose = [types.SimpleNamespace(x=i / 100.0, y=0.5, z=-0.1, visibility=0.8)
+            for i in range(num_landmarks)]
+    return types.SimpleNamespace(pose_landmarks=[pose])
+
+
+def test_task_results():
+    """Test the results adapter"""
+    print("=== Testing Task Results ===")
+
+    results = TaskPoseResults.from_result(fake_result(), timestamp_ms=40)
+    data = results.normalized_array()
+    assert data.shape == (33, 4) and data.dtype == np.float32
+    assert np.isclose(data[10, 0], 0.10) and np.isclose(data[10, 3], 0.8)
+    assert results.timestamp_ms == 40
+    print("  ✓ One pose -> (33, 4) normalized array")
+
+    empty = TaskPoseResults.from_result(types.SimpleNamespace(pose_landmarks=[]), timestamp_ms=80)
+    assert empty.normalized_array() is None and empty.pose_landmarks is None
+    assert TaskPoseResults().pose_landmarks is None
+    print("  ✓ No pose -> None, like the legacy results")
+
+
+def test_backend_factory():
+    """Test backend names and errors raised before any model is loaded"""
+    print("\n=== Testing Backend Factory ===")
+
+    assert set(OFFLINE_BACKENDS) <= set(BACKENDS) and "tasks-live" not in OFFLINE_BACKENDS
+    try:
+        create_pose_detector("tflite")
+        raise AssertionError("unknown backend accepted")
+    except ValueError:
+        print("  ✓ Unknown backend rejected")
+
+    assert default_model_path(0).endswith("pose_landmarker_lite.task")
+    assert default_model_path(2).endswith("pose_landmarker_heavy.task")
+    try:
+        create_pose_detector("tasks-video", model_path="does/not/exist.task")
+        raise AssertionError("missing model accepted")
+    except FileNotFoundError as e:
+        assert "does/not/exist.task" in str(e)
+        print("  ✓ Missing model reported with its path")
+
+
+def test_stream_clock():
+    """Test the millisecond timestamps handed to the Tasks landmarker"""
+    print("\n=== Testing Stream Clock ===")
+
+    now = [100.0]
+    video = StreamClock(live=False, clock=lambda: now[0])
+    assert video.next_ms() == 32  # warm-up frame, no timestamp
+    now[0] += 60.0  # decoding stalls for a minute: video time is unaffected
+    stamps = [video.next_ms(t) for t in (10.0, 10.04, 10.08)]
+    assert stamps == [33, 73, 113], stamps
+    print("  ✓ VIDEO mode keeps the spacing of the frame timestamps")
+
+    assert video.next_ms(10.08) == 114 and video.next_ms(5.0) == 115
+    video.reset()
+    assert video.next_ms(3.0) == 0
+    print("  ✓ Timestamps strictly increase; reset starts over")
+
+    live = StreamClock(live=True, clock=lambda: now[0])
+    now[0] += 0.25
+    assert live.next_ms(99.0) == 250 and live.next_ms() == 251
+    print("  ✓ LIVE_STREAM mode uses the wall clock")
+
+
+def main():
+    """Run all tests"""
+    print("Pose Backend Test Suite")
+    print("=" * 50)
+
+    try:
+        test_task_results()
+        test_backend_factory()
+        test_stream_clock()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
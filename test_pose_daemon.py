@@ -0,0 +1,235 @@
+"""
+Test script for the pose-inference daemon and its client
+
+This script tests:
+1. Landmarks served over the socket match what the detector computes
+2. Detectors stay warm per configuration and are reset between clients
+3. Errors reach the client; the POSE_DAEMON variable selects the socket
+4. The socket is private to its user and the client refuses one that is not
+"""
+
+import os
+import stat
+import tempfile
+import threading
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, LandmarkFrame
+from pose_daemon import DEFAULT_SOCKET, DetectorPool, PoseDaemon, PoseDaemonClient, daemon_socket
+
+
+class FakeDetector:
+    """Landmark i = (frame mean + i, frame width, model complexity, 1); black frames have no pose."""
+
+    def __init__(self, backend="solutions", model_complexity=1, **settings):
+        if backend == "broken":
+            raise ValueError("no such backend")
+        self.model_complexity = model_complexity
+        self.warmed = self.resets = self.closed = 0
+
+    def warm_up(self):
+        self.warmed += 1
+
+    def reset(self):
+        self.resets += 1
+
+    def close(self):
+        self.closed += 1
+
+    def process(self, frame, timestamp_s=None):
+        if frame[0, 0, 0] == 13:
+            raise RuntimeError("graph failed")
+        return float(frame.mean())
+
+    def get_landmarks(self, frame, results):
+        if results == 0.0:
+            return None
+        data = np.ones((NUM_LANDMARKS, 4), dtype=np.float32)
+        data[:, 0] = results + np.arange(NUM_LANDMARKS)
+        data[:, 1] = frame.shape[1]
+        data[:, 2] = self.model_complexity
+        return LandmarkFrame(data)
+
+
+def serve(pool):
+    path = os.path.join(tempfile.mkdtemp(), "pose.sock")
+    daemon = PoseDaemon(path, pool)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    return daemon, thread
+
+
+def stop(daemon, thread):
+    daemon.shutdown()
+    thread.join()
+    daemon.close()
+
+
+def test_round_trip():
+    """Test frames out, landmarks back"""
+    print("=== Testing Round Trip ===")
+
+    pool = DetectorPool(factory=FakeDetector)
+    daemon, thread = serve(pool)
+    try:
+        client = PoseDaemonClient("solutions", daemon.path, model_complexity=2)
+        frame = np.full((48, 64, 3), 100, dtype=np.uint8)
+        frame[:, :32] = 50  # mean 75
+        results = client.process(frame[:, ::-1])  # non-contiguous views are sent too
+        lms = client.get_landmarks(frame, results)
+        assert isinstance(lms, LandmarkFrame) and results.pose_landmarks
+        assert np.allclose(lms.array[:, 0], 75.0 + np.arange(NUM_LANDMARKS))
+        assert (lms.array[0, 1], lms.array[0, 2]) == (64, 2)
+        print("  ✓ Landmark array computed in the daemon on the frame sent")
+
+        empty = client.process(np.zeros((48, 64, 3), dtype=np.uint8))
+        assert not empty.pose_landmarks and client.get_landmarks(frame, empty) is None
+        client.draw(frame, empty)
+        print("  ✓ No pose comes back as None")
+        client.close()
+    finally:
+        stop(daemon, thread)
+    assert not os.path.exists(daemon.path)
+    print("  ✓ Socket removed on close")
+
+
+def test_warm_pool():
+    """Test per-configuration reuse"""
+    print("\n=== Testing Warm Pool ===")
+
+    built = []
+    pool = DetectorPool(factory=lambda *args, **kwargs: built.append(FakeDetector(*args, **kwargs)) or built[-1])
+    pool.preload({"backend": "solutions", "settings": {"model_complexity": 1}, "roi_crop": False})
+    daemon, thread = serve(pool)
+    frame = np.full((8, 8, 3), 9, dtype=np.uint8)
+    try:
+        first = PoseDaemonClient("solutions", daemon.path, model_complexity=1)
+        second = PoseDaemonClient("solutions", daemon.path, model_complexity=1)  # concurrent: its own detector
+        assert first.warm and not second.warm and pool.built == 2
+        assert second.get_landmarks(frame, second.process(frame)).array[0, 2] == 1
+        first.close()
+        second.close()
+        print("  ✓ Preloaded detector served warm; a concurrent client gets its own")
+
+        other = PoseDaemonClient("solutions", daemon.path, model_complexity=0)
+        assert not other.warm and other.get_landmarks(frame, other.process(frame)).array[0, 2] == 0
+        other.close()
+        again = PoseDaemonClient("solutions", daemon.path, model_complexity=0)
+        assert again.warm and pool.built == 3
+        again.close()
+        print("  ✓ New configuration built once, then warm")
+    finally:
+        stop(daemon, thread)
+    assert pool.built == 3 and [d.resets for d in built] == [2, 1, 2]
+    print("  ✓ Detectors reset each time they are handed back")
+
+
+def test_errors_and_env():
+    """Test error propagation and socket selection"""
+    print("\n=== Testing Errors and Environment ===")
+
+    closed = []
+
+    class Tracked(FakeDetector):
+        def close(self):
+            closed.append(self)
+
+    pool = DetectorPool(factory=Tracked)
+    daemon, thread = serve(pool)
+    try:
+        try:
+            PoseDaemonClient("broken", daemon.path)
+            raise AssertionError("expected RuntimeError")
+        except RuntimeError as e:
+            assert "no such backend" in str(e)
+        print("  ✓ Build failure reported to the client")
+
+        client = PoseDaemonClient("solutions", daemon.path)
+        try:
+            client.process(np.full((8, 8, 3), 13, dtype=np.uint8))
+            raise AssertionError("expected RuntimeError")
+        except RuntimeError as e:
+            assert "graph failed" in str(e)
+        client.close()
+        print("  ✓ Inference failure reported; the detector is discarded")
+    finally:
+        stop(daemon, thread)
+    assert len(closed) == 1 and closed[0].resets == 0
+
+    try:
+        PoseDaemonClient("solutions", daemon.path)
+        raise AssertionError("expected OSError")
+    except OSError:
+        pass
+    print("  ✓ No daemon: OSError")
+
+    saved = os.environ.get("POSE_DAEMON")
+    try:
+        for value, expected in (("", None), ("0", None), ("1", DEFAULT_SOCKET), ("/tmp/x.sock", "/tmp/x.sock")):
+            os.environ["POSE_DAEMON"] = value
+            assert daemon_socket() == expected
+    finally:
+        if saved is None:
+            os.environ.pop("POSE_DAEMON", None)
+        else:
+            os.environ["POSE_DAEMON"] = saved
+    print("  ✓ POSE_DAEMON selects the socket")
+
+
+def test_socket_permissions():
+    """Test the per-user socket location and the client's ownership check"""
+    print("\n=== Testing Socket Permissions ===")
+
+    assert os.path.dirname(DEFAULT_SOCKET) != tempfile.gettempdir()
+    print(f"  ✓ Default socket in a per-user directory: {DEFAULT_SOCKET}")
+
+    daemon, thread = serve(DetectorPool(factory=FakeDetector))
+    try:
+        assert stat.S_IMODE(os.stat(daemon.path).st_mode) == 0o600
+        print("  ✓ Socket created 0600")
+
+        os.chmod(daemon.path, 0o666)
+        try:
+            PoseDaemonClient("solutions", daemon.path)
+            raise AssertionError("expected OSError")
+        except OSError as e:
+            assert "not private" in str(e)
+        print("  ✓ Client refuses a socket others can open")
+    finally:
+        stop(daemon, thread)
+
+    shared = tempfile.mkdtemp()
+    os.chmod(shared, 0o777)
+    try:
+        PoseDaemon(os.path.join(shared, "pose.sock"), DetectorPool(factory=FakeDetector))
+        raise AssertionError("expected OSError")
+    except OSError as e:
+        assert "others cannot write" in str(e)
+    finally:
+        os.rmdir(shared)
+    print("  ✓ Daemon refuses a directory others can write to")
+
+
+def main():
+    """Run all tests"""
+    print("Pose Daemon Test Suite")
+    print("=" * 50)
+
+    try:
+        test_round_trip()
+        test_warm_pool()
+        test_errors_and_env()
+        test_socket_permissions()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Test script for ROI-cropped inference
+
+This script tests:
+1. Crop boxes from landmarks: padding, clipping, stickiness and tracking loss
+2. Mapping crop-normalized landmarks back to full-frame pixels
+"""
+
+import types
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, POSE_CONNECTIONS
+from pose_roi import RoiResults, roi_from_landmarks
+
+
+def pose_box(x0, y0, x1, y1, visibility=0.9):
+    """Landmarks spread over a rectangle in full-frame pixels."""
+    data = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    data[:, 0] = np.linspace(x0, x1, NUM_LANDMARKS)
+    data[:, 1] = np.linspace(y0, y1, NUM_LANDMARKS)
+    data[:, 3] = visibility
+    return data
+
+
+def test_roi_boxes():
+    """Test crop box selection"""
+    print("=== Testing ROI Boxes ===")
+
+    # A 1080p frame with the user filling about a third of it
+    data = pose_box(800, 300, 1000, 660)
+    box = roi_from_landmarks(data, 1920, 1080)
+    x0, y0, x1, y1 = box
+    assert x1 - x0 == y1 - y0 == 540  # 360 px extent + 25% padding per side, square
+    assert x0 < 800 and x1 > 1000 and y0 < 300 and y1 > 660
+    print(f"  ✓ Padded square box {box}")
+
+    assert roi_from_landmarks(data + [50, 10, 0, 0], 1920, 1080, current=box) == box
+    moved = roi_from_landmarks(data + [400, 0, 0, 0], 1920, 1080, current=box)
+    assert moved != box and moved[0] > box[0]
+    print("  ✓ Box kept while the pose stays inside, recomputed when it leaves")
+
+    edge = roi_from_landmarks(pose_box(0, 0, 200, 400), 1920, 1080)
+    assert edge[0] == 0 and edge[1] == 0
+    assert roi_from_landmarks(pose_box(0, 0, 1920, 1080), 1920, 1080) is None
+    print("  ✓ Clipped to the frame; full-frame poses are not cropped")
+
+    assert roi_from_landmarks(None, 1920, 1080, current=box) is None
+    assert roi_from_landmarks(pose_box(800, 300, 1000, 660, visibility=0.1), 1920, 1080) is None
+    print("  ✓ Tracking lost -> full frame")
+
+
+def test_mapping_back():
+    """Test RoiResults landmark mapping"""
+    print("\n=== Testing Mapping Back ===")
+
+    points = [types.SimpleNamespace(x=0.5, y=0.25, z=-0.2, visibility=0.8) for _ in range(NUM_LANDMARKS)]
+    raw = types.SimpleNamespace(pose_landmarks=types.SimpleNamespace(landmark=points))
+    results = RoiResults(raw, (600, 200, 1140, 740), frame_w=1920)
+    data = results.landmark_array()
+    assert np.allclose(data[0], [600 + 270, 200 + 135, -0.2 * 540 / 1920, 0.8])
+    print("  ✓ Crop-normalized -> full-frame pixels")
+
+    empty = RoiResults(types.SimpleNamespace(pose_landmarks=None), (0, 0, 10, 10), frame_w=10)
+    assert empty.landmark_array() is None and not empty.pose_landmarks
+    assert len(POSE_CONNECTIONS) == 35 and max(max(c) for c in POSE_CONNECTIONS) == NUM_LANDMARKS - 1
+    print("  ✓ No pose -> None")
+
+
+def main():
+    """Run all tests"""
+    print("Pose ROI Test Suite")
+    print("=" * 50)
+
+    try:
+        test_roi_boxes()
+        test_mapping_back()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
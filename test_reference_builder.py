@@ -18,16 +18,15 @@ import cv2
 import json
 import numpy as np
 from typing import List, Tuple, Dict
-import matplotlib.pyplot as plt
 
-from pose_detector import PoseDetector
+from pose_daemon import open_pose_detector
 from angle_utils import calculate_angle
 
 
 class SimpleReferenceBuilder:
     def __init__(self):
         """Initialize the simple reference builder."""
-        self.detector = PoseDetector(
+        self.detector = open_pose_detector(
             model_complexity=1,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.7
@@ -252,6 +251,7 @@ class SimpleReferenceBuilder:
     def _create_visualization(self, repetitions: List[Tuple[int, int]]):
         """Create simple visualization."""
         try:
+            import matplotlib.pyplot as plt  # only needed for the plot
             plt.figure(figsize=(12, 8))
             
             # Plot angle sequence
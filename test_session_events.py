@@ -0,0 +1,75 @@
+"""
+Test script for the headless JSONL event stream
+
+This script tests:
+1. Event lines are strict JSON with NaN angles written as null
+2. Phase, rep and plank timer changes are emitted once per transition
+"""
+
+import json
+import os
+import tempfile
+
+from session_events import EventWriter, SessionTracker
+
+
+def _read_events(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_event_lines():
+    """Test JSON encoding of frame events"""
+    print("=== Testing Event Lines ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.jsonl")
+        writer = EventWriter(path)
+        writer.emit("frame", frame=0, t=0.0, angles={"Knee": 123.45678, "Hip": float("nan")})
+        writer.close()
+
+        (event,) = _read_events(path)
+        assert event == {"event": "frame", "frame": 0, "t": 0.0, "angles": {"Knee": 123.457, "Hip": None}}
+        print(f"  ✓ {event}")
+
+
+def test_tracker_transitions():
+    """Test change events for phases, reps and the plank timer"""
+    print("\n=== Testing Tracker Transitions ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.jsonl")
+        writer = EventWriter(path)
+        tracker = SessionTracker(writer)
+        tracker.update(0, 0.0, "up", 0, False)
+        tracker.update(1, 0.5, "up", 0, True)
+        tracker.update(2, 1.0, "down", 1, True)
+        tracker.update(3, 1.5, "down", 1, True)
+        tracker.finish(4, 2.0, plank_last=1.5, plank_total=1.5)
+        writer.close()
+
+        kinds = [e["event"] for e in _read_events(path)]
+        assert kinds == ["phase", "plank_start", "phase", "rep", "plank_stop"], kinds
+        print(f"  ✓ {kinds}")
+
+
+def main():
+    """Run all tests"""
+    print("Session Events Test Suite")
+    print("=" * 50)
+
+    try:
+        test_event_lines()
+        test_tracker_transitions()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ import math
 from typing import Dict
 
 from rep_counter import RepCounter
-from pose_detector import LandmarkPoint
+from landmarks import LandmarkPoint
 from angle_utils import calculate_angle
 
 
@@ -0,0 +1,78 @@
+"""
+Test script for per-stage latency instrumentation
+
+This script tests:
+1. Ring buffers keep only the most recent window of samples
+2. Rolling percentiles and the JSON dump
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from stage_timer import RingBuffer, StageTimer
+
+
+def test_ring_buffer():
+    """Test that old samples are overwritten"""
+    print("=== Testing Ring Buffer ===")
+
+    buf = RingBuffer(4)
+    for v in range(10):
+        buf.append(float(v))
+    assert buf.count == 10
+    assert sorted(buf.values().tolist()) == [6.0, 7.0, 8.0, 9.0]
+    print("  ✓ Keeps the last 4 of 10 samples")
+
+
+def test_percentiles_and_dump():
+    """Test rolling stats per stage"""
+    print("\n=== Testing Percentiles and Dump ===")
+
+    timer = StageTimer(window=100)
+    for ms in range(1, 201):
+        timer.add("inference", ms / 1000.0)
+    with timer.measure("draw"):
+        time.sleep(0.001)
+
+    summary = timer.summary()
+    assert timer.stages == ["inference", "draw"]
+    inf = summary["inference"]
+    assert inf["count"] == 200
+    assert np.isclose(inf["p50_ms"], np.percentile(np.arange(101, 201), 50))
+    assert inf["p50_ms"] < inf["p95_ms"] < inf["p99_ms"] <= 200.0
+    assert summary["draw"]["p50_ms"] >= 1.0
+    print(f"  ✓ inference p50/p95/p99 = {inf['p50_ms']:.1f}/{inf['p95_ms']:.1f}/{inf['p99_ms']:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "timings.json")
+        timer.dump(path, extra={"source": "test"})
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        assert payload["source"] == "test" and set(payload["stages"]) == {"inference", "draw"}
+        print("  ✓ Dump written")
+
+
+def main():
+    """Run all tests"""
+    print("Stage Timer Test Suite")
+    print("=" * 50)
+
+    try:
+        test_ring_buffer()
+        test_percentiles_and_dump()
+
+        print("\n" + "=" * 50)
+        print("All tests completed!")
+
+    except Exception as e:
+        print(f"\nTest failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
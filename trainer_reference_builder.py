@@ -6,41 +6,60 @@ It processes a trainer video, detects pose landmarks, calculates elbow angles,
 segments the video into repetitions, and builds reference JSON data.
 
 Usage:
-    python trainer_reference_builder.py
+    python trainer_reference_builder.py [--workers N] [--no-cache]
 
 Requirements:
     - trainer_videos/bicep_curl.mp4 should exist in the project directory
     - Existing pose_detector.py, angle_utils.py modules
 """
 
-import cv2
 import json
 import numpy as np
 from typing import List, Tuple, Dict, Optional
-import matplotlib.pyplot as plt
-from scipy.signal import find_peaks
+import argparse
 import os
 
-from pose_detector import PoseDetector
-from angle_utils import calculate_angle
+from landmarks import side_triplets
+from pose_detector import OFFLINE_BACKENDS, PoseDetector, create_pose_detector
+from angle_utils import calculate_angle, first_valid, landmark_angles
+from landmark_cache import load_or_extract_landmarks
+
+
+ELBOW_TRIPLETS = side_triplets("SHOULDER", "ELBOW", "WRIST")
 
 
 class TrainerReferenceBuilder:
-    def __init__(self, video_path: str):
+    def __init__(self, video_path: str, workers: int = 1, use_cache: bool = True, backend: str = "solutions"):
         """Initialize the trainer reference builder.
         
         Args:
             video_path: Path to the trainer video file
+            workers: Worker processes for pose extraction (1 = sequential)
+            use_cache: Reuse landmarks cached by a previous run on the same video/settings
+            backend: Pose backend (see pose_detector.create_pose_detector)
         """
         self.video_path = video_path
-        self.detector = PoseDetector(
+        self.workers = workers
+        self.use_cache = use_cache
+        self.detector_settings = dict(
             model_complexity=1,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
+        if backend != "solutions":
+            # Left out for the default so existing landmark caches keep their keys
+            self.detector_settings["backend"] = backend
+        self._detector: Optional[PoseDetector] = None
         self.angles = []
         self.frame_numbers = []
         
+    @property
+    def detector(self) -> PoseDetector:
+        """Pose detector, created on first use (not needed when landmarks come from the cache)."""
+        if self._detector is None:
+            self._detector = create_pose_detector(**self.detector_settings)
+        return self._detector
+
     def extract_angles_from_video(self) -> bool:
         """Extract elbow angles from the trainer video.
         
@@ -51,36 +70,25 @@ class TrainerReferenceBuilder:
             print(f"Error: Video file not found at {self.video_path}")
             return False
             
-        cap = cv2.VideoCapture(self.video_path)
-        if not cap.isOpened():
-            print(f"Error: Could not open video file {self.video_path}")
-            return False
-            
         print(f"Processing video: {self.video_path}")
-        frame_count = 0
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            frame_count += 1
-            if frame_count % 10 == 0:  # Progress indicator
-                print(f"Processing frame {frame_count}/{total_frames} ({frame_count/total_frames*100:.1f}%)")
-                
-            # Process frame with pose detector
-            results = self.detector.process(frame)
-            landmarks = self.detector.get_landmarks(frame, results)
-            
-            if landmarks and self._has_required_landmarks(landmarks):
-                # Calculate elbow angle
-                angle = self._calculate_elbow_angle(landmarks)
-                if not np.isnan(angle):
-                    self.angles.append(angle)
-                    self.frame_numbers.append(frame_count)
+        try:
+            series = load_or_extract_landmarks(
+                self.video_path, self.detector_settings, workers=self.workers,
+                detector_factory=lambda: self.detector, use_cache=self.use_cache, progress_every=10
+            )
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return False
+        total_frames = len(series)
+        
+        # Elbow angle for every frame at once: left side first, right side as
+        # fallback, each only where all three points are visible enough
+        per_side = landmark_angles(series, ELBOW_TRIPLETS, min_visibility=0.3)
+        elbow = first_valid(*per_side.T)
+        valid = np.flatnonzero(~np.isnan(elbow))
+        self.angles = elbow[valid].tolist()
+        self.frame_numbers = (valid + 1).tolist()
                     
-        cap.release()
         print(f"Extracted {len(self.angles)} valid angle measurements from {total_frames} frames")
         return len(self.angles) > 0
         
@@ -160,8 +168,11 @@ class TrainerReferenceBuilder:
             
         angles_array = np.array(self.angles)
         
-        # Smooth the signal to reduce noise
+        # scipy is only imported once segmentation actually runs
         from scipy.ndimage import gaussian_filter1d
+        from scipy.signal import find_peaks
+
+        # Smooth the signal to reduce noise
         smoothed_angles = gaussian_filter1d(angles_array, sigma=2.0)
         
         # Find peaks (extended arm positions) - high angles
@@ -280,6 +291,7 @@ class TrainerReferenceBuilder:
             print("No angle data to visualize")
             return
             
+        import matplotlib.pyplot as plt  # only needed for visualization
         plt.figure(figsize=(12, 6))
         
         # Plot angle sequence
@@ -384,11 +396,22 @@ class TrainerReferenceBuilder:
 
 def main():
     """Main function to run the trainer reference builder."""
-    # Configuration
+    parser = argparse.ArgumentParser(description="Build bicep curl reference ranges from a trainer video")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for pose extraction (splits the video into frame ranges)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the landmark cache and re-run pose inference")
+    parser.add_argument("--backend", choices=OFFLINE_BACKENDS, default="solutions",
+                        help="pose backend: legacy MediaPipe solutions or the Tasks PoseLandmarker (VIDEO mode)")
+    args = parser.parse_args()
+    
+    # Configuration (the repo ships Trainer_Videos/; keep the old lowercase path working)
     video_path = "Trainer_videos/Biceps_curl.mp4"
+    if not os.path.exists(video_path) and os.path.exists("Trainer_Videos/Biceps_curl.mp4"):
+        video_path = "Trainer_Videos/Biceps_curl.mp4"
     
     # Check if video exists
-    if not os.path.exists("Trainer_videos"):
+    if not os.path.exists(os.path.dirname(video_path)):
         os.makedirs("Trainer_videos")
         print(f"Created Trainer_videos directory. Please place Biceps_curl.mp4 in this folder.")
         return
@@ -399,7 +422,7 @@ def main():
         return
         
     # Build references
-    builder = TrainerReferenceBuilder(video_path)
+    builder = TrainerReferenceBuilder(video_path, workers=args.workers, use_cache=not args.no_cache, backend=args.backend)
     success = builder.build_references(visualize=True)
     
     if success:
@@ -6,7 +6,7 @@ It processes trainer media, detects pose landmarks, calculates hip angles (shoul
 and builds reference JSON data for proper plank position detection.
 
 Usage:
-    python trainer_reference_builder_plank.py
+    python trainer_reference_builder_plank.py [--workers N] [--no-cache]
 
 Requirements:
     - Trainer_Videos/Plank.jpg (or .mp4) should exist in the project directory
@@ -17,31 +17,52 @@ import cv2
 import json
 import numpy as np
 from typing import List, Tuple, Dict, Optional
-import matplotlib.pyplot as plt
+import argparse
 import os
 
-from pose_detector import PoseDetector
-from angle_utils import calculate_angle
+from landmarks import side_triplets
+from pose_detector import OFFLINE_BACKENDS, PoseDetector, create_pose_detector
+from angle_utils import calculate_angle, landmark_angles
+from landmark_cache import load_or_extract_landmarks
+
+
+HIP_TRIPLETS = side_triplets("SHOULDER", "HIP", "ANKLE")
 
 
 class PlankTrainerReferenceBuilder:
-    def __init__(self, media_path: str):
+    def __init__(self, media_path: str, workers: int = 1, use_cache: bool = True, backend: str = "solutions"):
         """Initialize the plank trainer reference builder.
         
         Args:
             media_path: Path to the trainer image or video file
+            workers: Worker processes for video pose extraction (1 = sequential)
+            use_cache: Reuse landmarks cached by a previous run on the same video/settings
+            backend: Pose backend (see pose_detector.create_pose_detector)
         """
         self.media_path = media_path
-        self.detector = PoseDetector(
+        self.workers = workers
+        self.use_cache = use_cache
+        self.detector_settings = dict(
             model_complexity=1,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.7
         )
+        if backend != "solutions":
+            # Left out for the default so existing landmark caches keep their keys
+            self.detector_settings["backend"] = backend
+        self._detector: Optional[PoseDetector] = None
         self.left_hip_angles = []
         self.right_hip_angles = []
         self.frame_numbers = []
         self.is_video = media_path.lower().endswith(('.mp4', '.avi', '.mov', '.mkv'))
         
+    @property
+    def detector(self) -> PoseDetector:
+        """Pose detector, created on first use (not needed when landmarks come from the cache)."""
+        if self._detector is None:
+            self._detector = create_pose_detector(**self.detector_settings)
+        return self._detector
+
     def extract_angles_from_media(self) -> bool:
         """Extract hip angles from the trainer image or video.
         
@@ -94,40 +115,26 @@ class PlankTrainerReferenceBuilder:
     
     def _extract_from_video(self) -> bool:
         """Extract angles from a plank video."""
-        cap = cv2.VideoCapture(self.media_path)
-        if not cap.isOpened():
-            print(f"Error: Could not open video file {self.media_path}")
-            return False
-            
         print(f"Processing plank video: {self.media_path}")
-        frame_count = 0
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        try:
+            series = load_or_extract_landmarks(
+                self.media_path, self.detector_settings, workers=self.workers,
+                detector_factory=lambda: self.detector, use_cache=self.use_cache, progress_every=10
+            )
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return False
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            frame_count += 1
-            if frame_count % 10 == 0:  # Progress indicator
-                print(f"Processing frame {frame_count}/{total_frames} ({frame_count/total_frames*100:.1f}%)")
-                
-            # Process frame with pose detector
-            results = self.detector.process(frame)
-            landmarks = self.detector.get_landmarks(frame, results)
-            
-            if landmarks and self._has_required_landmarks(landmarks):
-                left_angle, right_angle = self._calculate_hip_angles(landmarks)
-                
-                if not np.isnan(left_angle):
-                    self.left_hip_angles.append(left_angle)
-                    
-                if not np.isnan(right_angle):
-                    self.right_hip_angles.append(right_angle)
-                    
-                self.frame_numbers.append(frame_count)
+        # Both hip angles for every frame in one pass (NaN where not visible enough)
+        hip_angles = landmark_angles(series, HIP_TRIPLETS, min_visibility=0.3)
+        left, right = hip_angles[:, 0], hip_angles[:, 1]
+        self.left_hip_angles.extend(left[~np.isnan(left)].tolist())
+        self.right_hip_angles.extend(right[~np.isnan(right)].tolist())
+        
+        # Frames where at least one side's points were detected
+        present = (~np.isnan(series[:, HIP_TRIPLETS, 0])).all(axis=2).any(axis=1)
+        self.frame_numbers.extend((np.flatnonzero(present) + 1).tolist())
                     
-        cap.release()
         print(f"Extracted {len(self.left_hip_angles)} left and {len(self.right_hip_angles)} right hip angle measurements")
         return len(self.left_hip_angles) > 0 or len(self.right_hip_angles) > 0
         
@@ -328,6 +335,7 @@ class PlankTrainerReferenceBuilder:
             print("No angle data to visualize")
             return
             
+        import matplotlib.pyplot as plt  # only needed for visualization
         plt.figure(figsize=(12, 8))
         
         # Plot 1: Angle sequence (if video)
@@ -479,6 +487,15 @@ Ideal Plank Range: 165° - 185°
 
 def main():
     """Main function to run the plank trainer reference builder."""
+    parser = argparse.ArgumentParser(description="Build plank reference ranges from a trainer image or video")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for video pose extraction (splits the video into frame ranges)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the landmark cache and re-run pose inference")
+    parser.add_argument("--backend", choices=OFFLINE_BACKENDS, default="solutions",
+                        help="pose backend: legacy MediaPipe solutions or the Tasks PoseLandmarker (VIDEO mode)")
+    args = parser.parse_args()
+    
     # Try different possible plank media files
     possible_files = [
         "Trainer_Videos/Plank.jpg",
@@ -502,7 +519,7 @@ def main():
         
     # Build references
     print(f"Found plank trainer media: {media_path}")
-    builder = PlankTrainerReferenceBuilder(media_path)
+    builder = PlankTrainerReferenceBuilder(media_path, workers=args.workers, use_cache=not args.no_cache, backend=args.backend)
     success = builder.build_references(visualize=True)
     
     if success:
@@ -14,19 +14,26 @@ reference ranges (Min/Max per joint) aggregated across reps.
 Results are merged into references.json at the project root under the key "Pushup".
 
 Usage:
-    python trainer_reference_builder_pushup.py
+    python trainer_reference_builder_pushup.py [--workers N] [--no-cache]
 """
 
+import argparse
 import os
 import json
-from typing import Dict, List, Tuple, Optional
-
-import cv2
+from typing import Dict, List, Mapping, Tuple, Optional
 import numpy as np
-from scipy.signal import find_peaks
 
-from pose_detector import PoseDetector, LandmarkPoint
-from angle_utils import calculate_angle
+from landmarks import LandmarkPoint, LandmarkFrame, side_triplets
+from pose_detector import OFFLINE_BACKENDS, PoseDetector, create_pose_detector
+from angle_utils import calculate_angle, first_valid, landmark_angles
+from landmark_cache import load_or_extract_landmarks
+from one_euro import smooth_landmark_series
+from video_landmarks import video_fps
+
+
+ELBOW_TRIPLETS = side_triplets("SHOULDER", "ELBOW", "WRIST")
+SHOULDER_TRIPLETS = side_triplets("HIP", "SHOULDER", "ELBOW")
+BACK_TRIPLETS = side_triplets("SHOULDER", "HIP", "ANKLE")
 
 
 def moving_average(values: List[float], window: int = 7) -> np.ndarray:
@@ -49,14 +56,16 @@ def first_existing_path(paths: List[str]) -> Optional[str]:
     return None
 
 
-def get_xy(lms: Dict[str, LandmarkPoint], name: str) -> Optional[Tuple[float, float]]:
+def get_xy(lms: Mapping[str, LandmarkPoint], name: str) -> Optional[Tuple[float, float]]:
+    if isinstance(lms, LandmarkFrame):
+        return lms.point_xy(name)
     p = lms.get(name)
     if p is None:
         return None
     return (float(p.x), float(p.y))
 
 
-def compute_elbow_angle(lms: Dict[str, LandmarkPoint]) -> float:
+def compute_elbow_angle(lms: Mapping[str, LandmarkPoint]) -> float:
     for side in ("LEFT_", "RIGHT_"):
         a = get_xy(lms, side + "SHOULDER")
         b = get_xy(lms, side + "ELBOW")
@@ -66,7 +75,7 @@ def compute_elbow_angle(lms: Dict[str, LandmarkPoint]) -> float:
     return float('nan')
 
 
-def compute_shoulder_angle(lms: Dict[str, LandmarkPoint]) -> float:
+def compute_shoulder_angle(lms: Mapping[str, LandmarkPoint]) -> float:
     for side in ("LEFT_", "RIGHT_"):
         a = get_xy(lms, side + "HIP")
         b = get_xy(lms, side + "SHOULDER")
@@ -76,7 +85,7 @@ def compute_shoulder_angle(lms: Dict[str, LandmarkPoint]) -> float:
     return float('nan')
 
 
-def compute_back_angle(lms: Dict[str, LandmarkPoint]) -> float:
+def compute_back_angle(lms: Mapping[str, LandmarkPoint]) -> float:
     for side in ("LEFT_", "RIGHT_"):
         a = get_xy(lms, side + "SHOULDER")
         b = get_xy(lms, side + "HIP")
@@ -86,6 +95,16 @@ def compute_back_angle(lms: Dict[str, LandmarkPoint]) -> float:
     return float('nan')
 
 
+def compute_series_angles(series: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Elbow, shoulder and back angles for a whole (N, 33, 4) landmark series.
+
+    Same LEFT-then-RIGHT choice as the per-frame compute_* functions; NaN where
+    neither side has the points.
+    """
+    return tuple(first_valid(*landmark_angles(series, triplets).T)
+                 for triplets in (ELBOW_TRIPLETS, SHOULDER_TRIPLETS, BACK_TRIPLETS))
+
+
 def detect_repetitions_from_elbow(elbow_sm: np.ndarray) -> List[Tuple[int, int]]:
     """
     Segment repetitions using elbow angle curve.
@@ -94,6 +113,7 @@ def detect_repetitions_from_elbow(elbow_sm: np.ndarray) -> List[Tuple[int, int]]
     n = len(elbow_sm)
     if n < 10:
         return []
+    from scipy.signal import find_peaks  # deferred: only segmentation needs scipy
 
     # Find peaks (extended arms, large elbow angle)
     rng = float(np.nanmax(elbow_sm) - np.nanmin(elbow_sm)) if n > 0 else 0.0
@@ -131,7 +151,8 @@ def detect_repetitions_from_elbow(elbow_sm: np.ndarray) -> List[Tuple[int, int]]
 
 
 class PushupReferenceTrainer:
-    def __init__(self, video_path: Optional[str] = None) -> None:
+    def __init__(self, video_path: Optional[str] = None, workers: int = 1, use_cache: bool = True,
+                 backend: str = "solutions", smoothing: str = "moving_average") -> None:
         default_paths = [
             "Trainer_Videos/pushUps.mp4",  # Correct filename found in directory
             "Trainer_Videos/pushup.mp4",
@@ -140,51 +161,41 @@ class PushupReferenceTrainer:
             "trainer_videos/pushup.mp4",
         ]
         self.video_path = video_path or first_existing_path(default_paths) or default_paths[0]
-        self.detector = PoseDetector(
+        self.workers = workers
+        self.use_cache = use_cache
+        self.detector_settings = dict(
             model_complexity=1,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5,
         )
+        if backend != "solutions":
+            # Left out for the default so existing landmark caches keep their keys
+            self.detector_settings["backend"] = backend
+        self._detector: Optional[PoseDetector] = None
+        # "moving_average" smooths the angle curves; "one_euro" filters the
+        # landmarks first, like main.py --smooth does live
+        self.smoothing = smoothing
+
+    @property
+    def detector(self) -> PoseDetector:
+        """Pose detector, created on first use (not needed when landmarks come from the cache)."""
+        if self._detector is None:
+            self._detector = create_pose_detector(**self.detector_settings)
+        return self._detector
 
     def extract_angles(self) -> Tuple[List[float], List[float], List[float]]:
-        cap = cv2.VideoCapture(self.video_path)
-        if not cap.isOpened():
-            raise RuntimeError(f"Could not open video file: {self.video_path}")
-
-        elbow: List[float] = []
-        shoulder: List[float] = []
-        back: List[float] = []
-
-        total = int(max(1, cap.get(cv2.CAP_PROP_FRAME_COUNT)))
-        frame_idx = 0
         print(f"Processing video: {self.video_path}")
+        series = load_or_extract_landmarks(
+            self.video_path, self.detector_settings, workers=self.workers,
+            detector_factory=lambda: self.detector, use_cache=self.use_cache
+        )
+        if self.smoothing == "one_euro":
+            series = smooth_landmark_series(series, fps=video_fps(self.video_path))
 
-        try:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                frame_idx += 1
-                if frame_idx % 20 == 0:
-                    pct = 100.0 * (frame_idx / total)
-                    print(f"Processed {frame_idx}/{total} frames ({pct:.1f}%)")
-
-                results = self.detector.process(frame)
-                lms = self.detector.get_landmarks(frame, results)
-                if not lms:
-                    continue
-
-                e = compute_elbow_angle(lms)
-                s = compute_shoulder_angle(lms)
-                b = compute_back_angle(lms)
-
-                # Keep only frames where all are available for consistent analysis
-                if not (np.isnan(e) or np.isnan(s) or np.isnan(b)):
-                    elbow.append(e)
-                    shoulder.append(s)
-                    back.append(b)
-        finally:
-            cap.release()
+        e, sh, b = compute_series_angles(series)
+        # Keep only frames where all are available for consistent analysis
+        keep = ~(np.isnan(e) | np.isnan(sh) | np.isnan(b))
+        elbow, shoulder, back = e[keep].tolist(), sh[keep].tolist(), b[keep].tolist()
 
         print(f"Collected samples: elbow={len(elbow)}, shoulder={len(shoulder)}, back={len(back)}")
         return elbow, shoulder, back
@@ -250,8 +261,9 @@ class PushupReferenceTrainer:
             print("Not enough samples to detect repetitions.")
             return False
 
-        # 2) Smooth sequences (moving average)
-        e_sm, s_sm, b_sm = self.smooth_all(elbow, shoulder, back, window=7)
+        # 2) Smooth sequences (moving average, unless the landmarks were One-Euro filtered)
+        window = 1 if self.smoothing == "one_euro" else 7
+        e_sm, s_sm, b_sm = self.smooth_all(elbow, shoulder, back, window=window)
         print(f"Smoothed ranges: elbow=[{np.nanmin(e_sm):.1f}, {np.nanmax(e_sm):.1f}], "
               f"shoulder=[{np.nanmin(s_sm):.1f}, {np.nanmax(s_sm):.1f}], "
               f"back=[{np.nanmin(b_sm):.1f}, {np.nanmax(b_sm):.1f}]")
@@ -283,7 +295,19 @@ class PushupReferenceTrainer:
 
 
 def main() -> int:
-    trainer = PushupReferenceTrainer()
+    parser = argparse.ArgumentParser(description="Build push-up reference ranges from a trainer video")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for pose extraction (splits the video into frame ranges)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the landmark cache and re-run pose inference")
+    parser.add_argument("--backend", choices=OFFLINE_BACKENDS, default="solutions",
+                        help="pose backend: legacy MediaPipe solutions or the Tasks PoseLandmarker (VIDEO mode)")
+    parser.add_argument("--smoothing", choices=["moving_average", "one_euro"], default="moving_average",
+                        help="moving average over the angle curves, or the One-Euro landmark filter used live")
+    args = parser.parse_args()
+
+    trainer = PushupReferenceTrainer(workers=args.workers, use_cache=not args.no_cache, backend=args.backend,
+                                     smoothing=args.smoothing)
     if not os.path.exists(trainer.video_path):
         alt = first_existing_path([
             "Trainer_videos/pushup.mp4",
@@ -14,18 +14,27 @@ computes overall reference ranges (Min/Max per joint) aggregated across reps.
 Results are merged into references.json at the project root.
 
 Usage:
-    python trainer_reference_builder_squat.py
+    python trainer_reference_builder_squat.py [--workers N] [--no-cache]
 """
 
+import argparse
 import os
-import cv2
 import json
 import math
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Mapping, Tuple, Optional
 
-from pose_detector import PoseDetector, LandmarkPoint
-from angle_utils import calculate_angle
+from landmarks import LandmarkPoint, LandmarkFrame, LANDMARK_INDEX, side_triplets
+from pose_detector import OFFLINE_BACKENDS, PoseDetector, create_pose_detector
+from angle_utils import calculate_angle, first_valid, landmark_angles
+from landmark_cache import load_or_extract_landmarks
+from one_euro import smooth_landmark_series
+from video_landmarks import video_fps
+
+
+KNEE_TRIPLETS = side_triplets("HIP", "KNEE", "ANKLE")
+HIP_TRIPLETS = side_triplets("SHOULDER", "HIP", "KNEE")
+BACK_ANKLE_TRIPLETS = side_triplets("SHOULDER", "HIP", "ANKLE")
 
 
 def moving_average(values: List[float], window: int = 7) -> np.ndarray:
@@ -51,14 +60,16 @@ def first_existing_path(paths: List[str]) -> Optional[str]:
     return None
 
 
-def get_point_xy(lms: Dict[str, LandmarkPoint], name: str) -> Optional[Tuple[float, float]]:
+def get_point_xy(lms: Mapping[str, LandmarkPoint], name: str) -> Optional[Tuple[float, float]]:
+    if isinstance(lms, LandmarkFrame):
+        return lms.point_xy(name)
     p = lms.get(name)
     if p is None:
         return None
     return (float(p.x), float(p.y))
 
 
-def compute_knee_angle(lms: Dict[str, LandmarkPoint]) -> float:
+def compute_knee_angle(lms: Mapping[str, LandmarkPoint]) -> float:
     # Try LEFT then RIGHT
     for side in ("LEFT_", "RIGHT_"):
         hip = get_point_xy(lms, side + "HIP")
@@ -69,7 +80,7 @@ def compute_knee_angle(lms: Dict[str, LandmarkPoint]) -> float:
     return float("nan")
 
 
-def compute_hip_angle(lms: Dict[str, LandmarkPoint]) -> float:
+def compute_hip_angle(lms: Mapping[str, LandmarkPoint]) -> float:
     # Try LEFT then RIGHT
     for side in ("LEFT_", "RIGHT_"):
         shoulder = get_point_xy(lms, side + "SHOULDER")
@@ -80,7 +91,7 @@ def compute_hip_angle(lms: Dict[str, LandmarkPoint]) -> float:
     return float("nan")
 
 
-def compute_back_angle(lms: Dict[str, LandmarkPoint]) -> float:
+def compute_back_angle(lms: Mapping[str, LandmarkPoint]) -> float:
     """Compute back angle at the hip.
     Priority:
       1) SHOULDER-HIP-KNEE (aligns with runtime FeedbackEngine "Back")
@@ -121,6 +132,28 @@ def compute_back_angle(lms: Dict[str, LandmarkPoint]) -> float:
     return float("nan")
 
 
+def compute_series_angles(series: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Knee, hip and back angles for a whole (N, 33, 4) landmark series.
+
+    Vectorized equivalent of compute_knee_angle / compute_hip_angle /
+    compute_back_angle applied per frame (same LEFT-then-RIGHT and back
+    fallback order); frames without the needed points are NaN.
+    """
+    knee = first_valid(*landmark_angles(series, KNEE_TRIPLETS).T)
+    hip = first_valid(*landmark_angles(series, HIP_TRIPLETS).T)
+
+    # Back option 3: HIP->SHOULDER against vertical (0, -1)
+    vertical = []
+    for side in ("LEFT_", "RIGHT_"):
+        v = (series[:, LANDMARK_INDEX[side + "SHOULDER"], :2] - series[:, LANDMARK_INDEX[side + "HIP"], :2]).astype(float)
+        norm = np.linalg.norm(v, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cos = np.clip(-v[:, 1] / (norm + 1e-12), -1.0, 1.0)
+        vertical.append(np.where(norm < 1e-6, np.nan, np.degrees(np.arccos(cos))))
+    back = first_valid(hip, *landmark_angles(series, BACK_ANKLE_TRIPLETS).T, *vertical)
+    return knee, hip, back
+
+
 def detect_repetitions_from_knee(knee_sm: np.ndarray) -> List[Tuple[int, int]]:
     """Segment repetitions using knee angle curve.
 
@@ -200,7 +233,8 @@ def detect_repetitions_from_knee(knee_sm: np.ndarray) -> List[Tuple[int, int]]:
 
 
 class SquatReferenceTrainer:
-    def __init__(self, video_path: Optional[str] = None) -> None:
+    def __init__(self, video_path: Optional[str] = None, workers: int = 1, use_cache: bool = True,
+                 backend: str = "solutions", smoothing: str = "moving_average") -> None:
         default_paths = [
             "Trainer_Videos/Squat.mp4",
             "Trainer_Videos/Sqaut.mp4",  # Handle typo in filename
@@ -209,52 +243,42 @@ class SquatReferenceTrainer:
             "trainer_videos/Squat.mp4",
         ]
         self.video_path = video_path or first_existing_path(default_paths) or default_paths[0]
-        self.detector = PoseDetector(
+        self.workers = workers
+        self.use_cache = use_cache
+        self.detector_settings = dict(
             model_complexity=1,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5,
         )
+        if backend != "solutions":
+            # Left out for the default so existing landmark caches keep their keys
+            self.detector_settings["backend"] = backend
+        self._detector: Optional[PoseDetector] = None
+        # "moving_average" smooths the angle curves; "one_euro" filters the
+        # landmarks first, like main.py --smooth does live
+        self.smoothing = smoothing
+
+    @property
+    def detector(self) -> PoseDetector:
+        """Pose detector, created on first use (not needed when landmarks come from the cache)."""
+        if self._detector is None:
+            self._detector = create_pose_detector(**self.detector_settings)
+        return self._detector
 
     def extract_angles(self) -> Tuple[List[float], List[float], List[float]]:
-        cap = cv2.VideoCapture(self.video_path)
-        if not cap.isOpened():
-            raise RuntimeError(f"Could not open video file: {self.video_path}")
-
-        knee_angles: List[float] = []
-        hip_angles: List[float] = []
-        back_angles: List[float] = []
-
-        total = int(max(1, cap.get(cv2.CAP_PROP_FRAME_COUNT)))
-        frame_idx = 0
         print(f"Processing video: {self.video_path}")
+        series = load_or_extract_landmarks(
+            self.video_path, self.detector_settings, workers=self.workers,
+            detector_factory=lambda: self.detector, use_cache=self.use_cache
+        )
+        if self.smoothing == "one_euro":
+            series = smooth_landmark_series(series, fps=video_fps(self.video_path))
 
-        try:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                frame_idx += 1
-                if frame_idx % 20 == 0:
-                    pct = 100.0 * (frame_idx / total)
-                    print(f"Processed {frame_idx}/{total} frames ({pct:.1f}%)")
-
-                results = self.detector.process(frame)
-                lms = self.detector.get_landmarks(frame, results)
-                if not lms:
-                    continue
-
-                k = compute_knee_angle(lms)
-                if math.isnan(k):
-                    continue  # require knee for rep tracking
-
-                h = compute_hip_angle(lms)
-                b = compute_back_angle(lms)
-
-                knee_angles.append(k)
-                hip_angles.append(h if not math.isnan(h) else float("nan"))
-                back_angles.append(b if not math.isnan(b) else float("nan"))
-        finally:
-            cap.release()
+        knee, hip, back = compute_series_angles(series)
+        keep = ~np.isnan(knee)  # require knee for rep tracking
+        knee_angles = knee[keep].tolist()
+        hip_angles = hip[keep].tolist()
+        back_angles = back[keep].tolist()
 
         print(f"Collected {len(knee_angles)} knee samples")
         return knee_angles, hip_angles, back_angles
@@ -322,8 +346,9 @@ class SquatReferenceTrainer:
             print("Not enough knee angle samples to detect repetitions.")
             return False
 
-        # 2) Smooth sequences (moving average)
-        knee_sm, hip_sm, back_sm = self.smooth_all(knee, hip, back, window=7)
+        # 2) Smooth sequences (moving average, unless the landmarks were One-Euro filtered)
+        window = 1 if self.smoothing == "one_euro" else 7
+        knee_sm, hip_sm, back_sm = self.smooth_all(knee, hip, back, window=window)
         print(f"Angle ranges (smoothed): knee=[{np.nanmin(knee_sm):.1f}, {np.nanmax(knee_sm):.1f}], "
               f"hip=[{np.nanmin(hip_sm):.1f}, {np.nanmax(hip_sm):.1f}], "
               f"back=[{np.nanmin(back_sm):.1f}, {np.nanmax(back_sm):.1f}]")
@@ -355,7 +380,19 @@ class SquatReferenceTrainer:
 
 
 def main() -> int:
-    trainer = SquatReferenceTrainer()
+    parser = argparse.ArgumentParser(description="Build squat reference ranges from a trainer video")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for pose extraction (splits the video into frame ranges)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the landmark cache and re-run pose inference")
+    parser.add_argument("--backend", choices=OFFLINE_BACKENDS, default="solutions",
+                        help="pose backend: legacy MediaPipe solutions or the Tasks PoseLandmarker (VIDEO mode)")
+    parser.add_argument("--smoothing", choices=["moving_average", "one_euro"], default="moving_average",
+                        help="moving average over the angle curves, or the One-Euro landmark filter used live")
+    args = parser.parse_args()
+
+    trainer = SquatReferenceTrainer(workers=args.workers, use_cache=not args.no_cache, backend=args.backend,
+                                    smoothing=args.smoothing)
     # Normalize path resolution, try alternates if default missing
     if not os.path.exists(trainer.video_path):
         alt = first_existing_path([
@@ -0,0 +1,163 @@
+"""
+Per-frame pose landmark extraction for whole video files.
+
+The trainer reference builders all need the same thing from a video: the
+landmarks of every frame, in order. ``extract_video_landmarks`` returns them
+as one (N, 33, 4) float32 array (NaN rows where no pose was found). With
+``workers > 1`` the video is split into contiguous frame ranges and each
+range is decoded and run through its own PoseDetector in a worker process;
+the per-range arrays are stitched back together in frame order.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, LandmarkFrame
+from pose_detector import PoseDetector, create_pose_detector
+
+
+# Frames decoded (and run through the tracker) before a shard's first frame
+# so MediaPipe's tracking state is primed like in a sequential pass.
+SHARD_WARMUP_FRAMES = 5
+
+
+def _empty_series(n: int = 0) -> np.ndarray:
+	return np.full((n, NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+
+
+def _detect_frame(detector: PoseDetector, frame, t: float) -> Optional[np.ndarray]:
+	results = detector.process(frame, t)
+	lms = detector.get_landmarks(frame, results)
+	return None if lms is None else lms.array
+
+
+def count_frames(video_path: str) -> int:
+	import cv2  # deferred: cached landmark series are read without OpenCV
+	cap = cv2.VideoCapture(video_path)
+	if not cap.isOpened():
+		raise RuntimeError(f"Could not open video file: {video_path}")
+	try:
+		return int(max(0, cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+	finally:
+		cap.release()
+
+
+def video_fps(video_path: str, default: float = 30.0) -> float:
+	import cv2
+	cap = cv2.VideoCapture(video_path)
+	try:
+		fps = cap.get(cv2.CAP_PROP_FPS) if cap.isOpened() else 0.0
+	finally:
+		cap.release()
+	return fps if fps and fps > 0 else default
+
+
+def split_frame_ranges(total: int, shards: int) -> List[Tuple[int, Optional[int]]]:
+	"""Split [0, total) into ``shards`` contiguous (start, end) ranges.
+
+	The last range is open-ended (end=None) because CAP_PROP_FRAME_COUNT is
+	only an estimate for many containers; that shard reads to end of stream.
+	"""
+	shards = max(1, min(shards, total)) if total > 0 else 1
+	bounds = np.linspace(0, total, shards + 1).astype(int)
+	ranges: List[Tuple[int, Optional[int]]] = [(int(bounds[i]), int(bounds[i + 1])) for i in range(shards)]
+	ranges[-1] = (ranges[-1][0], None)
+	return ranges
+
+
+def _process_range(video_path: str, start: int, end: Optional[int], detector_settings: Dict) -> Tuple[int, np.ndarray]:
+	"""Worker: decode frames [start, end) with a private detector."""
+	import cv2
+	detector = create_pose_detector(**detector_settings)
+	cap = cv2.VideoCapture(video_path)
+	if not cap.isOpened():
+		raise RuntimeError(f"Could not open video file: {video_path}")
+
+	# Frames are stamped with their index / fps so the tracker sees video time
+	fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+	rows: List[np.ndarray] = []
+	try:
+		warmup_start = max(0, start - SHARD_WARMUP_FRAMES)
+		if warmup_start > 0:
+			cap.set(cv2.CAP_PROP_POS_FRAMES, warmup_start)
+		for i in range(warmup_start, start):
+			ret, frame = cap.read()
+			if not ret:
+				break
+			_detect_frame(detector, frame, i / fps)
+
+		idx = start
+		while end is None or idx < end:
+			ret, frame = cap.read()
+			if not ret:
+				break
+			data = _detect_frame(detector, frame, idx / fps)
+			rows.append(_empty_series(1)[0] if data is None else data)
+			idx += 1
+	finally:
+		cap.release()
+
+	return start, (np.stack(rows) if rows else _empty_series())
+
+
+def extract_video_landmarks(video_path: str, detector_settings: Dict, workers: int = 1,
+							detector: Optional[PoseDetector] = None, progress_every: int = 20) -> np.ndarray:
+	"""Run pose detection over every frame of ``video_path``.
+
+	Args:
+		video_path: Video file to decode
+		detector_settings: create_pose_detector keyword arguments (used by worker processes)
+		workers: Number of worker processes; 1 processes sequentially in-process
+		detector: Detector to reuse for the sequential path
+		progress_every: Print progress every N frames (sequential path)
+
+	Returns:
+		(N, 33, 4) float32 array, one row per decoded frame; frames without a
+		detected pose are all-NaN.
+	"""
+	total = count_frames(video_path)
+
+	if workers <= 1:
+		import cv2
+		detector = detector or create_pose_detector(**detector_settings)
+		cap = cv2.VideoCapture(video_path)
+		fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+		rows: List[np.ndarray] = []
+		try:
+			while True:
+				ret, frame = cap.read()
+				if not ret:
+					break
+				data = _detect_frame(detector, frame, len(rows) / fps)
+				rows.append(_empty_series(1)[0] if data is None else data)
+				if progress_every and len(rows) % progress_every == 0:
+					pct = 100.0 * len(rows) / max(1, total)
+					print(f"Processed {len(rows)}/{total} frames ({pct:.1f}%)")
+		finally:
+			cap.release()
+		return np.stack(rows) if rows else _empty_series()
+
+	ranges = split_frame_ranges(total, workers)
+	print(f"Processing {total} frames in {len(ranges)} shards across {workers} worker processes")
+	# spawn: MediaPipe graphs are not fork-safe, and it matches Windows behaviour
+	ctx = multiprocessing.get_context("spawn")
+	with ProcessPoolExecutor(max_workers=len(ranges), mp_context=ctx) as pool:
+		futures = [pool.submit(_process_range, video_path, start, end, detector_settings) for start, end in ranges]
+		parts = []
+		for fut in futures:
+			start, part = fut.result()
+			print(f"Shard starting at frame {start}: {len(part)} frames")
+			parts.append(part)
+	return np.concatenate(parts) if parts else _empty_series()
+
+
+def iter_landmark_frames(series: np.ndarray) -> Iterator[Tuple[int, Optional[LandmarkFrame]]]:
+	"""Yield (frame_number, LandmarkFrame or None) with 1-based frame numbers."""
+	for frame_number, data in enumerate(series, start=1):
+		if np.isnan(data[:, 0]).all():
+			yield frame_number, None
+		else:
+			yield frame_number, LandmarkFrame(data)